@@ -0,0 +1,474 @@
+# -*- coding: utf-8 -*-
+
+from urllib.parse import urlsplit
+
+from .TwitterSearchException import TwitterSearchException
+from .TwitterSearch import TwitterSearch
+from .TwitterProjection import TwitterProjection
+from .TwitterBatch import TwitterBatch
+from .TwitterSearchOrder import TwitterSearchOrder
+from .TwitterUserOrder import TwitterUserOrder
+from .utils import json_loads
+
+
+class _AsyncConnectionPool(object):
+    """ Minimal HTTP/1.1 client on top of asyncio streams keeping \
+    connections alive between requests. Only GET requests as needed \
+    by the Twitter API endpoints are supported. Connecting and every \
+    read are limited by ``timeout``. Proxies, HTTP/2 and compressed \
+    responses are not supported. ``asyncio`` and ``ssl`` are imported \
+    on first usage to keep importing this library fast
+    """
+
+    def __init__(self, max_connections, keep_alive, timeout=None):
+        import asyncio
+
+        self._idle = {}
+        self._keep_alive = keep_alive
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._ssl_context = None
+
+    async def _wait(self, awaitable):
+        # raises asyncio.TimeoutError if the peer stays silent too long
+        import asyncio
+
+        return await asyncio.wait_for(awaitable, self._timeout)
+
+    async def _connect(self, key):
+        import asyncio
+        import ssl
+
+        host, port, secure = key
+        if self._idle.get(key):
+            return self._idle[key].pop(), True
+
+        if secure and self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        reader, writer = await self._wait(asyncio.open_connection(
+            host, port, ssl=self._ssl_context if secure else None))
+        return (reader, writer), False
+
+    def _release(self, key, connection, reusable):
+        if reusable and self._keep_alive:
+            self._idle.setdefault(key, []).append(connection)
+        else:
+            connection[1].close()
+
+    async def get(self, url, headers):
+        """ Sends a GET request and returns status, headers and body
+
+        :param url: A string containing the full URL to query
+        :param headers: A dict of additional request headers
+        :returns: A tuple of the HTTP status, a case-insensitive \
+        ``dict`` of response headers and the response body as bytes
+        """
+
+        import asyncio
+
+        parts = urlsplit(url)
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        key = (parts.hostname, port, secure)
+
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        lines = ['GET %s HTTP/1.1' % path,
+                 'Host: %s' % parts.netloc,
+                 'Accept-Encoding: identity',
+                 'Connection: %s' % ('keep-alive'
+                                     if self._keep_alive else 'close')]
+        lines += ['%s: %s' % item for item in headers.items()]
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        async with self._semaphore:
+            connection, reused = await self._connect(key)
+            try:
+                response = await self._exchange(connection, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                # the server dropped idle keep-alive connections
+                for idle in self._idle.pop(key, []):
+                    idle[1].close()
+                connection, reused = await self._connect(key)
+                try:
+                    response = await self._exchange(connection, request)
+                except BaseException:
+                    connection[1].close()
+                    raise
+            except BaseException:
+                connection[1].close()
+                raise
+
+        status, response_headers, body, reusable = response
+        self._release(key, connection, reusable)
+        return status, response_headers, body
+
+    async def _exchange(self, connection, request):
+        from requests.structures import CaseInsensitiveDict
+
+        reader, writer = connection
+        writer.write(request)
+        await self._wait(writer.drain())
+
+        status_line = await self._wait(reader.readline())
+        if not status_line:
+            raise ConnectionResetError('Connection closed by remote host')
+        version, status = status_line.split(None, 2)[:2]
+
+        headers = CaseInsensitiveDict()
+        while True:
+            line = await self._wait(reader.readline())
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, value = line.decode('latin-1').split(':', 1)
+            headers[name.strip()] = value.strip()
+
+        reusable = (version == b'HTTP/1.1' and
+                    headers.get('connection', '').lower() != 'close')
+
+        status = int(status)
+        if status < 200 or status in (204, 304):
+            # responses without a body, reading one would block
+            body = b''
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                line = await self._wait(reader.readline())
+                size = int(line.split(b';')[0], 16)
+                if size == 0:
+                    while (await self._wait(reader.readline())) not in (
+                            b'\r\n', b''):
+                        pass
+                    break
+                chunks.append(await self._wait(reader.readexactly(size)))
+                await self._wait(reader.readexactly(2))
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await self._wait(
+                reader.readexactly(int(headers['content-length'])))
+        else:
+            # the body ends when the server closes the connection, a
+            # server keeping it open runs into the timeout of a read
+            chunks = []
+            while True:
+                chunk = await self._wait(reader.read(65536))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            body = b''.join(chunks)
+            reusable = False
+
+        return status, headers, body, reusable
+
+    def close(self):
+        """ Closes all idle connections """
+
+        for connections in self._idle.values():
+            for reader, writer in connections:
+                writer.close()
+        self._idle = {}
+
+
+class AsyncTwitterSearch(object):
+    """
+    An asyncio-native counterpart of :class:`TwitterSearch`. It accepts the
+    same :class:`TwitterSearchOrder` and :class:`TwitterUserOrder` instances
+    and raises the same :class:`TwitterSearchException` codes, but performs
+    all queries without blocking the event loop. Thus, one event loop can
+    drive many paginations concurrently without a thread per query.
+
+    Tweets are iterated using ``async for tweet in client.search(order)``,
+    whole pages using ``async for meta, content in client.pages(order)``.
+    Python 3.6 or newer is required.
+    """
+
+    _base_url = TwitterSearch._base_url
+    _verify_url = TwitterSearch._verify_url
+    _search_url = TwitterSearch._search_url
+    _lang_url = TwitterSearch._lang_url
+    _user_url = TwitterSearch._user_url
+
+    exceptions = TwitterSearch.exceptions
+
+    def __init__(self, consumer_key, consumer_secret,
+                 access_token, access_token_secret, **attr):
+        """ Constructor. Credentials are not verified automatically as \
+        this would require a blocking query. Use ``await authenticate()`` \
+        instead.
+
+        :param consumer_key: Consumer key (app related)
+        :param consumer_secret: Consumer consumer_secret (app related)
+        :param access_token: Access token (user related)
+        :param access_token_secret: Access token secret (user related)
+
+        :param base_url: A string containing the URL of the Twitter API, \
+        e.g. of a :class:`TwitterMockServer`. Default value is \
+        ``https://api.twitter.com/1.1/``
+
+        :param max_connections: Maximum number of concurrently \
+        open connections. Default value is ``100``
+
+        :param keep_alive: A boolean variable to control whether \
+        connections are reused between queries. Default value is ``True``
+
+        :param timeout: Number of seconds to wait at most for connecting \
+        and for every read of a response, ``asyncio.TimeoutError`` is \
+        raised otherwise. ``None`` waits forever. Default value is ``60``
+
+        :param proxy: Proxies aren't supported, thus any value but \
+        ``None`` raises a :class:`TwitterSearchException`
+
+        :param json_loads: Function decoding the raw bytes of a response. \
+        Defaults to the fastest installed decoder
+
+        :param projection: A ``list`` of the fields of tweets to keep \
+        or a :class:`TwitterProjection` instance. Can be overridden per \
+        order. Default value is ``None`` which keeps all fields
+
+        :param tweet_type: Function or class converting every decoded \
+        tweet, e.g. :class:`Tweet`. Default value is ``None`` which \
+        returns tweets as ``dict``
+        :raises: TwitterSearchException
+        """
+
+        if attr.get("proxy") is not None:
+            raise TwitterSearchException(1032)
+
+        if "base_url" in attr:
+            if not isinstance(attr["base_url"], str):
+                raise TwitterSearchException(1009)
+            self._base_url = attr["base_url"]
+
+        # oauthlib is imported on first usage to keep importing fast
+        from oauthlib.oauth1 import Client
+
+        self.__access_token = access_token
+        self.__client = Client(consumer_key,
+                               client_secret=consumer_secret,
+                               resource_owner_key=access_token,
+                               resource_owner_secret=access_token_secret)
+
+        self.__max_connections = attr.get("max_connections", 100)
+        if (not isinstance(self.__max_connections, int) or
+                self.__max_connections <= 0):
+            raise TwitterSearchException(1004)
+        self.__keep_alive = attr.get("keep_alive", True)
+        if not isinstance(self.__keep_alive, bool):
+            raise TwitterSearchException(1008)
+        self.__timeout = attr.get("timeout", 60)
+        if self.__timeout is not None and (
+                not isinstance(self.__timeout, (int, float)) or
+                self.__timeout <= 0):
+            raise TwitterSearchException(1004)
+        self.__json_loads = attr.get("json_loads", json_loads)
+        if not callable(self.__json_loads):
+            raise TwitterSearchException(1018)
+        self.__projection = attr.get("projection")
+        if self.__projection is not None and not isinstance(
+                self.__projection, TwitterProjection):
+            self.__projection = TwitterProjection(self.__projection)
+        self.__tweet_type = attr.get("tweet_type")
+        if self.__tweet_type is not None and not callable(self.__tweet_type):
+            raise TwitterSearchException(1018)
+        self.__pool = None
+
+        # statistics
+        self.__statistics = [0, 0]
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.__access_token)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Closes all pooled connections """
+
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool = None
+
+    def check_http_status(self, http_status):
+        """ Raises a ``TwitterSearchException`` if a given HTTP status \
+        code is within the list at ``AsyncTwitterSearch.exceptions``
+
+        :param http_status: Integer value of the HTTP status
+        :raises: TwitterSearchException
+        """
+
+        if http_status in self.exceptions:
+            raise TwitterSearchException(http_status,
+                                         self.exceptions[http_status])
+
+    async def _get(self, url):
+        """ Sends a signed GET request and returns headers and body \
+        after validating the HTTP status
+
+        :param url: A string containing the full URL to query
+        :returns: A tuple of response headers and the raw response body
+        :raises: TwitterSearchException
+        """
+
+        if self.__pool is None:
+            self.__pool = _AsyncConnectionPool(self.__max_connections,
+                                               self.__keep_alive,
+                                               self.__timeout)
+
+        headers = self.__client.sign(url)[1]
+        status, meta, body = await self.__pool.get(url, headers)
+        self.check_http_status(status)
+        return meta, body
+
+    async def authenticate(self):
+        """ Verifies the given credentials
+
+        :raises: TwitterSearchException
+        """
+
+        await self._get(self._base_url + self._verify_url)
+
+    @staticmethod
+    def _is_search(order):
+        if isinstance(order, TwitterUserOrder):
+            return False
+        elif isinstance(order, TwitterSearchOrder):
+            return True
+        raise TwitterSearchException(1018)
+
+    async def send_search(self, url, is_search=True, transform=None):
+        """ Queries the Twitter API with a given query string
+
+        :param url: A string of the URL to send the query to
+        :param is_search: Boolean. ``True`` to query the Search API, \
+        ``False`` to query the user timeline endpoint
+        :param transform: Function applied to every tweet while decoding, \
+        e.g. a :class:`TwitterProjection`. Default value is ``None``
+        :returns: A tuple of meta data and the decoded response
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(url, str):
+            raise TwitterSearchException(1009)
+
+        endpoint = self._base_url + (self._search_url
+                                     if is_search
+                                     else self._user_url)
+
+        meta, body = await self._get(endpoint + url)
+        content = TwitterSearch._decode_page(
+            body, is_search, self.__json_loads, transform,
+            transform is not self.__tweet_type)
+
+        self.__statistics[0] += 1
+        self.__statistics[1] += len(content['statuses']
+                                    if is_search else content)
+        return meta, content
+
+    async def pages(self, order, callback=None):
+        """ Asynchronous iterator over all pages available \
+        for a given order
+
+        :param order: A TwitterOrder instance. \
+        Can be either TwitterSearchOrder or TwitterUserOrder
+        :param callback: Function or coroutine function to be called \
+        with this instance after a new page is queried from the Twitter API
+        :returns: An asynchronous iterator of ``(meta, content)`` tuples
+        :raises: TwitterSearchException
+        """
+
+        if callback and not callable(callback):
+            raise TwitterSearchException(1018)
+
+        is_search = self._is_search(order)
+        transform = TwitterSearch._compose_transform(
+            order.projection or self.__projection, self.__tweet_type)
+        start_url = order.create_search_url()
+        url = start_url
+
+        while True:
+            meta, content = await self.send_search(url, is_search,
+                                                   transform)
+
+            if callback:
+                import asyncio
+
+                result = callback(self)
+                if asyncio.iscoroutine(result):
+                    await result
+
+            yield meta, content
+
+            url = TwitterSearch._get_next_url(
+                start_url,
+                TwitterSearch._get_next_max_id(content, is_search, url))
+            if url is None:
+                return
+
+    async def search(self, order, callback=None):
+        """ Asynchronous iterator over all tweets available \
+        for a given order
+
+        :param order: A TwitterOrder instance. \
+        Can be either TwitterSearchOrder or TwitterUserOrder
+        :param callback: Function or coroutine function to be called \
+        with this instance after a new page is queried from the Twitter API
+        :returns: An asynchronous iterator of tweets
+        :raises: TwitterSearchException
+        """
+
+        is_search = self._is_search(order)
+        async for meta, content in self.pages(order, callback):
+            for tweet in (content['statuses'] if is_search else content):
+                yield tweet
+
+    async def batches(self, order, columns=None, callback=None):
+        """ Asynchronous iterator over all pages available for a given \
+        order returning each page as :class:`TwitterBatch`
+
+        :param order: A TwitterOrder instance. \
+        Can be either TwitterSearchOrder or TwitterUserOrder
+        :param columns: A ``list`` of column names out of \
+        ``TwitterBatch.available_columns``. Defaults to \
+        ``TwitterBatch.default_columns``
+        :param callback: Function or coroutine function to be called \
+        with this instance after a new page is queried from the Twitter API
+        :returns: An asynchronous iterator of :class:`TwitterBatch` instances
+        :raises: TwitterSearchException
+        """
+
+        is_search = self._is_search(order)
+        columns = TwitterBatch.get_columns(columns)
+        async for meta, content in self.pages(order, callback):
+            yield TwitterBatch(content['statuses'] if is_search else content,
+                               columns, meta)
+
+    async def set_supported_languages(self, order):
+        """ Loads currently supported languages from Twitter API \
+        and sets them in a given TwitterSearchOrder instance
+
+        :param order: A TwitterSearchOrder instance
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(order, TwitterSearchOrder):
+            raise TwitterSearchException(1010)
+
+        meta, body = await self._get(self._base_url + self._lang_url)
+        order.iso_6391 = [lang['code'] for lang in self.__json_loads(body)]
+
+    def get_statistics(self):
+        """ Returns a tuple with the amount of queries and \
+        received tweets of this very instance
+
+        :returns: A ``tuple`` of two integers ``(queries, tweets)``
+        """
+
+        return (self.__statistics[0], self.__statistics[1])
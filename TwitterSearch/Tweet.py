@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+try:
+    from collections.abc import Mapping  # python3
+except ImportError:
+    from collections import Mapping  # python2
+
+try:
+    from sys import intern  # python3
+except ImportError:
+    pass  # python2: builtin
+
+
+def _intern(value):
+    return intern(value) if value.__class__ is str else value
+
+
+class _Record(Mapping):
+    """ Read-only mapping storing the values of an object of the Twitter \
+    API in one ``tuple`` instead of a ``dict``. Objects of the API share \
+    few key orders, thus the position of every key is stored once per \
+    key order and shared by all records. Building a record copies the \
+    values by C code without touching every field in Python, only nested \
+    objects and strings with few distinct values are converted. Equal \
+    nested objects (e.g. the user of many tweets) share one record
+    """
+
+    __slots__ = ('_positions', '_values')
+
+    # fields containing objects which are converted as well
+    _nested = {}
+
+    # fields containing strings with few distinct values
+    _interned = frozenset()
+
+    # positions and conversions by key order, see _get_shape()
+    _shapes = None
+    _max_shapes = 1000
+
+    # records of nested objects by ID, see _convert()
+    _shared = None
+    _max_shared = 1000
+
+    def __init__(self, data):
+        """ Constructor
+
+        :param data: A ``dict`` as decoded from the Twitter API
+        """
+
+        keys = tuple(data)
+        try:
+            positions, conversions = self._shapes[keys]
+        except KeyError:
+            positions, conversions = self._get_shape(keys)
+
+        if conversions:
+            values = list(data.values())
+            for index, convert in conversions:
+                values[index] = convert(values[index])
+            self._values = tuple(values)
+        else:
+            self._values = tuple(data.values())
+        self._positions = positions
+
+    @classmethod
+    def _set_up(cls):
+        """ Creates the caches of a record class. Has to be called once \
+        the ``_nested`` classes of a record are defined
+        """
+
+        cls._conversions = dict((key, record_type._convert)
+                                for key, record_type in cls._nested.items())
+        for key in cls._interned:
+            cls._conversions[key] = _intern
+        cls._shapes = {}
+        cls._shared = {}
+
+    @classmethod
+    def _get_shape(cls, keys):
+        """ Determines the positions of the keys of a new key order \
+        and the values to convert
+
+        :param keys: A ``tuple`` of the keys of an object
+        :returns: A ``tuple`` of a ``dict`` containing the position of \
+        every key and a ``tuple`` of the positions and functions of \
+        all values to convert
+        """
+
+        positions = dict((key, i) for i, key in enumerate(keys))
+        conversions = tuple((i, cls._conversions[key])
+                            for i, key in enumerate(keys)
+                            if key in cls._conversions)
+        if len(cls._shapes) >= cls._max_shapes:
+            cls._shapes.clear()
+        shape = cls._shapes[keys] = (positions, conversions)
+        return shape
+
+    @classmethod
+    def _convert(cls, value):
+        """ Converts a nested object. Objects equal to a recently \
+        converted one with the same ID share its record, e.g. the user \
+        of all tweets of a timeline
+
+        :param value: A ``dict`` as decoded from the Twitter API. \
+        Other values are returned unchanged
+        :returns: A record of this class
+        """
+
+        if not isinstance(value, dict):
+            return value
+
+        key = value.get('id')
+        shared = cls._shared.get(key)
+        if shared is not None and shared[0] == value:
+            return shared[1]
+
+        record = cls(value)
+        if key is not None:
+            if len(cls._shared) >= cls._max_shared:
+                cls._shared.clear()
+            cls._shared[key] = (dict(value), record)
+        return record
+
+    def __getattr__(self, name):
+        # fields are no real attributes, thus looked up here
+        if name not in _Record.__slots__:
+            try:
+                return self._values[self._positions[name]]
+            except KeyError:
+                pass
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        return self._values[self._positions[key]]
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.get('id'))
+
+    def __reduce__(self):
+        return self.__class__, (self.to_dict(),)
+
+    def to_dict(self):
+        """ Converts this record back into plain ``dict`` instances
+
+        :returns: A ``dict`` as decoded from the Twitter API
+        """
+
+        data = {}
+        for key in self:
+            value = self[key]
+            data[key] = value.to_dict() if isinstance(value, _Record) \
+                else value
+        return data
+
+
+class User(_Record):
+    """
+    Compact representation of a user of the Twitter API. Fields are
+    accessible as attributes (``user.screen_name``) or like the keys of
+    a ``dict`` (``user['screen_name']``). Fields missing in the response
+    raise an ``AttributeError`` or ``KeyError`` respectively.
+    """
+
+    _interned = frozenset((
+        'lang', 'time_zone', 'profile_background_color',
+        'profile_background_image_url', 'profile_background_image_url_https',
+        'profile_link_color', 'profile_sidebar_border_color',
+        'profile_sidebar_fill_color', 'profile_text_color',
+    ))
+    __slots__ = ()
+
+
+class Tweet(_Record):
+    """
+    Compact representation of a tweet of the Twitter API storing its
+    values in a ``tuple`` instead of a ``dict``. Fields are accessible as
+    attributes (``tweet.text``) or like the keys of a ``dict``
+    (``tweet['text']``), thus tweets can be used wherever dicts were used
+    before. The ``user`` as well as retweeted and quoted tweets are
+    converted into :class:`User` and :class:`Tweet` instances, equal
+    users of several tweets share one instance. Use ``to_dict()`` to
+    convert a tweet back.
+    """
+
+    _interned = frozenset(('source', 'lang', 'filter_level'))
+    __slots__ = ()
+
+
+Tweet._nested = {
+    'user': User,
+    'retweeted_status': Tweet,
+    'quoted_status': Tweet,
+}
+
+User._set_up()
+Tweet._set_up()
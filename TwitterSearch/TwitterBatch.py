@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+import array
+import calendar
+
+from .TwitterSearchException import TwitterSearchException
+
+# numpy module imported by _numpy(), False until first usage
+_numpy_module = False
+
+
+def _numpy():
+    """ Imports NumPy on first usage as it takes a while to import
+
+    :returns: The ``numpy`` module or ``None`` if it isn't installed
+    """
+
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy_module = numpy
+    return _numpy_module
+
+
+def _get_int64_typecode():
+    """ Determines the ``array`` type code of signed 64 bit integers. \
+    ``q`` isn't available before Python 3.3 where ``l`` is used instead
+
+    :returns: Either ``q`` or ``l``
+    """
+
+    try:
+        array.array('q')
+    except ValueError:
+        return 'l'
+    return 'q'
+
+
+# type code of signed 64 bit integers
+_INT64 = _get_int64_typecode()
+
+_MONTHS = dict((month, i) for i, month in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+     'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1))
+
+
+def parse_created_at(created_at):
+    """ Converts the ``created_at`` format of the Twitter API \
+    (e.g. ``Mon Oct 13 09:44:18 +0000 2014``) into UTC epoch seconds
+
+    :param created_at: A string as returned by the Twitter API
+    :returns: An integer of UTC epoch seconds
+    """
+
+    weekday, month, day, clock, offset, year = created_at.split()
+    hours, minutes, seconds = clock.split(':')
+    timestamp = calendar.timegm((int(year), _MONTHS[month], int(day),
+                                 int(hours), int(minutes), int(seconds)))
+    if offset != '+0000':
+        sign = -1 if offset[0] == '-' else 1
+        timestamp -= sign * (int(offset[1:3]) * 3600 + int(offset[3:5]) * 60)
+    return timestamp
+
+
+def _user(tweet):
+    return tweet.get('user') or {}
+
+
+def _hashtags(tweet):
+    entities = tweet.get('entities') or {}
+    return [hashtag['text'] for hashtag in entities.get('hashtags', ())]
+
+
+def _user_mentions(tweet):
+    entities = tweet.get('entities') or {}
+    return [mention['id'] for mention in entities.get('user_mentions', ())]
+
+
+def _urls(tweet):
+    entities = tweet.get('entities') or {}
+    return [url['expanded_url'] for url in entities.get('urls', ())]
+
+
+class TwitterBatch(object):
+    """
+    One page of tweets stored column by column, e.g. ``batch['id']``
+    contains the IDs of all tweets of the page. Integer columns are
+    int64 arrays and ``created_at`` is a datetime64 array if NumPy is
+    installed. Without NumPy, ``array.array`` instances of 64 bit integers
+    are used and ``created_at`` contains UTC epoch seconds. All other
+    columns are lists. Fields dropped by a projection are ``0`` within
+    integer columns and ``None`` within other columns. Use ``to_dict()``
+    to build a data frame, e.g. ``pandas.DataFrame(batch.to_dict())``.
+    """
+
+    # name -> (type, function extracting the value of a tweet)
+    available_columns = {
+        'id': ('int', lambda tweet: tweet['id']),
+        'user_id': ('int', lambda tweet: _user(tweet).get('id', 0)),
+        'created_at': ('time', lambda tweet: parse_created_at(
+            tweet['created_at'])),
+        'text': ('object', lambda tweet: tweet.get('text')),
+        'lang': ('object', lambda tweet: tweet.get('lang')),
+        'user_screen_name': ('object',
+                             lambda tweet: _user(tweet).get('screen_name')),
+        'retweet_count': ('int', lambda tweet: tweet.get('retweet_count', 0)),
+        'favorite_count': ('int',
+                           lambda tweet: tweet.get('favorite_count') or 0),
+        'in_reply_to_status_id': ('object', lambda tweet: tweet.get(
+            'in_reply_to_status_id')),
+        'hashtags': ('object', _hashtags),
+        'user_mentions': ('object', _user_mentions),
+        'urls': ('object', _urls),
+    }
+
+    default_columns = ('id', 'user_id', 'created_at', 'text', 'lang',
+                       'hashtags')
+
+    def __init__(self, tweets, columns=None, meta=None, use_numpy=None):
+        """ Constructor
+
+        :param tweets: A ``list`` of decoded tweets
+        :param columns: A ``list`` of names out of ``available_columns``. \
+        Defaults to ``default_columns``
+        :param meta: Meta data of the response containing the tweets
+        :param use_numpy: Boolean. Whether NumPy arrays are used. \
+        Defaults to ``True`` if NumPy is installed
+        :raises: TwitterSearchException
+        """
+
+        self.columns = self.get_columns(columns)
+        self.meta = meta
+        numpy = _numpy() if use_numpy is not False else None
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        if not isinstance(self.use_numpy, bool):
+            raise TwitterSearchException(1008)
+        if self.use_numpy and numpy is None:
+            raise TwitterSearchException(1022)
+
+        self.__length = len(tweets)
+        self.__data = {}
+        for name in self.columns:
+            kind, extract = self.available_columns[name]
+            self.__data[name] = self._build([extract(tweet)
+                                             for tweet in tweets], kind)
+
+        # IDs are always needed to query further pages
+        if 'id' in self.__data:
+            self.__ids = self.__data['id']
+        else:
+            self.__ids = self._build([tweet['id'] for tweet in tweets], 'int')
+
+    @classmethod
+    def get_columns(cls, columns):
+        """ Validates a selection of columns
+
+        :param columns: A ``list`` of names out of ``available_columns`` \
+        or ``None`` for ``default_columns``
+        :returns: A ``tuple`` of column names
+        :raises: TwitterSearchException
+        """
+
+        if columns is None:
+            return cls.default_columns
+        if not isinstance(columns, (list, tuple)):
+            raise TwitterSearchException(1001)
+        for name in columns:
+            if name not in cls.available_columns:
+                raise TwitterSearchException(1023)
+        return tuple(columns)
+
+    def _build(self, values, kind):
+        if kind == 'object':
+            return values
+        if self.use_numpy:
+            numpy = _numpy()
+            if kind == 'time':
+                return numpy.array(values, dtype='datetime64[s]')
+            return numpy.array(values, dtype=numpy.int64)
+        return array.array(_INT64, values)
+
+    def __len__(self):
+        return self.__length
+
+    def __getitem__(self, name):
+        return self.__data[name]
+
+    def __contains__(self, name):
+        return name in self.__data
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __repr__(self):
+        return '<%s %i tweets: %s>' % (self.__class__.__name__,
+                                       self.__length, ','.join(self.columns))
+
+    def keys(self):
+        """ Returns the names of all columns of this batch
+
+        :returns: A ``tuple`` of strings
+        """
+
+        return self.columns
+
+    def to_dict(self):
+        """ Returns all columns by name
+
+        :returns: A ``dict`` of columns
+        """
+
+        return dict(self.__data)
+
+    def get_minimal_id(self):
+        """ Returns the minimal tweet ID of this batch
+
+        :returns: The minimal ID or ``None`` if the batch is empty
+        """
+
+        if not self.__length:
+            return None
+        return int(self.__ids.min() if self.use_numpy else min(self.__ids))
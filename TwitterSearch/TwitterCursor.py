@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+import weakref
+from operator import itemgetter
+from .TwitterSearchException import TwitterSearchException
+from .TwitterTiming import TwitterTiming
+
+try:
+    from queue import Queue, Empty  # python3
+except ImportError:
+    from Queue import Queue, Empty  # python2
+
+
+_get_id = itemgetter('id')
+
+
+class TwitterCursor(object):
+    """
+    This class iterates the tweets of one order page by page. It keeps
+    the pagination state of the order on its own while the HTTP session,
+    authentication, rate limits, statistics, metrics and tracer are those
+    of the :class:`TwitterSearch` instance it was created by using
+    ``TwitterSearch.cursor(order)``. Thus, many cursors of one instance
+    can be iterated concurrently, e.g. within different threads. A single
+    cursor must not be iterated by several threads at the same time.
+    """
+
+    # seconds to wait for the prefetching thread when stopping it
+    _join_timeout = 1.0
+
+    def __init__(self, client, order, callback=None, **attr):
+        """ Constructor. Cursors are usually created using \
+        ``TwitterSearch.cursor(order)``
+
+        :param client: The :class:`TwitterSearch` instance to send \
+        queries with
+        :param order: A TwitterOrder instance. \
+        Can be either TwitterSearchOrder or TwitterUserOrder
+        :param callback: Function to be called with this cursor after \
+        a new page is queried from the Twitter API. Default value is \
+        ``None``
+
+        :param prefetch: Amount of pages queried in the background while \
+        iterating the current page. Default value is ``0`` which \
+        disables prefetching
+
+        :param stream: A boolean variable to control whether pages are \
+        parsed incrementally while iterating. Ignored if ``prefetch`` \
+        is used. Default value is ``False``
+        :raises: TwitterSearchException
+        """
+
+        if callback is not None and not callable(callback):
+            raise TwitterSearchException(1018)
+
+        self.__prefetch = attr.get("prefetch", 0)
+        if not isinstance(self.__prefetch, int) or self.__prefetch < 0:
+            raise TwitterSearchException(1004)
+        self.__stream = attr.get("stream", False)
+        if not isinstance(self.__stream, bool):
+            raise TwitterSearchException(1008)
+        self.__stream = self.__stream and not self.__prefetch
+
+        self.__client = client
+        self.__order = order
+        self.__order_is_search = client._is_search_order(order)
+        self.__order_transform = client._get_transform(order)
+        self.__callback = callback
+        self._start_url = None
+
+        self.__response = {}
+        self.__next_max_id = None
+        self.__next_tweet = 0
+        self.__streamed = None
+        self.__prefetcher = None
+        self.__trace = None
+        self.__timing = None
+
+    def __repr__(self):
+        """ Returns the class and the query string of its order
+
+        :returns: A string represenation of this class containing \
+        the class name and the query string of the first page
+        """
+
+        return '<%s %s>' % (self.__class__.__name__, self._start_url)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Stops prefetching and closes the response currently \
+        streamed (if any). The HTTP session of the :class:`TwitterSearch` \
+        instance is kept open
+        """
+
+        self.__stop_prefetching()
+        self.__close_stream()
+
+    def get_order(self):
+        """ Returns the order iterated by this cursor
+
+        :returns: A TwitterOrder instance
+        """
+
+        return self.__order
+
+    def start(self):
+        """ Queries the first page of the order, dropping the pages \
+        queried so far. Called on first iteration automatically
+
+        :returns: The response as ``dict`` containing ``meta`` and \
+        ``content``. While streaming, ``content`` is ``None`` until \
+        the first page was read completely
+        :raises: TwitterSearchException
+        """
+
+        self.close()
+        self.__next_tweet = 0
+        self._start_url = self.__order.create_search_url()
+
+        if self.__stream:
+            with self.__start_trace():
+                self.__open_stream(self._start_url)
+            return self.__response
+
+        with self.__start_trace():
+            self.send_search(self._start_url)
+        if self.__prefetch and self.__next_max_id:
+            self.__start_prefetching()
+        return self.__response
+
+    def __start_trace(self):
+        """ Opens the root span of the pages of the order
+
+        :returns: A span to be used as context manager
+        """
+
+        client = self.__client
+        self.__trace = client._start_span(
+            'search_tweets', endpoint=client._get_resource(
+                client._get_endpoint(self.__order_is_search)),
+            url=self._start_url)
+        return self.__trace
+
+    def __start_page_span(self, next_max_id):
+        """ Opens the span of a page following the first one
+
+        :param next_max_id: The ``max_id`` of the page
+        :returns: A span to be used as context manager
+        """
+
+        return self.__client._start_span('search_next_results',
+                                         parent=self.__trace,
+                                         max_id=next_max_id)
+
+    def __open_stream(self, url):
+        """ Queries a page without reading its body. The tweets of the \
+        page are parsed while iterating
+
+        :param url: A string of the query string to send
+        :raises: TwitterSearchException
+        """
+
+        timing = TwitterTiming(url)
+        r, parser = self.__client._open_stream(url, self.__order_is_search,
+                                               self.__response,
+                                               self.__order_transform,
+                                               timing)
+        self.__response['content'] = None
+        # [url, response, parser, amount of tweets, minimal id, timing]
+        self.__streamed = [url, r, parser, 0, None, timing]
+
+    def __close_stream(self):
+        """ Closes the response currently streamed (if any) """
+
+        if self.__streamed is not None:
+            self.__streamed[1].close()
+            self.__streamed = None
+
+    def __next_streamed(self):
+        """ Returns the next tweet of the streamed page. Finishes \
+        the page and opens the next one if all tweets were returned
+
+        :returns: The next tweet
+        :raises: StopIteration
+        """
+
+        while True:
+            streamed = self.__streamed
+            url, r, parser = streamed[:3]
+            try:
+                tweet = next(parser)
+            except StopIteration:
+                pass
+            except ValueError:
+                self.__close_stream()
+                raise
+            else:
+                streamed[3] += 1
+                if streamed[4] is None or tweet['id'] < streamed[4]:
+                    streamed[4] = tweet['id']
+                return tweet
+
+            # the page was read completely
+            timing = streamed[5]
+            timing.tweets = streamed[3]
+            self.__client._count_transfer(r, parser.bytes_read, timing)
+            self.__client._add_timing(timing)
+            self.__client._count_tweets(timing.resource, streamed[3])
+            self.__response['content'] = parser.remainder
+
+            # the span of the page was closed once its headers arrived
+            self.__run_callback(timing, self.__trace)
+
+            self.__next_max_id = self.__client._next_max_id(
+                streamed[3], streamed[4], self.__order_is_search, url)
+            url = self.__client._get_next_url(self._start_url,
+                                              self.__next_max_id)
+            if url is None:
+                self.__streamed = None
+                raise StopIteration
+
+            try:
+                with self.__start_page_span(self.__next_max_id):
+                    self.__open_stream(url)
+            except TwitterSearchException:
+                self.__streamed = None
+                raise StopIteration
+
+    def __start_prefetching(self):
+        """ Starts a background thread querying the pages following the \
+        current one. At most ``prefetch`` pages are queried ahead of \
+        the page currently iterated
+        """
+
+        pages = Queue()
+        slots = Queue()
+        stop = threading.Event()
+        for i in range(self.__prefetch):
+            slots.put(True)
+
+        start_url = self._start_url
+        is_search = self.__order_is_search
+        transform = self.__order_transform
+        trace = self.__trace
+
+        # the thread keeps neither the cursor nor its client alive, thus
+        # abandoned cursors stop prefetching once they are collected
+        owner = weakref.ref(self, lambda ref: stop.set())
+        client_ref = weakref.ref(self.__client)
+        get_next_url = self.__client._get_next_url
+
+        def prefetch(owner, next_max_id):
+            while True:
+                url = get_next_url(start_url, next_max_id)
+                if url is None:
+                    return
+
+                # wait for a free slot
+                while True:
+                    if stop.is_set():
+                        return
+                    try:
+                        slots.get(timeout=0.1)
+                        break
+                    except Empty:
+                        pass
+
+                client = client_ref()
+                if client is None:
+                    return
+                response = {}
+                try:
+                    with client._start_span('prefetch', parent=trace,
+                                            max_id=next_max_id):
+                        client._query(url, is_search, response, transform,
+                                      stop)
+                except Exception as e:
+                    pages.put((response, None, e))
+                    return
+                next_max_id = client._get_next_max_id(response['content'],
+                                                      is_search, url)
+                pages.put((response, next_max_id, None))
+                del client
+
+        # the thread keeps the weak reference alive until it finishes
+        thread = threading.Thread(target=prefetch,
+                                  name='TwitterCursor-prefetch',
+                                  args=(owner, self.__next_max_id))
+        thread.daemon = True
+        self.__prefetcher = (thread, pages, slots, stop)
+        thread.start()
+
+    def __stop_prefetching(self):
+        """ Stops the prefetching thread (if any) and drops \
+        all prefetched pages
+        """
+
+        if self.__prefetcher is not None:
+            thread, pages, slots, stop = self.__prefetcher
+            self.__prefetcher = None
+            stop.set()
+            thread.join(self._join_timeout)
+
+    def __next_prefetched(self):
+        """ Replaces the current page by the next prefetched one
+
+        :raises: TwitterSearchException
+        """
+
+        thread, pages, slots, stop = self.__prefetcher
+        response, next_max_id, error = pages.get()
+        slots.put(True)
+
+        if 'meta' in response:
+            self.__response['meta'] = response['meta']
+        if error is not None:
+            self.__stop_prefetching()
+            raise error
+
+        self.__response['content'] = response['content']
+        self.__next_max_id = next_max_id
+
+        self.__run_callback(response.get('timing'))
+
+        if not next_max_id:
+            self.__stop_prefetching()
+
+    def __run_callback(self, timing, parent=None):
+        """ Calls the callback of this cursor (if any) after a page \
+        was queried and measures its duration
+
+        :param timing: The :class:`TwitterTiming` of the page
+        :param parent: The parent of the span of the callback. Default \
+        value is ``None`` which uses the span currently open
+        """
+
+        self.__timing = timing
+        if self.__callback:
+            start = time.time()
+            try:
+                with self.__client._start_span('callback', parent=parent):
+                    self.__callback(self)
+            finally:
+                if timing is not None:
+                    timing.callback = time.time() - start
+
+    def get_last_timing(self):
+        """ Returns the timing of the current page, i.e. the page whose \
+        tweets are iterated. Callbacks use this to inspect the page they \
+        are called for, its ``callback`` duration is set after the \
+        callback has returned
+
+        :returns: A :class:`TwitterTiming` instance or ``None`` if no \
+        page was queried yet
+        """
+
+        return self.__timing
+
+    def send_search(self, url):
+        """ Queries the Twitter API with a given query string of \
+        the order and stores the results within this cursor
+
+        :param url: A string of the URL to send the query to
+        :returns: A ``tuple`` of the meta data and the content \
+        of the response
+        :raises: TwitterSearchException
+        """
+
+        with self.__client._start_span('send_search', url=url) as span:
+            self.__client._query(url, self.__order_is_search,
+                                 self.__response, self.__order_transform)
+            span.set_attribute('tweets', self.get_amount_of_tweets())
+
+            # call callback if available
+            self.__run_callback(self.__response.pop('timing'))
+
+        # if we've seen the correct amount of tweets there may be some more
+        # using IDs to request more results
+        # see https://dev.twitter.com/docs/working-with-timelines
+        self.__next_max_id = self.__client._get_next_max_id(
+            self.__response['content'], self.__order_is_search, url)
+
+        return self.__response['meta'], self.__response['content']
+
+    def search_next_results(self):
+        """ Triggers the search for more results using the Twitter API. \
+        Raises exception if no further results can be found
+
+        :returns: ``True`` if there are more results available \
+        within the Twitter API
+        :raises: TwitterSearchException
+        """
+
+        url = self.__client._get_next_url(self._start_url,
+                                          self.__next_max_id)
+        if url is None:
+            raise TwitterSearchException(1011)
+
+        with self.__start_page_span(self.__next_max_id):
+            if self.__prefetcher is not None:
+                self.__next_prefetched()
+                return True
+
+            self.send_search(url)
+        return True
+
+    def _pages(self):
+        """ Queries the first page of the order and iterates all pages \
+        following it. Used by ``TwitterSearch.search_many()``, the cursor \
+        must not stream
+
+        :returns: A generator of ``(meta, content)`` tuples
+        :raises: TwitterSearchException
+        """
+
+        response = self.start()
+        while True:
+            yield response['meta'], response['content']
+            if not self.__next_max_id:
+                return
+            self.search_next_results()
+
+    def get_metadata(self):
+        """ Returns all available meta data collected during last query
+
+        :returns: Available meta information about the \
+        last query in form of a ``dict``
+        :raises: TwitterSearchException
+        """
+
+        if not self.__response:
+            raise TwitterSearchException(1012)
+        return self.__response['meta']
+
+    def get_tweets(self):
+        """ Returns all available data from last query
+
+        :returns: All tweets found using the last query as a ``dict``. \
+        While streaming, ``None`` until the current page was read \
+        completely and the page without its tweets afterwards
+        :raises: TwitterSearchException
+        """
+
+        if not self.__response:
+            raise TwitterSearchException(1013)
+        return self.__response['content']
+
+    def get_amount_of_tweets(self):
+        """ Returns current amount of tweets available within this cursor
+
+        :returns: The amount of tweets currently available. While \
+        streaming, the amount of tweets of the current page returned so far
+        :raises: TwitterSearchException
+        """
+
+        if not self.__response:
+            raise TwitterSearchException(1013)
+
+        if self.__streamed is not None:
+            return self.__streamed[3]
+
+        return (len(self.__response['content']['statuses'])
+                if self.__order_is_search
+                else len(self.__response['content']))
+
+    def get_minimal_id(self):
+        """ Returns the minimal tweet ID of the current response
+
+        :returns: minimal tweet identification number. While streaming, \
+        the minimal ID of all tweets of the current page returned so far
+        :raises: TwitterSearchException
+        """
+
+        if not self.__response:
+            raise TwitterSearchException(1013)
+
+        if self.__streamed is not None:
+            if self.__streamed[4] is None:
+                raise TwitterSearchException(1013)
+            return self.__streamed[4] - 1
+
+        return min(map(_get_id,
+                       self.__response['content']['statuses']
+                       if self.__order_is_search
+                       else self.__response['content'])) - 1
+
+    # Iteration
+    def __iter__(self):
+        self.__next_tweet = 0
+        return self
+
+    def next(self):
+        """ Python2 comparability method. Simply returns ``self.__next__()``
+
+        :returns: the ``__next__()`` method of this class
+        """
+
+        return self.__next__()
+
+    def __next__(self):
+        if self._start_url is None:
+            self.start()
+
+        if not self.__response:
+            raise TwitterSearchException(1014)
+
+        if self.__streamed is not None:
+            return self.__next_streamed()
+
+        if self.__next_tweet < self.get_amount_of_tweets():
+            self.__next_tweet += 1
+            if self.__order_is_search:
+                return (self.__response['content']
+                        ['statuses'][self.__next_tweet-1])
+            else:
+                return self.__response['content'][self.__next_tweet-1]
+
+        try:
+            self.search_next_results()
+        except TwitterSearchException:
+            raise StopIteration
+
+        if self.get_amount_of_tweets() != 0:
+            self.__next_tweet = 1
+            if self.__order_is_search:
+                return (self.__response['content']
+                        ['statuses'][self.__next_tweet-1])
+            else:
+                return self.__response['content'][self.__next_tweet-1]
+        raise StopIteration
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from bisect import bisect_left
+
+from .utils import create_http_server
+
+
+class TwitterMetrics(object):
+    """
+    Registry of counters, gauges and histograms describing the queries of
+    :class:`TwitterSearch` instances. By default all instances of a process
+    share the registry returned by ``TwitterMetrics.get_default()``. The
+    registry renders itself in the Prometheus text exposition format and
+    can serve it on a local HTTP port to be scraped.
+    """
+
+    # name -> (type, help) of all metrics recorded by TwitterSearch
+    metrics = {
+        'requests_total': ('counter',
+                           'HTTP requests sent to the Twitter API'),
+        'tweets_total': ('counter', 'Tweets received'),
+        'bytes_received_total': ('counter',
+                                 'Bytes of responses received on the wire'),
+        'bytes_decoded_total': ('counter',
+                                'Bytes of responses after decompression'),
+        'retries_total': ('counter', 'Requests repeated by the retry policy'),
+        'errors_total': ('counter',
+                         'Queries failed with an HTTP status listed in '
+                         'TwitterSearch.exceptions'),
+        'request_duration_seconds': ('histogram',
+                                     'Duration of HTTP requests including '
+                                     'reading the body'),
+        'rate_limit_remaining': ('gauge',
+                                 'Requests remaining within the current '
+                                 'rate-limit window'),
+        'rate_limit_limit': ('gauge',
+                             'Requests allowed per rate-limit window'),
+    }
+
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, prefix='twittersearch'):
+        """ Constructor
+
+        :param prefix: Prefix of the names of all metrics. \
+        Default value is ``twittersearch``
+        """
+
+        self.prefix = prefix
+        self.__lock = threading.Lock()
+        # name -> {labels: value} where histogram values are lists of
+        # the counts per bucket followed by their sum and count
+        self.__values = {}
+        self.__server = None
+
+    @classmethod
+    def get_default(cls):
+        """ Returns the registry shared by all instances of a process
+
+        :returns: A :class:`TwitterMetrics` instance
+        """
+
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
+    @staticmethod
+    def _labels(labels):
+        return tuple(sorted((name, '%s' % value)
+                            for name, value in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """ Increases a counter
+
+        :param name: Name of the metric without prefix, \
+        e.g. ``requests_total``
+        :param value: Amount to add. Default value is ``1``
+        :param labels: Labels of the time series, e.g. ``endpoint``
+        """
+
+        key = self._labels(labels)
+        with self.__lock:
+            series = self.__values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """ Sets a gauge
+
+        :param name: Name of the metric without prefix
+        :param value: New value of the gauge
+        :param labels: Labels of the time series
+        """
+
+        key = self._labels(labels)
+        with self.__lock:
+            self.__values.setdefault(name, {})[key] = value
+
+    def observe(self, name, value, **labels):
+        """ Adds a value to a histogram
+
+        :param name: Name of the metric without prefix
+        :param value: Observed value, e.g. seconds
+        :param labels: Labels of the time series
+        """
+
+        key = self._labels(labels)
+        index = bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__values.setdefault(name, {})
+            counts = series.get(key)
+            if counts is None:
+                counts = series[key] = [0] * (len(self.buckets) + 3)
+            counts[index] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def get(self, name, **labels):
+        """ Returns the current value of a time series
+
+        :param name: Name of the metric without prefix
+        :param labels: Labels of the time series
+        :returns: The value of counters and gauges, a tuple of count and \
+        sum for histograms or ``None`` if nothing was recorded yet
+        """
+
+        with self.__lock:
+            value = self.__values.get(name, {}).get(self._labels(labels))
+        if isinstance(value, list):
+            return value[-1], value[-2]
+        return value
+
+    def reset(self):
+        """ Drops all recorded values """
+
+        with self.__lock:
+            self.__values = {}
+
+    def render(self):
+        """ Renders all metrics in the Prometheus text exposition format
+
+        :returns: A string
+        """
+
+        with self.__lock:
+            values = dict((name, dict((key, list(value)
+                                       if isinstance(value, list) else value)
+                                      for key, value in series.items()))
+                          for name, series in self.__values.items())
+
+        lines = []
+        for name in sorted(values):
+            kind, description = self.metrics.get(name, ('untyped', name))
+            full = '%s_%s' % (self.prefix, name)
+            lines.append('# HELP %s %s' % (full, description))
+            lines.append('# TYPE %s %s' % (full, kind))
+            for key, value in sorted(values[name].items()):
+                if not isinstance(value, list):
+                    lines.append('%s%s %s' % (full, _format_labels(key),
+                                              _format_value(value)))
+                    continue
+                cumulative = 0
+                bounds = [_format_value(float(bound))
+                          for bound in self.buckets] + ['+Inf']
+                for bound, count in zip(bounds, value):
+                    cumulative += count
+                    lines.append('%s_bucket%s %i' % (
+                        full, _format_labels(key + (('le', bound),)),
+                        cumulative))
+                lines.append('%s_sum%s %s' % (full, _format_labels(key),
+                                              _format_value(value[-2])))
+                lines.append('%s_count%s %i' % (full, _format_labels(key),
+                                                value[-1]))
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=0, host='127.0.0.1'):
+        """ Serves the rendered metrics on every path of a local HTTP \
+        port within a background thread, e.g. to be scraped at \
+        ``http://127.0.0.1:9100/metrics``
+
+        :param port: Port to listen on. Default value is ``0`` which \
+        picks a free port
+        :param host: Host to listen on. Default value is ``127.0.0.1``
+        :returns: The port listened on
+        """
+
+        self.stop()
+        server = create_http_server((host, port), _MetricsHandler)
+        server.metrics = self
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.__server = (server, thread)
+        return server.server_address[1]
+
+    def stop(self):
+        """ Stops serving the metrics (if served at all) """
+
+        if self.__server is not None:
+            server, thread = self.__server
+            self.__server = None
+            server.shutdown()
+            thread.join()
+            server.server_close()
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return '%i' % value
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (name, value.replace('\\', '\\\\')
+                     .replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in key)
+
+
+class _MetricsHandler(object):
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type',
+                         'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', '%i' % len(body))
+        self.end_headers()
+        self.wfile.write(body)
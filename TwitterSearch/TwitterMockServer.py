@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+
+from .TwitterSearch import TwitterSearch
+from .TwitterSearchException import TwitterSearchException
+from .utils import json_dumps, create_http_server
+
+try:
+    from urllib.parse import urlsplit, parse_qs  # python3
+except ImportError:
+    from urlparse import urlsplit, parse_qs  # python2
+
+_WORDS = ('heidelberg', 'python', 'twitter', 'search', 'river', 'castle',
+          'bridge', 'science', 'coffee', 'weather', 'music', 'library')
+
+_LANGUAGES = [
+    {'code': 'en', 'name': 'English', 'status': 'production'},
+    {'code': 'de', 'name': 'German', 'status': 'production'},
+    {'code': 'fr', 'name': 'French', 'status': 'production'},
+    {'code': 'es', 'name': 'Spanish', 'status': 'production'},
+    {'code': 'ja', 'name': 'Japanese', 'status': 'production'},
+]
+
+_OAUTH_TOKEN = re.compile(r'oauth_token="([^"]*)"')
+
+_DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+           'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+_ERRORS = {
+    401: (32, 'Could not authenticate you.'),
+    404: (34, 'Sorry, that page does not exist.'),
+    429: (88, 'Rate limit exceeded'),
+}
+
+
+def _format_time(timestamp):
+    # strftime() depends on the locale
+    t = time.gmtime(timestamp)
+    return '%s %s %02i %02i:%02i:%02i +0000 %i' % (
+        _DAYS[t.tm_wday], _MONTHS[t.tm_mon - 1], t.tm_mday,
+        t.tm_hour, t.tm_min, t.tm_sec, t.tm_year)
+
+
+class TwitterMockServer(object):
+    """
+    Local stand-in for ``api.twitter.com/1.1`` to benchmark and load-test
+    the whole client stack without network access. It serves
+    ``search/tweets.json``, ``statuses/user_timeline.json``,
+    ``help/languages.json``, ``account/verify_credentials.json`` and
+    bearer tokens out of a corpus of tweets, honoring ``max_id``,
+    ``since_id`` and ``count``. Responses carry ``x-rate-limit-*``
+    headers per endpoint and credentials and exhausted endpoints are
+    answered with HTTP status 429. Search queries (``q``) are not
+    evaluated, every query pages through the whole corpus.
+
+    Point a client to it using its ``base_url`` argument, e.g.
+    ``TwitterSearch(..., base_url=server.get_base_url())``.
+    """
+
+    # requests per window and endpoint as documented by Twitter
+    default_rate_limits = {
+        'search/tweets': 180,
+        'statuses/user_timeline': 900,
+        'help/languages': 15,
+        'account/verify_credentials': 75,
+    }
+
+    def __init__(self, corpus=None, latency=0, rate_limits=None, window=900,
+                 compress=True, host='127.0.0.1', port=0):
+        """ Constructor
+
+        :param corpus: A ``list`` of tweets to serve. Defaults to \
+        ``synthetic_corpus(1000)``
+        :param latency: Seconds every response is delayed. \
+        Default value is ``0``
+        :param rate_limits: A ``dict`` of requests per window by endpoint \
+        (e.g. ``{'search/tweets': 180}``) overriding \
+        ``default_rate_limits``. Limits apply per credentials
+        :param window: Length of a rate-limit window in seconds. \
+        Default value is ``900``
+        :param compress: Boolean. If ``True``, responses are gzip \
+        compressed for clients accepting it. Default value is ``True``
+        :param host: Host to listen on. Default value is ``127.0.0.1``
+        :param port: Port to listen on. Default value is ``0`` which \
+        picks a free port
+        :raises: TwitterSearchException
+        """
+
+        if corpus is None:
+            corpus = self.synthetic_corpus(1000)
+        if not isinstance(corpus, list):
+            raise TwitterSearchException(1001)
+        if not isinstance(latency, (int, float)) or latency < 0:
+            raise TwitterSearchException(1004)
+        if not isinstance(window, (int, float)) or window <= 0:
+            raise TwitterSearchException(1004)
+        if not isinstance(compress, bool):
+            raise TwitterSearchException(1008)
+
+        self.latency = latency
+        self.window = window
+        self.compress = compress
+        self.rate_limits = dict(self.default_rate_limits)
+        self.rate_limits.update(rate_limits or {})
+        self.requests = 0
+
+        # tweets ordered by descending ID and encoded only once
+        by_id = dict((tweet['id'], tweet) for tweet in corpus)
+        self.__ids = sorted(by_id)
+        self.__encoded = dict((tweet_id, json_dumps(tweet))
+                              for tweet_id, tweet in by_id.items())
+        self.__users = {}
+        self.__timelines = {}
+        for tweet_id in self.__ids:
+            user = by_id[tweet_id]['user']
+            self.__users[user['screen_name'].lower()] = user
+            self.__users[str(user['id'])] = user
+            self.__timelines.setdefault(user['id'], []).append(tweet_id)
+
+        self.__windows = {}
+        self.__lock = threading.Lock()
+        self.__server = create_http_server((host, port), _Handler)
+        self.__server.mock = self
+        self.__thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @staticmethod
+    def synthetic_corpus(amount, users=10, seed=0):
+        """ Generates tweets looking like the ones of the Twitter API
+
+        :param amount: Amount of tweets
+        :param users: Amount of distinct users. Default value is ``10``
+        :param seed: Seed of the random generator. Default value is ``0``
+        :returns: A ``list`` of tweets as ``dict``
+        """
+
+        rng = random.Random(seed)
+        authors = [{'id': 1000 + i, 'id_str': str(1000 + i),
+                    'name': 'User %i' % i, 'screen_name': 'user%i' % i,
+                    'lang': rng.choice(_LANGUAGES)['code'],
+                    'followers_count': rng.randint(0, 100000)}
+                   for i in range(users)]
+
+        tweets = []
+        tweet_id = 355716296001859586
+        created = 1373644348  # Fri Jul 12 15:52:28 +0000 2013
+        for i in range(amount):
+            tweet_id -= rng.randint(1, 1 << 20)
+            created -= rng.randint(0, 30)
+            user = rng.choice(authors)
+            words = [rng.choice(_WORDS) for j in range(rng.randint(3, 12))]
+            hashtags = sorted(set(rng.choice(words)
+                                  for j in range(rng.randint(0, 2))))
+            mentions = [rng.choice(authors)
+                        for j in range(rng.randint(0, 1))]
+            tweets.append({
+                'id': tweet_id,
+                'id_str': str(tweet_id),
+                'created_at': _format_time(created),
+                'text': ' '.join(words + ['#' + h for h in hashtags]),
+                'lang': user['lang'],
+                'source': 'web',
+                'truncated': False,
+                'in_reply_to_status_id': None,
+                'user': user,
+                'entities': {
+                    'hashtags': [{'text': h} for h in hashtags],
+                    'user_mentions': [{'id': m['id'],
+                                       'screen_name': m['screen_name']}
+                                      for m in mentions],
+                    'urls': [],
+                },
+                'retweet_count': rng.randint(0, 50),
+                'favorite_count': rng.randint(0, 50),
+                'metadata': {'result_type': 'recent',
+                             'iso_language_code': user['lang']},
+            })
+        return tweets
+
+    @staticmethod
+    def load_corpus(paths):
+        """ Reads the tweets of recorded pages, e.g. the files of \
+        ``tests/mock-data`` or a directory written by \
+        :class:`TwitterRecordingAdapter`
+
+        :param paths: A ``list`` of files or directories containing \
+        search pages or user timelines as JSON
+        :returns: A ``list`` of tweets as ``dict``
+        """
+
+        tweets = []
+        for path in paths:
+            if os.path.isdir(path):
+                files = [os.path.join(path, name)
+                         for name in sorted(os.listdir(path))
+                         if name.endswith('.log')]
+            else:
+                files = [path]
+            for filename in files:
+                with open(filename, 'rb') as f:
+                    try:
+                        page = json.loads(f.read().decode('utf-8'),
+                                          strict=False)
+                    except ValueError:
+                        continue  # e.g. the index of a recording
+                if isinstance(page, dict):
+                    page = page.get('statuses')
+                if isinstance(page, list):
+                    tweets.extend(tweet for tweet in page
+                                  if isinstance(tweet, dict) and
+                                  'id' in tweet and 'user' in tweet)
+        return tweets
+
+    def start(self):
+        """ Starts serving within a background thread """
+
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__server.serve_forever)
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def stop(self):
+        """ Stops serving and closes the listening socket """
+
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def get_base_url(self):
+        """ Returns the URL to use as ``base_url`` of clients
+
+        :returns: A string like ``http://127.0.0.1:8080/1.1/``
+        """
+
+        host, port = self.__server.server_address[:2]
+        return 'http://%s:%i/1.1/' % (host, port)
+
+    def _acquire(self, resource, credentials):
+        """ Counts a request against the rate limit of an endpoint
+
+        :returns: A tuple of the ``x-rate-limit-*`` headers and a \
+        boolean whether the request is allowed
+        """
+
+        now = time.time()
+        limit = self.rate_limits.get(resource, 180)
+        with self.__lock:
+            self.requests += 1
+            key = (resource, credentials)
+            remaining, reset = self.__windows.get(key, (limit, 0))
+            if now >= reset:
+                remaining, reset = limit, int(now + self.window)
+            allowed = remaining > 0
+            remaining = max(remaining - 1, 0)
+            self.__windows[key] = (remaining, reset)
+
+        headers = {'x-rate-limit-limit': '%i' % limit,
+                   'x-rate-limit-remaining': '%i' % remaining,
+                   'x-rate-limit-reset': '%i' % reset}
+        return headers, allowed
+
+    def _page(self, ids, args, default_count, max_count):
+        """ Selects the IDs of a page honoring ``max_id``, ``since_id`` \
+        and ``count``
+
+        :param ids: A ``list`` of ascending tweet IDs
+        :param args: The parsed query string
+        :returns: A ``list`` of descending tweet IDs
+        """
+
+        count = min(int(args.get('count', [default_count])[0]), max_count)
+        end = len(ids)
+        if 'max_id' in args:
+            end = bisect.bisect_right(ids, int(args['max_id'][0]))
+        start = 0
+        if 'since_id' in args:
+            start = bisect.bisect_right(ids, int(args['since_id'][0]))
+        start = max(start, end - count)
+        return ids[start:end][::-1]
+
+    def _encode(self, ids):
+        return b'[' + b','.join(self.__encoded[i] for i in ids) + b']'
+
+    def respond(self, method, path, query, headers):
+        """ Answers a single request
+
+        :param method: ``GET`` or ``POST``
+        :param path: Path of the URL, e.g. ``/1.1/search/tweets.json``
+        :param query: The query string of the URL
+        :param headers: The request headers
+        :returns: A tuple of HTTP status, response headers and body
+        """
+
+        if method == 'POST' and path == '/oauth2/token':
+            return 200, {}, json_dumps({'token_type': 'bearer',
+                                        'access_token': 'MOCK%i' % id(self)})
+
+        credentials = headers.get('Authorization')
+        if credentials is None:
+            return self._error(401, {})
+        # OAuth headers differ by nonce and signature on every request
+        match = _OAUTH_TOKEN.search(credentials)
+        if match is not None:
+            credentials = match.group(1)
+
+        resource = path[len('/1.1/'):]
+        if resource.endswith('.json'):
+            resource = resource[:-5]
+        rate_headers, allowed = self._acquire(resource, credentials)
+        if not allowed:
+            return self._error(429, rate_headers)
+
+        args = parse_qs(query)
+        if resource == TwitterSearch._search_url[:-5]:
+            ids = self._page(self.__ids, args, 15, 100)
+            count = int(args.get('count', [15])[0])
+            meta = {'completed_in': 0.001, 'count': count,
+                    'query': args.get('q', [''])[0],
+                    'max_id': ids[0] if ids else 0,
+                    'max_id_str': str(ids[0] if ids else 0),
+                    'since_id': int(args.get('since_id', [0])[0]),
+                    'since_id_str': args.get('since_id', ['0'])[0]}
+            if len(ids) == count:
+                meta['next_results'] = '?max_id=%i&count=%i' % (ids[-1] - 1,
+                                                                count)
+            body = (b'{"statuses":' + self._encode(ids) +
+                    b',"search_metadata":' + json_dumps(meta) + b'}')
+        elif resource == TwitterSearch._user_url[:-5]:
+            user = self.__users.get(
+                args.get('screen_name', args.get('user_id', ['']))[0].lower())
+            if user is None:
+                return self._error(404, rate_headers)
+            body = self._encode(self._page(self.__timelines[user['id']],
+                                           args, 20, 200))
+        elif resource == TwitterSearch._lang_url[:-5]:
+            body = json_dumps(_LANGUAGES)
+        elif resource == TwitterSearch._verify_url[:-5]:
+            body = json_dumps(next(iter(self.__users.values()), {}))
+        else:
+            return self._error(404, rate_headers)
+        return 200, rate_headers, body
+
+    @staticmethod
+    def _error(status, headers):
+        code, message = _ERRORS[status]
+        return status, headers, json_dumps({'errors': [{'code': code,
+                                                        'message': message}]})
+
+
+class _Handler(object):
+
+    protocol_version = 'HTTP/1.1'
+
+    # headers and body are sent separately, delayed ACKs of kept-alive
+    # connections would add 40ms to every response otherwise
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.__respond('GET')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.__respond('POST')
+
+    def __respond(self, method):
+        mock = self.server.mock
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        parts = urlsplit(self.path)
+        status, headers, body = mock.respond(method, parts.path, parts.query,
+                                             self.headers)
+
+        if mock.compress and 'gzip' in (self.headers.get('Accept-Encoding')
+                                        or ''):
+            compressor = zlib.compressobj(1, zlib.DEFLATED, 31)
+            body = compressor.compress(body) + compressor.flush()
+            headers['Content-Encoding'] = 'gzip'
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=utf-8')
+        self.send_header('Content-Length', '%i' % len(body))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    """ Runs a mock server from the command line, e.g. \
+    ``python -m TwitterSearch.TwitterMockServer --port 8080 --tweets 10000``
+    """
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Local stand-in for the Twitter API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--tweets', type=int, default=1000,
+                        help='size of the synthetic corpus')
+    parser.add_argument('--corpus', nargs='*', default=None,
+                        help='recorded pages to serve instead')
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--window', type=float, default=900)
+    args = parser.parse_args()
+
+    corpus = (TwitterMockServer.load_corpus(args.corpus) if args.corpus
+              else TwitterMockServer.synthetic_corpus(args.tweets))
+    server = TwitterMockServer(corpus, latency=args.latency,
+                               window=args.window, host=args.host,
+                               port=args.port)
+    print('Serving %i tweets at %s' % (len(corpus), server.get_base_url()))
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from .TwitterSearchException import TwitterSearchException
-from .utils import py3k
+from .TwitterProjection import TwitterProjection
+from .utils import py3k, quote_plus
 
 
 class TwitterOrder(object):
@@ -10,12 +11,96 @@ class TwitterOrder(object):
     implemented by all children
     """
 
-    arguments = {}
+    # fields of tweets to keep, see set_projection()
+    projection = None
+
+    # arguments of the query string and the query string itself. The
+    # dict is created per instance by __init__() or the first setter,
+    # thus child classes not calling __init__() keep working
+    arguments = None
+    url = ''
+
+    # query string returned by create_search_url() until the order changes
+    _cached_url = None
+
+    # string returned by get_canonical_form() until the order changes
+    _cached_canonical = None
+
+    def __init__(self):
+        """ Initializes the state of the order. Constructors of child \
+        classes should call it, the ``arguments`` of orders not \
+        initialized are created once the first argument is set
+        """
+
+        self.arguments = {}
+        self.url = ''
+
+    def _set_dirty(self):
+        """ Marks this order as modified. The query string is built \
+        again by the next call of ``create_search_url()``
+        """
+
+        self._cached_url = self._cached_canonical = None
+
+    def _set_argument(self, key, value):
+        """ Stores an argument of the query string
+
+        :param key: Name of the argument, e.g. ``count``
+        :param value: A string containing the value of the argument
+        """
+
+        if self.arguments is None:
+            self.arguments = {}
+        self.arguments[key] = value
+        self._cached_url = self._cached_canonical = None
+
+    def _get_canonical_terms(self):
+        """ Returns the terms of the ``q`` parameter in a normalized \
+        form. Orders without a ``q`` parameter return an empty list
+
+        :returns: A ``list`` of strings
+        """
+
+        return []
+
+    def get_canonical_form(self):
+        """ Returns a serialization of this order which doesn't depend \
+        on the order keywords, filters and arguments were set in. \
+        Orders querying the very same tweets return equal strings, e.g. \
+        ``TwitterSearchOrder?q=bar+foo&count=100&lang=en``. \
+        Equality and hash values of orders are based on this string
+
+        :returns: A string starting with the name of the class of the order
+        """
+
+        if self._cached_canonical is None:
+            parts = ['%s=%s' % (quote_plus(key), quote_plus(value))
+                     for key, value in sorted((self.arguments or {}).items())]
+            terms = sorted(quote_plus(i) for i in self._get_canonical_terms())
+            if terms:
+                parts.insert(0, 'q=' + '+'.join(terms))
+            self._cached_canonical = '%s?%s' % (self.__class__.__name__,
+                                                '&'.join(parts))
+        return self._cached_canonical
+
+    def __eq__(self, other):
+        if not isinstance(other, TwitterOrder):
+            return NotImplemented
+        return self.get_canonical_form() == other.get_canonical_form()
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        # orders used as keys of dicts or sets mustn't be modified afterwards
+        return hash(self.get_canonical_form())
 
     def create_search_url(self):
         """ Generates an url-encoded query string from \
         stored key-values tuples. Has to be implemented \
-        within child classes
+        within child classes. Implementations return the string \
+        cached in ``_cached_url`` unless the order was modified
 
         :raises: NotImplementedError
         """
@@ -49,7 +134,7 @@ class TwitterOrder(object):
                 raise TwitterSearchException(1004)
 
         if twid > 0:
-            self.arguments.update({'since_id': '%s' % twid})
+            self._set_argument('since_id', '%s' % twid)
         else:
             raise TwitterSearchException(1004)
 
@@ -70,7 +155,7 @@ class TwitterOrder(object):
                 raise TwitterSearchException(1004)
 
         if twid > 0:
-            self.arguments.update({'max_id': '%s' % twid})
+            self._set_argument('max_id', '%s' % twid)
         else:
             raise TwitterSearchException(1004)
 
@@ -84,7 +169,7 @@ class TwitterOrder(object):
         """
 
         if isinstance(cnt, int) and cnt > 0 and cnt <= 100:
-            self.arguments.update({'count': '%s' % cnt})
+            self._set_argument('count', '%s' % cnt)
         else:
             raise TwitterSearchException(1004)
 
@@ -98,6 +183,20 @@ class TwitterOrder(object):
 
         if not isinstance(include, bool):
             raise TwitterSearchException(1008)
-        self.arguments.update(
-            {'include_entities': 'true' if include else 'false'}
-        )
+        self._set_argument('include_entities', 'true' if include else 'false')
+
+    def set_projection(self, fields):
+        """ Sets the fields of tweets to keep while decoding responses \
+        to this order, e.g. ``['text', 'user.id', 'entities.hashtags']``. \
+        Overrides the ``projection`` of the :class:`TwitterSearch` instance
+
+        :param fields: A ``list`` of field names with nested fields \
+        separated by dots, a :class:`TwitterProjection` instance or \
+        ``None`` to keep all fields
+        :raises: TwitterSearchException
+        """
+
+        if fields is None or isinstance(fields, TwitterProjection):
+            self.projection = fields
+        else:
+            self.projection = TwitterProjection(fields)
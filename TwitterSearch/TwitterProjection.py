@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+from .TwitterSearchException import TwitterSearchException
+from .TwitterStreamParser import TwitterStreamParser
+from .utils import py3k, json_loads
+
+
+class TwitterProjection(object):
+    """
+    Selects the fields of tweets to keep, e.g.
+    ``TwitterProjection(['created_at', 'text', 'user.id',
+    'entities.hashtags'])``. Nested fields are separated by dots and
+    are applied to every element of lists. The ``id`` of tweets is
+    always kept as it is needed to query further pages. Pages are
+    projected tweet by tweet while being decoded, thus the full
+    tweets of a page are never kept in memory at once.
+    """
+
+    def __init__(self, fields):
+        """ Constructor
+
+        :param fields: A ``list`` or ``tuple`` of strings naming the \
+        fields to keep
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(fields, (list, tuple)):
+            raise TwitterSearchException(1001)
+
+        self.fields = tuple(fields)
+        self._tree = {'id': None}
+        for field in self.fields:
+            if not isinstance(field, str if py3k else basestring) or \
+                    not field:
+                raise TwitterSearchException(1009)
+
+            tree = self._tree
+            keys = field.split('.')
+            for key in keys[:-1]:
+                if key in tree and tree[key] is None:
+                    break  # the whole parent is kept anyway
+                tree = tree.setdefault(key, {})
+            else:
+                tree[keys[-1]] = None
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, ','.join(self.fields))
+
+    def __call__(self, tweet):
+        """ Projects a single tweet
+
+        :param tweet: A decoded tweet as ``dict``
+        :returns: A new ``dict`` containing the selected fields only
+        """
+
+        return self._project(tweet, self._tree)
+
+    @classmethod
+    def _project(cls, value, tree):
+        if isinstance(value, list):
+            return [cls._project(item, tree) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        result = {}
+        for key, subtree in tree.items():
+            if key in value:
+                result[key] = (value[key] if subtree is None
+                               else cls._project(value[key], subtree))
+        return result
+
+    def loads(self, data, key=None, json_loads=json_loads):
+        """ Decodes a page projecting its tweets one after another
+
+        :param data: The raw ``bytes`` of a response
+        :param key: Name of the key of the top-level object containing \
+        the tweets (i.e. ``statuses`` for the Search API). Default value \
+        is ``None`` which means that the page is a list of tweets
+        :param json_loads: Function decoding everything but the tweets
+        :returns: The decoded page containing projected tweets
+        """
+
+        return TwitterStreamParser.loads(data, key, json_loads, self)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+
+class TwitterRateLimit(object):
+    """
+    Rate-limit state of one endpoint of the Twitter API as reported by
+    the ``x-rate-limit-limit``, ``x-rate-limit-remaining`` and
+    ``x-rate-limit-reset`` headers of its last response.
+    """
+
+    def __init__(self, limit, remaining, reset):
+        """ Constructor
+
+        :param limit: Amount of requests allowed within one window
+        :param remaining: Amount of requests left within the current window
+        :param reset: UTC epoch seconds at which the current window ends
+        """
+
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+
+    def __repr__(self):
+        return '<%s %i/%i reset=%i>' % (self.__class__.__name__,
+                                        self.remaining, self.limit,
+                                        self.reset)
+
+    def __eq__(self, other):
+        return (isinstance(other, TwitterRateLimit) and
+                (self.limit, self.remaining, self.reset) ==
+                (other.limit, other.remaining, other.reset))
+
+    def __ne__(self, other):
+        return not self == other
+
+    # the limiter decrements remaining with every query, thus limits
+    # compare by value but are unhashable on python2 as well as python3
+    __hash__ = None
+
+    @classmethod
+    def from_headers(cls, headers):
+        """ Parses the rate-limit headers of a response
+
+        :param headers: A ``dict`` of HTTP response headers
+        :returns: A :class:`TwitterRateLimit` instance or ``None`` \
+        if the headers don't contain (valid) rate-limit information
+        """
+
+        try:
+            return cls(int(headers['x-rate-limit-limit']),
+                       int(headers['x-rate-limit-remaining']),
+                       int(headers['x-rate-limit-reset']))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def seconds_until_reset(self, now=None):
+        """ Returns the amount of seconds until the current window ends
+
+        :param now: Current UTC epoch seconds. Defaults to ``time.time()``
+        :returns: A non-negative float
+        """
+
+        return max(self.reset - (time.time() if now is None else now), 0.0)
+
+
+class TwitterRateLimiter(object):
+    """
+    Keeps track of the rate-limit state of every queried endpoint and
+    schedules requests accordingly. If pacing is enabled, requests are
+    spread evenly over the remaining window instead of using up the whole
+    budget at once and stalling afterwards. Each endpoint is scheduled as a
+    token bucket refilling at ``remaining / seconds_until_reset`` tokens per
+    second and holding at most ``burst`` tokens. One instance can be shared
+    by several :class:`TwitterSearch` instances using the same credentials.
+    """
+
+    def __init__(self, pacing=True, burst=1, clock=time.time,
+                 sleep=time.sleep):
+        """ Constructor
+
+        :param pacing: Boolean. If ``False``, requests are never delayed \
+        and only the rate-limit state is tracked. Default value is ``True``
+        :param burst: Amount of requests allowed to be sent back-to-back \
+        before pacing applies. Default value is ``1``
+        :param clock: Function returning the current UTC epoch seconds
+        :param sleep: Function used to delay requests
+        """
+
+        self.pacing = pacing
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._limits = {}
+        self._schedule = {}
+        self._lock = threading.Lock()
+
+    def update(self, resource, headers):
+        """ Updates the state of an endpoint using the headers \
+        of one of its responses
+
+        :param resource: Name of the endpoint, e.g. ``search/tweets``
+        :param headers: A ``dict`` of HTTP response headers
+        :returns: The parsed :class:`TwitterRateLimit` or ``None``
+        """
+
+        limit = TwitterRateLimit.from_headers(headers)
+        if limit is not None:
+            with self._lock:
+                self._limits[resource] = limit
+        return limit
+
+    def get(self, resource=None):
+        """ Returns the last known rate-limit state
+
+        :param resource: Name of the endpoint, e.g. ``search/tweets``. \
+        If ``None``, the state of all known endpoints is returned
+        :returns: A :class:`TwitterRateLimit` instance (``None`` if the \
+        endpoint wasn't queried yet) or a ``dict`` of those instances
+        """
+
+        with self._lock:
+            if resource is None:
+                return dict(self._limits)
+            return self._limits.get(resource)
+
+    def delay(self, resource):
+        """ Reserves a slot for the next request to an endpoint
+
+        :param resource: Name of the endpoint, e.g. ``search/tweets``
+        :returns: Seconds to wait before the request may be sent
+        """
+
+        with self._lock:
+            limit = self._limits.get(resource)
+            now = self._clock()
+            if limit is None or now >= limit.reset:
+                return 0.0
+
+            window = limit.reset - now
+            if not self.pacing:
+                wait = 0.0
+            elif limit.remaining <= 0:
+                wait = window
+            else:
+                # token bucket expressed as theoretical arrival time
+                interval = window / limit.remaining
+                arrival = max(self._schedule.get(resource, now), now)
+                wait = max(arrival - (self.burst - 1) * interval - now, 0.0)
+                self._schedule[resource] = arrival + interval
+
+            # count the request until the next response updates the state
+            limit.remaining = max(limit.remaining - 1, 0)
+            return wait
+
+    def acquire(self, resource, stop=None):
+        """ Blocks until the next request to an endpoint may be sent
+
+        :param resource: Name of the endpoint, e.g. ``search/tweets``
+        :param stop: A ``threading.Event`` ending the wait early once \
+        it is set. Default value is ``None``
+        :returns: Seconds spent waiting
+        """
+
+        wait = self.delay(resource)
+        if wait > 0:
+            if stop is not None and self._sleep is time.sleep:
+                stop.wait(wait)
+            else:
+                self._sleep(wait)
+        return wait
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os
+import threading
+import time
+
+from .TwitterSearchException import TwitterSearchException
+from .utils import py3k
+
+# name of the file listing all recorded requests, one JSON object per line
+INDEX = 'requests.log'
+
+# headers describing the encoding of the body on the wire
+_WIRE_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+# request headers which are never written to disk
+_SECRET_HEADERS = ('authorization', 'cookie')
+
+
+def _text(value):
+    # headers and bodies of prepared requests might be bytes
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return value
+
+
+def _build_response(adapter, request, status, headers, body):
+    """ Creates a ``requests.Response`` from a recorded response. \
+    The body is readable just like the one of a response received \
+    from the network, including streaming
+
+    :param adapter: The ``HTTPAdapter`` serving the request
+    :param request: The ``requests.PreparedRequest`` to answer
+    :param status: Integer value of the HTTP status
+    :param headers: A ``dict`` of response headers
+    :param body: The ``bytes`` of the decoded body
+    :returns: A ``requests.Response`` instance
+    """
+
+    from urllib3 import HTTPResponse
+
+    headers = dict(headers)
+    headers['Content-Length'] = '%i' % len(body)
+    raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status,
+                       preload_content=False, decode_content=False)
+    return adapter.build_response(request, raw)
+
+
+class _Adapter(object):
+    """ Base of transport adapters wrapping an ``HTTPAdapter``. \
+    ``requests`` is imported once an adapter is created only
+    """
+
+    def __init__(self, **attr):
+        from requests.adapters import HTTPAdapter
+        self._adapter = HTTPAdapter(**attr)
+
+    @property
+    def poolmanager(self):
+        return self._adapter.poolmanager
+
+    def send(self, request, stream=False, **kwargs):
+        raise NotImplementedError
+
+    def close(self):
+        self._adapter.close()
+
+
+class TwitterRecordingAdapter(_Adapter):
+    """
+    Transport adapter of ``requests`` writing every request along with
+    its response to a directory. Response bodies are stored decompressed
+    as numbered ``.log`` files just like the files of ``tests/mock-data``.
+    The URL, method, headers, status and latency of each request are
+    appended to ``requests.log`` as one JSON object per line.
+    ``Authorization`` and ``Cookie`` headers are never written.
+    Recordings are served again by :class:`TwitterReplayAdapter`.
+    """
+
+    def __init__(self, directory, **attr):
+        """ Constructor
+
+        :param directory: A string containing the path of the directory \
+        to write to. It is created if needed and existing recordings \
+        are appended
+
+        Further arguments are handed over to ``HTTPAdapter``
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(directory, str if py3k else basestring):
+            raise TwitterSearchException(1009)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        _Adapter.__init__(self, **attr)
+        self.directory = directory
+        self.__lock = threading.Lock()
+
+        self.__count = 0
+        index = os.path.join(directory, INDEX)
+        if os.path.exists(index):
+            with open(index, 'rb') as f:
+                self.__count = sum(1 for line in f if line.strip())
+
+    def send(self, request, stream=False, **kwargs):
+        start = time.time()
+        r = self._adapter.send(request, stream=True, **kwargs)
+        try:
+            body = r.raw.read(decode_content=True)
+        finally:
+            r.close()
+        elapsed = time.time() - start
+
+        headers = dict((key, value) for key, value in r.headers.items()
+                       if key.lower() not in _WIRE_HEADERS)
+        with self.__lock:
+            filename = '%i.log' % self.__count
+            self.__count += 1
+            with open(os.path.join(self.directory, filename), 'wb') as f:
+                f.write(body)
+            exchange = {
+                'method': request.method,
+                'url': request.url,
+                'request_headers': dict(
+                    (_text(key), _text(value))
+                    for key, value in request.headers.items()
+                    if _text(key).lower() not in _SECRET_HEADERS),
+                'request_body': _text(request.body),
+                'status': r.status_code,
+                'headers': headers,
+                'body': filename,
+                'elapsed': elapsed,
+            }
+            with open(os.path.join(self.directory, INDEX), 'ab') as f:
+                f.write(json.dumps(exchange, sort_keys=True).encode('utf-8'))
+                f.write(b'\n')
+
+        return _build_response(self._adapter, request, r.status_code,
+                               headers, body)
+
+
+class TwitterReplayAdapter(_Adapter):
+    """
+    Transport adapter of ``requests`` answering requests with the
+    responses recorded by :class:`TwitterRecordingAdapter` without any
+    network access. Requests are matched by method and URL. Responses
+    recorded several times for the same request are returned in the
+    order of recording, starting over once all were returned.
+    """
+
+    def __init__(self, directory, latency=False):
+        """ Constructor
+
+        :param directory: A string containing the path of a directory \
+        written by :class:`TwitterRecordingAdapter`
+        :param latency: Boolean. If ``True``, each response is delayed \
+        by its recorded latency. Default value is ``False`` which \
+        returns responses at full speed
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(directory, str if py3k else basestring):
+            raise TwitterSearchException(1009)
+        if not isinstance(latency, bool):
+            raise TwitterSearchException(1008)
+
+        _Adapter.__init__(self)
+        self.directory = directory
+        self.latency = latency
+        self.__lock = threading.Lock()
+        self.__positions = {}
+
+        # all bodies are kept in memory to replay at full speed
+        self.__exchanges = {}
+        with open(os.path.join(directory, INDEX), 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                exchange = json.loads(line.decode('utf-8'))
+                with open(os.path.join(directory, exchange['body']),
+                          'rb') as body:
+                    exchange['body'] = body.read()
+                self.__exchanges.setdefault(
+                    (exchange['method'], exchange['url']), []).append(exchange)
+
+    def send(self, request, stream=False, **kwargs):
+        key = (request.method, request.url)
+        with self.__lock:
+            exchanges = self.__exchanges.get(key)
+            if not exchanges:
+                raise TwitterSearchException(1026)
+            position = self.__positions.get(key, 0)
+            self.__positions[key] = (position + 1) % len(exchanges)
+        exchange = exchanges[position]
+
+        if self.latency:
+            time.sleep(exchange['elapsed'])
+        return _build_response(self._adapter, request, exchange['status'],
+                               exchange['headers'], exchange['body'])
+
+    def close(self):
+        pass
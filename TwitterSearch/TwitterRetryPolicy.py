@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import random
+import time
+
+
+class TwitterRetryPolicy(object):
+    """
+    Describes whether and when a failed query to the Twitter API is
+    repeated. Delays grow exponentially with every attempt and are
+    jittered to avoid synchronized retries of many clients. Delays
+    requested by the Twitter API using ``Retry-After`` or, for rate-limited
+    queries, ``x-rate-limit-reset`` headers are always respected.
+    """
+
+    # HTTP states considered to be transient
+    default_statuses = (420, 429, 500, 502, 503, 504)
+
+    # HTTP states caused by rate limiting
+    _rate_limited = (420, 429)
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0,
+                 jitter=1.0, rules=None, respect_headers=True,
+                 random=random.random, clock=time.time, sleep=time.sleep):
+        """ Constructor
+
+        :param max_attempts: Maximum amount of attempts per query \
+        including the first one. Default value is ``5``
+        :param base_delay: Delay in seconds before the first retry. \
+        Doubles with every further attempt. Default value is ``1.0``
+        :param max_delay: Upper limit in seconds of the exponential \
+        delay. Default value is ``60.0``
+        :param jitter: Fraction of the delay which is randomized. \
+        ``0.0`` disables jitter, ``1.0`` picks a delay between zero and \
+        the exponential delay. Default value is ``1.0``
+        :param rules: A ``dict`` mapping HTTP states to be retried to \
+        ``dict`` instances overriding ``max_attempts``, ``base_delay`` \
+        or ``max_delay`` for this very status, \
+        e.g. ``{503: {'max_attempts': 10}, 429: {}}``. Defaults to \
+        an empty rule for every status of ``default_statuses``
+        :param respect_headers: Boolean. Whether ``Retry-After`` and \
+        ``x-rate-limit-reset`` headers are taken into account. \
+        Default value is ``True``
+        :param random: Function returning a random float in ``[0, 1)``
+        :param clock: Function returning the current UTC epoch seconds
+        :param sleep: Function used to delay retries
+        """
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.rules = (dict((status, {}) for status in self.default_statuses)
+                      if rules is None else rules)
+        self.respect_headers = respect_headers
+        self._random = random
+        self._clock = clock
+        self._sleep = sleep
+
+    def get_delay(self, status, attempt, headers=None):
+        """ Determines whether a failed query is repeated
+
+        :param status: Integer value of the HTTP status of the response
+        :param attempt: Amount of attempts done so far (starting with 1)
+        :param headers: A ``dict`` of HTTP response headers
+        :returns: Seconds to wait before the next attempt or ``None`` \
+        if the query should not be repeated
+        """
+
+        rule = self.rules.get(status)
+        if rule is None or attempt >= rule.get('max_attempts',
+                                               self.max_attempts):
+            return None
+
+        delay = min(rule.get('max_delay', self.max_delay),
+                    rule.get('base_delay', self.base_delay) *
+                    2 ** (attempt - 1))
+        delay *= 1.0 - self.jitter * self._random()
+
+        if self.respect_headers and headers:
+            delay = max(delay, self._get_header_delay(status, headers))
+        return delay
+
+    def sleep(self, delay, stop=None):
+        """ Waits before the next attempt
+
+        :param delay: Seconds to wait as returned by ``get_delay()``
+        :param stop: A ``threading.Event`` ending the wait early once \
+        it is set. Default value is ``None``
+        """
+
+        if delay > 0:
+            if stop is not None and self._sleep is time.sleep:
+                stop.wait(delay)
+            else:
+                self._sleep(delay)
+
+    def _get_header_delay(self, status, headers):
+        now = self._clock()
+        delay = 0.0
+
+        retry_after = headers.get('retry-after')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                # imported on first usage to keep importing fast
+                from email.utils import parsedate_tz, mktime_tz
+
+                date = parsedate_tz(retry_after)
+                if date:
+                    delay = mktime_tz(date) - now
+
+        if status in self._rate_limited:
+            try:
+                delay = max(delay,
+                            int(headers['x-rate-limit-reset']) - now)
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        return max(delay, 0.0)
@@ -1,24 +1,54 @@
 # -*- coding: utf-8 -*-
 
-import requests
-from requests_oauthlib import OAuth1
+import time
+import threading
+from collections import deque
+from operator import itemgetter
 from .TwitterSearchException import TwitterSearchException
 from .TwitterOrder import TwitterOrder
 from .TwitterSearchOrder import TwitterSearchOrder
 from .TwitterUserOrder import TwitterUserOrder
-from .utils import py3k
+from .TwitterRateLimiter import TwitterRateLimiter
+from .TwitterRetryPolicy import TwitterRetryPolicy
+from .TwitterStatistics import TwitterStatistics
+from .TwitterStreamParser import TwitterStreamParser
+from .TwitterProjection import TwitterProjection
+from .TwitterBatch import TwitterBatch
+from .TwitterCursor import TwitterCursor
+from .TwitterMetrics import TwitterMetrics
+from .TwitterTracer import TwitterTracer
+from .TwitterTiming import TwitterTiming, time_connections, connect_time
+from .utils import py3k, json_loads
 
 
 try:
-    from urllib.parse import parse_qs  # python3
+    from urllib.parse import parse_qs, quote_plus, urljoin  # python3
 except ImportError:
-    from urlparse import parse_qs  # python2
+    from urlparse import parse_qs, urljoin  # python2
+    from urllib import quote_plus
 
-# determine max int value
 try:
-    from sys import maxint  # python2
+    from queue import Queue, Empty, Full  # python3
 except ImportError:
-    from sys import maxsize as maxint  # python3
+    from Queue import Queue, Empty, Full  # python2
+
+_get_id = itemgetter('id')
+
+# tracer used by default which records nothing
+_NOOP_TRACER = TwitterTracer()
+
+
+class BearerAuth(object):
+    """ Authentication handler of ``requests`` for application-only \
+    requests adding a bearer token to every request instead of signing it
+    """
+
+    def __init__(self, token):
+        self.token = token
+
+    def __call__(self, r):
+        r.headers['Authorization'] = 'Bearer %s' % self.token
+        return r
 
 
 class TwitterSearch(object):
@@ -30,7 +60,8 @@ class TwitterSearch(object):
     along with valid Twitter credentials. Currently two different
     implementations are usable: :class:`TwitterUserOrder` for retrieving the
     timeline of a certain user and :class:`TwitterSearchOrder` for accessing
-    the Twitter Search API.
+    the Twitter Search API. Several orders can be iterated at once
+    using cursors created by ``cursor(order)``.
 
     The methods ``next()``, ``__next__()`` and ``__iter__()`` are used 
     during the iteration process. For more information about those 
@@ -40,11 +71,19 @@ class TwitterSearch(object):
     """
 
     _base_url = 'https://api.twitter.com/1.1/'
+    _token_url = '../oauth2/token'
     _verify_url = 'account/verify_credentials.json'
     _search_url = 'search/tweets.json'
     _lang_url = 'help/languages.json'
     _user_url = 'statuses/user_timeline.json'
 
+    # bytes read at once from streamed responses
+    _chunk_size = 16384
+
+    # credential hash -> (expiry, bearer token) of successful verifications
+    _verified = {}
+    _verified_lock = threading.Lock()
+
     # see https://dev.twitter.com/docs/error-codes-responses
     exceptions = {
         400: 'Bad Request: The request was invalid',
@@ -70,23 +109,131 @@ class TwitterSearch(object):
     }
 
     def __init__(self, consumer_key, consumer_secret,
-                 access_token, access_token_secret, **attr):
+                 access_token=None, access_token_secret=None, **attr):
         """ Constructor
 
         :param consumer_key: Consumer key (app related)
         :param consumer_secret: Consumer consumer_secret (app related)
-        :param access_token: Access token (user related)
+        :param access_token: Access token (user related). \
+        Application-only authentication is used if both, \
+        ``access_token`` and ``access_token_secret``, are omitted
         :param access_token_secret: Access token secret (user related)
 
         :param verify: A boolean variable to control verification of \
         access codes. Default value is ``True`` which \
-        raises an instant exception when using invalid credentials.
+        raises an instant exception when using invalid credentials. \
+        ``background`` verifies within a background thread, see \
+        ``wait_for_verification()``
+
+        :param verify_ttl: Number of seconds a successful verification \
+        of a set of credentials is cached within the process. Further \
+        instances using the same credentials skip verifying until it \
+        expires. Default value is ``None`` which disables caching
+
+        :param app_only: A boolean variable to enforce application-only \
+        authentication using a bearer token instead of signing every \
+        query with the user credentials. Default value is ``True`` if no \
+        user credentials are given, otherwise ``False``
+
+        :param bearer_token: A string containing a bearer token obtained \
+        earlier for application-only authentication. If omitted, a \
+        bearer token is requested from the Twitter API
+
+        :param base_url: A string containing the URL of the Twitter API, \
+        e.g. of a :class:`TwitterMockServer`. Default value is \
+        ``https://api.twitter.com/1.1/``
 
         :param proxy: A string containing a HTTPS proxy \
         (e.g. ``my.proxy.com:8080``). Default value is ``None`` \
         which means that no proxy is used at all.
+
+        :param pool_connections: Number of connection pools (one per host) \
+        cached by the internal HTTP session. Default value is ``1``
+
+        :param pool_maxsize: Maximum number of connections kept alive \
+        per host. Default value is ``10``
+
+        :param keep_alive: A boolean variable to control whether \
+        connections are reused between queries. Default value is ``True``
+
+        :param idle_timeout: Number of seconds after which idle pooled \
+        connections are dropped before the next query. Default value is \
+        ``None`` which keeps idle connections open
+
+        :param pace_requests: A boolean variable to control whether queries \
+        are spread evenly over the current rate-limit window of each \
+        endpoint. Default value is ``False``
+
+        :param rate_limiter: A :class:`TwitterRateLimiter` instance, \
+        e.g. to share rate-limit states between several instances. \
+        Overrides ``pace_requests`` if given
+
+        :param retry_policy: A :class:`TwitterRetryPolicy` instance \
+        defining how queries failing with transient HTTP states are \
+        repeated. Default value is ``None`` which raises an exception \
+        on the first failure
+
+        :param prefetch: Amount of pages queried in the background while \
+        iterating the current page. Default value is ``0`` which \
+        disables prefetching
+
+        :param compression: A boolean variable to control whether \
+        gzip compressed responses are requested. Responses are \
+        decompressed transparently. Default value is ``True``
+
+        :param json_loads: Function decoding the raw bytes of a response, \
+        e.g. ``orjson.loads``. Defaults to the fastest installed decoder \
+        out of ``orjson``, ``ujson``, ``simplejson`` and ``json``
+
+        :param stream: A boolean variable to control whether pages are \
+        parsed incrementally while iterating. Tweets are returned as soon \
+        as they have arrived and only one tweet per page is kept in \
+        memory. Ignored if ``prefetch`` is used. Default value is ``False``
+
+        :param projection: A ``list`` of the fields of tweets to keep \
+        (e.g. ``['text', 'user.id', 'entities.hashtags']``) or a \
+        :class:`TwitterProjection` instance. All other fields are dropped \
+        while decoding. Can be overridden per order using \
+        ``TwitterOrder.set_projection()``. Default value is ``None`` \
+        which keeps all fields
+
+        :param tweet_type: Function or class converting every decoded \
+        tweet, e.g. :class:`Tweet` to keep tweets in a compact form. \
+        Default value is ``None`` which returns tweets as ``dict``
+
+        :param timings: Amount of :class:`TwitterTiming` records of the \
+        latest queries kept, see ``get_timings()``. Default value is \
+        ``100``
+
+        :param metrics: A :class:`TwitterMetrics` registry to record \
+        requests, tweets, bytes, retries, errors, latencies and rate \
+        limits in. Default value is the registry shared by all \
+        instances of the process, ``None`` disables recording
+
+        :param tracer: A :class:`TwitterTracer` receiving spans around \
+        searches, pages, HTTP requests, decoding and callbacks, e.g. a \
+        :class:`TwitterMemoryTracer`. Default value is a tracer which \
+        records nothing
+
+        :param record: A string containing the path of a directory. \
+        Every request and its response are written to it, see \
+        :class:`TwitterRecordingAdapter`. Default value is ``None``
+
+        :param replay: A string containing the path of a directory \
+        written using ``record``. Requests are answered by the recorded \
+        responses without any network access, see \
+        :class:`TwitterReplayAdapter`. Default value is ``None``
+
+        :param replay_latency: A boolean variable to control whether \
+        replayed responses are delayed by their recorded latency. \
+        Default value is ``False`` which replays at full speed
         """
 
+        if "base_url" in attr:
+            if not isinstance(attr["base_url"], str if py3k else basestring):
+                raise TwitterSearchException(1009)
+            self._base_url = attr["base_url"]
+
         # app
         self.__consumer_key = consumer_key
         self.__consumer_secret = consumer_secret
@@ -95,23 +242,142 @@ class TwitterSearch(object):
         self.__access_token = access_token
         self.__access_token_secret = access_token_secret
 
+        # application-only
+        self.__app_only = attr.get("app_only", access_token is None and
+                                   access_token_secret is None)
+        if not isinstance(self.__app_only, bool):
+            raise TwitterSearchException(1008)
+        self.__bearer_token = attr.get("bearer_token")
+        if self.__bearer_token is not None and not isinstance(
+                self.__bearer_token, str if py3k else basestring):
+            raise TwitterSearchException(1009)
+        self.__oauth = None
+
         # init internal variables
         self.__response = {}
-        self.__nextMaxID = maxint
-        self.__next_tweet = 0
+        self.__cursor = None
 
         if "proxy" in attr:
             self.set_proxy(attr["proxy"])
         else:
             self.__proxy = None
 
+        # connection pooling
+        self.__session = None
+        self.__last_request = None
+        self.__pool_connections = attr.get("pool_connections", 1)
+        self.__pool_maxsize = attr.get("pool_maxsize", 10)
+        self.__keep_alive = attr.get("keep_alive", True)
+        self.__idle_timeout = attr.get("idle_timeout")
+
+        for value in (self.__pool_connections, self.__pool_maxsize):
+            if not isinstance(value, int) or value <= 0:
+                raise TwitterSearchException(1004)
+        if not isinstance(self.__keep_alive, bool):
+            raise TwitterSearchException(1008)
+        if self.__idle_timeout is not None and (
+                not isinstance(self.__idle_timeout, (int, float)) or
+                self.__idle_timeout <= 0):
+            raise TwitterSearchException(1004)
+
+        # record and replay
+        if attr.get("record") is not None and attr.get("replay") is not None:
+            raise TwitterSearchException(1027)
+        if attr.get("replay") is not None:
+            from .TwitterRecorder import TwitterReplayAdapter
+            self.__adapter = TwitterReplayAdapter(
+                attr["replay"], latency=attr.get("replay_latency", False))
+        elif attr.get("record") is not None:
+            from .TwitterRecorder import TwitterRecordingAdapter
+            self.__adapter = TwitterRecordingAdapter(
+                attr["record"], pool_connections=self.__pool_connections,
+                pool_maxsize=self.__pool_maxsize)
+        else:
+            self.__adapter = None
+
+        # rate limits
+        if "rate_limiter" in attr:
+            if not isinstance(attr["rate_limiter"], TwitterRateLimiter):
+                raise TwitterSearchException(1019)
+            self.__rate_limiter = attr["rate_limiter"]
+        else:
+            pacing = attr.get("pace_requests", False)
+            if not isinstance(pacing, bool):
+                raise TwitterSearchException(1008)
+            self.__rate_limiter = TwitterRateLimiter(pacing=pacing)
+
+        # retries
+        self.__retry_policy = attr.get("retry_policy")
+        if not isinstance(self.__retry_policy, (TwitterRetryPolicy,
+                                                type(None))):
+            raise TwitterSearchException(1020)
+
+        # compression
+        self.__compression = attr.get("compression", True)
+        if not isinstance(self.__compression, bool):
+            raise TwitterSearchException(1008)
+        self.__last_transfer = None
+
+        # decoding
+        self.__json_loads = attr.get("json_loads", json_loads)
+        if not callable(self.__json_loads):
+            raise TwitterSearchException(1018)
+
+        # prefetching
+        self.__prefetch = attr.get("prefetch", 0)
+        if not isinstance(self.__prefetch, int) or self.__prefetch < 0:
+            raise TwitterSearchException(1004)
+
+        # streaming
+        self.__stream = attr.get("stream", False)
+        if not isinstance(self.__stream, bool):
+            raise TwitterSearchException(1008)
+
+        # projection
+        self.__projection = attr.get("projection")
+        if self.__projection is not None and not isinstance(
+                self.__projection, TwitterProjection):
+            self.__projection = TwitterProjection(self.__projection)
+        self.__tweet_type = attr.get("tweet_type")
+        if self.__tweet_type is not None and not callable(self.__tweet_type):
+            raise TwitterSearchException(1018)
+
+        # timings
+        timings = attr.get("timings", 100)
+        if not isinstance(timings, int) or timings < 0:
+            raise TwitterSearchException(1004)
+        self.__timings = deque(maxlen=timings)
+
+        # metrics
+        self.__metrics = attr.get("metrics", TwitterMetrics.get_default())
+        if not isinstance(self.__metrics, (TwitterMetrics, type(None))):
+            raise TwitterSearchException(1028)
+
+        # tracing
+        self.__tracer = attr.get("tracer", _NOOP_TRACER)
+        if not isinstance(self.__tracer, TwitterTracer):
+            raise TwitterSearchException(1029)
+
         # statistics
-        self.__statistics = [0,0]
+        self.__statistics = {'queries': 0, 'tweets': 0, 'retries': 0,
+                             'bytes_received': 0, 'bytes_decoded': 0}
+        self.__lock = threading.Lock()
 
         # callback
         self.__callback = None
 
         # verify
+        self.__verify_ttl = attr.get("verify_ttl")
+        if self.__verify_ttl is not None and (
+                not isinstance(self.__verify_ttl, (int, float)) or
+                self.__verify_ttl <= 0):
+            raise TwitterSearchException(1004)
+        self.__verification = None
+        self.__verification_error = None
+        self.__session_lock = threading.Lock()
+        # requesting a bearer token mustn't block the statistics lock
+        self.__auth_lock = threading.Lock()
+
         if "verify" in attr:
             self.authenticate(attr["verify"])
         else:
@@ -126,6 +392,208 @@ class TwitterSearch(object):
 
         return '<%s %s>' % (self.__class__.__name__, self.__access_token)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Stops prefetching and closes the internal HTTP session and all \
+        pooled connections. A new session is created automatically \
+        if further queries are sent
+        """
+
+        if self.__cursor is not None:
+            self.__cursor.close()
+        if self.__session is not None:
+            self.__session.close()
+            self.__session = None
+
+    def get_session(self):
+        """ Returns the internal HTTP session used to query the Twitter API. \
+        The session is created on first usage and keeps connections alive \
+        between queries according to the pooling settings of the constructor
+
+        :returns: A ``requests.Session`` instance
+        """
+
+        if self.__session is None:
+            with self.__session_lock:
+                if self.__session is None:
+                    self.__session = self.__create_session()
+        return self.__session
+
+    def __create_session(self):
+        # requests is imported on first usage to keep importing fast
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = time_connections(self.__adapter or HTTPAdapter(
+            pool_connections=self.__pool_connections,
+            pool_maxsize=self.__pool_maxsize))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.__keep_alive:
+            session.headers['Connection'] = 'close'
+        session.headers['Accept-Encoding'] = ('gzip'
+                                              if self.__compression
+                                              else 'identity')
+        return session
+
+    def get_rate_limiter(self):
+        """ Returns the rate limiter scheduling the queries of this instance
+
+        :returns: A :class:`TwitterRateLimiter` instance
+        """
+
+        return self.__rate_limiter
+
+    def get_rate_limit(self, resource=None):
+        """ Returns the rate-limit state as reported by the last response \
+        of an endpoint. Example usage: \
+        ``ts.get_rate_limit('search/tweets').remaining``
+
+        :param resource: Name of the endpoint, i.e. ``search/tweets``, \
+        ``statuses/user_timeline`` or ``help/languages``. If ``None``, \
+        the states of all queried endpoints are returned
+        :returns: A :class:`TwitterRateLimit` instance (``None`` if the \
+        endpoint wasn't queried yet) or a ``dict`` of those instances
+        """
+
+        return self.__rate_limiter.get(resource)
+
+    def _get(self, url, stream=False, timing=None, stop=None):
+        """ Sends an authenticated GET request through the internal \
+        HTTP session. Idle connections exceeding ``idle_timeout`` are \
+        dropped before the request is sent. The request is delayed \
+        according to the rate limiter and its response headers are \
+        used to update the rate-limit state of the queried endpoint. \
+        The amount of bytes received on the wire and after decompression \
+        are added to the statistics unless the response is streamed
+
+        :param url: A string containing the full URL to query
+        :param stream: Boolean. If ``True``, the body of the response \
+        is not read yet. Default value is ``False``
+        :param timing: A :class:`TwitterTiming` instance to add the \
+        durations of this request to. Default value is ``None``
+        :param stop: A ``threading.Event`` cancelling the request if it \
+        is set while waiting for the rate limiter. Default value is ``None``
+        :returns: A ``requests.Response`` instance
+        :raises: TwitterSearchException
+        """
+
+        resource = self._get_resource(url)
+        wait = self.__rate_limiter.acquire(resource, stop)
+        if stop is not None and stop.is_set():
+            raise TwitterSearchException(1031)
+
+        session = self.get_session()
+
+        now = time.time()
+        if (self.__idle_timeout is not None and
+                self.__last_request is not None and
+                now - self.__last_request > self.__idle_timeout):
+            for adapter in session.adapters.values():
+                adapter.close()
+        self.__last_request = now
+
+        auth = self.__get_auth()
+        with self.__tracer.start_span('http', endpoint=resource,
+                                      url=url) as span:
+            connect_time(reset=True)
+            start = time.time()
+            r = session.get(url,
+                            auth=auth,
+                            proxies={"https": self.__proxy},
+                            stream=stream)
+            end = time.time()
+            span.set_attribute('status', r.status_code)
+            if not stream:
+                span.set_attribute('bytes', len(r.content))
+        self.__rate_limiter.update(resource, r.headers)
+
+        metrics = self.__metrics
+        if metrics is not None:
+            metrics.inc('requests_total', endpoint=resource,
+                        status=r.status_code)
+            metrics.observe('request_duration_seconds', end - start,
+                            endpoint=resource)
+            state = self.__rate_limiter.get(resource)
+            if state is not None and state.remaining is not None:
+                metrics.set('rate_limit_remaining', state.remaining,
+                            endpoint=resource)
+                metrics.set('rate_limit_limit', state.limit,
+                            endpoint=resource)
+
+        if timing is not None:
+            # the body of responses which aren't streamed is read after
+            # the headers have been received within session.get()
+            connect = connect_time()
+            headers = r.elapsed.total_seconds()
+            timing.resource = resource
+            timing.queue_wait += wait
+            timing.connect += connect
+            timing.ttfb += max(headers - connect, 0.0)
+            if not stream:
+                timing.download = ((timing.download or 0.0) +
+                                   max(end - start - headers, 0.0))
+
+        if not stream:
+            self._count_transfer(r, len(r.content), timing)
+        return r
+
+    def _get_resource(self, url):
+        """ Determines the endpoint of a URL
+
+        :param url: A string containing the full URL
+        :returns: The name of the endpoint, e.g. ``search/tweets``
+        """
+
+        resource = url.split('?', 1)[0][len(self._base_url):]
+        if resource.endswith('.json'):
+            resource = resource[:-5]
+        return resource
+
+    def _count_transfer(self, r, decoded, timing=None):
+        """ Adds the size of a completely read response to the statistics
+
+        :param r: A ``requests.Response`` instance
+        :param decoded: Amount of bytes after decompression
+        :param timing: A :class:`TwitterTiming` instance to store \
+        the sizes in. Default value is ``None``
+        """
+
+        try:
+            received = r.raw.tell()
+        except AttributeError:
+            received = int(r.headers.get('content-length', decoded))
+        if timing is not None:
+            timing.bytes_received = received
+            timing.bytes_decoded = decoded
+        if self.__metrics is not None:
+            resource = self._get_resource(r.url)
+            self.__metrics.inc('bytes_received_total', received,
+                               endpoint=resource)
+            self.__metrics.inc('bytes_decoded_total', decoded,
+                               endpoint=resource)
+        with self.__lock:
+            self.__last_transfer = (received, decoded)
+            self.__statistics['bytes_received'] += received
+            self.__statistics['bytes_decoded'] += decoded
+
+    def get_last_transfer(self):
+        """ Returns the size of the last response of the Twitter API
+
+        :returns: A ``tuple`` of two integers: the amount of bytes \
+        received on the wire (i.e. compressed) and the amount of bytes \
+        after decompression. ``None`` if no query was sent yet
+        """
+
+        with self.__lock:
+            return self.__last_transfer
+
     def set_proxy(self, proxy):
         """ Sets a HTTPS proxy to query the Twitter API
 
@@ -152,22 +620,190 @@ class TwitterSearch(object):
         """ Creates an authenticated and internal oauth2  handler needed for \
         queries to Twitter and verifies credentials if needed.  If ``verify`` \
         is true, it also checks if the user credentials are valid. \
-        The **default** value is *True*
+        The **default** value is *True*. When using application-only \
+        authentication, verifying means requesting a bearer token which \
+        is otherwise requested along with the first query. Credentials \
+        verified within the last ``verify_ttl`` seconds aren't verified again
 
         :param verify: boolean variable to \
-        directly check. Default value is ``True``
+        directly check. Default value is ``True``. ``background`` \
+        verifies within a background thread instead of blocking
+        :raises: TwitterSearchException
         """
 
-        self.__oauth = OAuth1(self.__consumer_key,
-                              client_secret=self.__consumer_secret,
-                              resource_owner_key=self.__access_token,
-                              resource_owner_secret=self.__access_token_secret)
+        if verify not in (True, False, 'background'):
+            raise TwitterSearchException(1030)
+
+        self.wait_for_verification(raise_error=False)
+        self.__verification_error = None
+        self.__oauth = None
+        if self.__app_only and self.__bearer_token is not None:
+            self.__oauth = BearerAuth(self.__bearer_token)
+            return
+        if not verify:
+            return
+
+        cached = self.__get_cached_verification()
+        if cached is not None:
+            if self.__app_only:
+                self.__bearer_token = cached
+                self.__oauth = BearerAuth(cached)
+            return
+
+        if verify == 'background':
+            self.__verification = threading.Thread(target=self.__verify,
+                                                   args=(True,))
+            self.__verification.daemon = True
+            self.__verification.start()
+        else:
+            self.__verify()
+
+    def __verify(self, background=False):
+        """ Verifies the credentials (or requests a bearer token) and \
+        caches successful verifications if ``verify_ttl`` is set
+
+        :param background: Boolean. If ``True``, exceptions are kept \
+        to be raised by ``wait_for_verification()``
+        :raises: TwitterSearchException
+        """
+
+        try:
+            if self.__app_only:
+                self.__get_auth()
+            else:
+                r = self._get(self._base_url + self._verify_url)
+                self.check_http_status(r.status_code)
+        except TwitterSearchException as e:
+            if not background:
+                raise
+            self.__verification_error = e
+            return
+
+        if self.__verify_ttl is not None:
+            with self._verified_lock:
+                self._verified[self.__get_credential_hash()] = (
+                    time.time() + self.__verify_ttl, self.__bearer_token)
+
+    def __get_credential_hash(self):
+        """ Returns a hash identifying the credentials and the API \
+        they are used with without keeping the secrets in memory
+
+        :returns: A string containing a hex digest
+        """
+
+        import hashlib
+
+        digest = hashlib.sha256()
+        for value in (self._base_url, self.__consumer_key,
+                      self.__consumer_secret, self.__access_token,
+                      self.__access_token_secret):
+            digest.update(('%s\0' % (value,)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def __get_cached_verification(self):
+        """ Looks up a cached verification of the credentials
+
+        :returns: The cached bearer token for application-only \
+        authentication, ``True`` for user authentication or ``None`` \
+        if the credentials weren't verified within ``verify_ttl``
+        """
+
+        if self.__verify_ttl is None:
+            return None
+        key = self.__get_credential_hash()
+        with self._verified_lock:
+            cached = self._verified.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= time.time():
+                del self._verified[key]
+                return None
+        return cached[1] if self.__app_only else True
+
+    def wait_for_verification(self, timeout=None, raise_error=True):
+        """ Waits for a verification running in the background \
+        (if any) to finish, e.g. ``verify='background'``
+
+        :param timeout: Number of seconds to wait at most. Default value \
+        is ``None`` which waits until the verification is finished
+        :param raise_error: Boolean. If ``True``, the exception of a \
+        failed verification is raised. Otherwise it is raised along \
+        with the next query. Default value is ``True``
+        :returns: ``True`` if no verification is running anymore
+        :raises: TwitterSearchException
+        """
 
-        if verify:
-            r = requests.get(self._base_url + self._verify_url,
-                             auth=self.__oauth,
-                             proxies={"https": self.__proxy})
-            self.check_http_status(r.status_code)
+        verification = self.__verification
+        if verification is not None:
+            verification.join(timeout)
+            if verification.is_alive():
+                return False
+            self.__verification = None
+
+        if raise_error and self.__verification_error is not None:
+            error, self.__verification_error = self.__verification_error, None
+            raise error
+        return True
+
+    def __get_auth(self):
+        """ Returns the authentication handler and requests a bearer \
+        token first if application-only authentication is used and \
+        no token is available yet
+
+        :returns: A ``requests`` authentication handler
+        :raises: TwitterSearchException
+        """
+
+        if self.__oauth is None:
+            with self.__auth_lock:
+                if self.__oauth is None:
+                    if self.__app_only:
+                        self.__oauth = BearerAuth(
+                            self.__request_bearer_token())
+                    else:
+                        # imports requests, so it's imported on first usage
+                        from requests_oauthlib import OAuth1
+                        self.__oauth = OAuth1(
+                            self.__consumer_key,
+                            client_secret=self.__consumer_secret,
+                            resource_owner_key=self.__access_token,
+                            resource_owner_secret=self.__access_token_secret)
+        return self.__oauth
+
+    def __request_bearer_token(self):
+        """ Obtains a bearer token using the consumer key and secret
+
+        :returns: A string containing the bearer token
+        :raises: TwitterSearchException
+        """
+
+        r = self.get_session().post(
+            urljoin(self._base_url, self._token_url),
+            auth=(quote_plus(self.__consumer_key),
+                  quote_plus(self.__consumer_secret)),
+            data={'grant_type': 'client_credentials'},
+            proxies={"https": self.__proxy})
+        self.check_http_status(r.status_code)
+
+        try:
+            content = r.json()
+            if content['token_type'] != 'bearer':
+                raise ValueError(content['token_type'])
+            self.__bearer_token = content['access_token']
+        except (ValueError, KeyError, TypeError):
+            raise TwitterSearchException(1021)
+        return self.__bearer_token
+
+    def get_bearer_token(self):
+        """ Returns the bearer token used for application-only \
+        authentication. Can be handed over to other instances using \
+        the ``bearer_token`` argument to avoid requesting a new one
+
+        :returns: A string containing the bearer token or ``None`` if \
+        no token was requested yet or user authentication is used
+        """
+
+        return self.__bearer_token if self.__app_only else None
 
     def check_http_status(self, http_status):
         """ Checks if given HTTP status code is within the list at \
@@ -201,24 +837,89 @@ class TwitterSearch(object):
                 raise TwitterSearchException(1018)
             self.__callback = callback
 
-        self.search_tweets(order)
+        self.__start_cursor(order, self.__prefetch, self.__stream)
         return self
 
+    def cursor(self, order, callback=None, **attr):
+        """ Creates a cursor iterating the tweets of a given order. \
+        Every cursor keeps its own pagination state but shares the \
+        HTTP session, authentication, rate limits and statistics of \
+        this instance. Thus, many cursors can be iterated concurrently, \
+        e.g. from different threads. The first page is queried on first \
+        iteration. See `Advanced usage <advanced_usage.html>`_ for example
+
+        :param order: A TwitterOrder instance. \
+        Can be either TwitterSearchOrder or TwitterUserOrder
+        :param callback: Function to be called with the cursor after \
+        a new page is queried from the Twitter API
+        :param prefetch: Amount of pages queried ahead in the background. \
+        Defaults to the ``prefetch`` value of this instance
+        :param stream: A boolean variable to control whether pages are \
+        parsed incrementally. Defaults to the ``stream`` value of \
+        this instance
+        :returns: A :class:`TwitterCursor` instance
+        :raises: TwitterSearchException
+        """
+
+        return TwitterCursor(self, order, callback,
+                             prefetch=attr.get("prefetch", self.__prefetch),
+                             stream=attr.get("stream", self.__stream))
+
+    def __start_cursor(self, order, prefetch, stream):
+        """ Replaces the cursor iterated by this instance by a new one \
+        and queries its first page
+
+        :param order: A TwitterOrder instance
+        :param prefetch: Amount of pages queried ahead in the background
+        :param stream: Boolean. ``True`` to parse pages incrementally
+        :returns: The response of the first page as ``dict``
+        :raises: TwitterSearchException
+        """
+
+        callback = self.__callback
+        cursor = self.cursor(order, callback and (lambda c: callback(self)),
+                             prefetch=prefetch, stream=stream)
+        if self.__cursor is not None:
+            self.__cursor.close()
+        self.__cursor = cursor
+        return cursor.start()
+
+    def _open_stream(self, url, is_search, response, transform, timing):
+        """ Queries a page without reading its body
+
+        :param url: A string of the query string to send
+        :param is_search: Boolean. ``True`` to query the Search API, \
+        ``False`` to query the user timeline endpoint
+        :param response: A ``dict`` to store ``meta`` in
+        :param transform: Function applied to every tweet while parsing
+        :param timing: The :class:`TwitterTiming` instance of the page
+        :returns: A ``tuple`` of the ``requests.Response`` instance \
+        and a :class:`TwitterStreamParser` iterating its tweets
+        :raises: TwitterSearchException
+        """
+
+        try:
+            r = self._request(url, is_search, response,
+                              stream=True, timing=timing)
+        except TwitterSearchException:
+            self._add_timing(timing)
+            raise
+        return r, TwitterStreamParser(r.iter_content(self._chunk_size),
+                                      key='statuses' if is_search else None,
+                                      json_loads=self.__json_loads,
+                                      transform=transform)
+
     def get_minimal_id(self):
         """ Returns the minimal tweet ID of the current response
 
-        :returns: minimal tweet identification number
+        :returns: minimal tweet identification number. While streaming, \
+        the minimal ID of all tweets of the current page returned so far
         :raises: TwitterSearchException
         """
 
-        if not self.__response:
+        if self.__cursor is None:
             raise TwitterSearchException(1013)
-
-        return min(
-            self.__response['content']['statuses'] if self.__order_is_search
-            else self.__response['content'],
-            key=lambda i: i['id']
-            )['id'] - 1
+        return self.__cursor.get_minimal_id()
 
     def send_search(self, url):
         """ Queries the Twitter API with a given query string and \
@@ -232,34 +933,427 @@ class TwitterSearch(object):
 
         if not isinstance(url, str if py3k else basestring):
             raise TwitterSearchException(1009)
+        if self.__cursor is None:
+            raise TwitterSearchException(1014)
 
-        endpoint = self._base_url + (self._search_url
-                                     if self.__order_is_search
-                                     else self._user_url)
+        return self.__cursor.send_search(url)
+
+    def _query(self, url, is_search, response, transform=None, stop=None):
+        """ Queries either the Search API or the user timeline endpoint, \
+        validates the HTTP status and updates the statistics. Meta data \
+        is stored in ``response`` even if the HTTP status is invalid
+
+        :param url: A string of the query string to send
+        :param is_search: Boolean. ``True`` to query the Search API, \
+        ``False`` to query the user timeline endpoint
+        :param response: A ``dict`` to store ``meta`` and ``content`` in
+        :param transform: Function applied to every tweet while decoding, \
+        e.g. a :class:`TwitterProjection`. Default value is ``None``
+        :param stop: A ``threading.Event`` cancelling the query if it is \
+        set while waiting for the rate limiter or the next attempt. \
+        Default value is ``None``
+        :returns: The given ``response`` dict. Its ``timing`` contains \
+        the :class:`TwitterTiming` of the query
+        :raises: TwitterSearchException
+        """
+
+        timing = response['timing'] = TwitterTiming(url)
+        try:
+            r = self._request(url, is_search, response, timing=timing,
+                              stop=stop)
+            with self.__tracer.start_span('decode',
+                                          bytes=len(r.content)) as span:
+                start = time.time()
+                response['content'] = self._decode_page(
+                    r.content, is_search, self.__json_loads, transform,
+                    transform is not self.__tweet_type)
+                timing.decode = time.time() - start
+                span.set_attribute('tweets', len(
+                    response['content']['statuses'] if is_search
+                    else response['content']))
+        finally:
+            self._add_timing(timing)
+
+        tweets = len(response['content']['statuses'] if is_search
+                     else response['content'])
+        timing.tweets = tweets
+
+        # update statistics if everything worked fine so far
+        self._count_tweets(timing.resource, tweets)
+
+        return response
+
+    def _count_tweets(self, resource, tweets):
+        """ Adds a successfully queried page to the statistics
+
+        :param resource: The name of the endpoint, e.g. ``search/tweets``
+        :param tweets: Amount of tweets within the page
+        """
+
+        if self.__metrics is not None:
+            self.__metrics.inc('tweets_total', tweets, endpoint=resource)
+        with self.__lock:
+            self.__statistics['queries'] += 1
+            self.__statistics['tweets'] += tweets
+
+    def _start_span(self, name, parent=None, **attributes):
+        """ Opens a span using the tracer of this instance
+
+        :param name: A string naming the span
+        :param parent: The parent span. Default value is ``None`` which \
+        uses the span currently open
+        :returns: A span to be used as context manager
+        """
 
-        r = requests.get(endpoint + url,
-                         auth=self.__oauth,
-                         proxies={"https": self.__proxy})
+        return self.__tracer.start_span(name, parent=parent, **attributes)
 
-        self.__response['meta'] = r.headers
+    def _add_timing(self, timing):
+        """ Keeps the timing of a finished query
 
+        :param timing: A :class:`TwitterTiming` instance
+        """
+
+        with self.__lock:
+            self.__timings.append(timing)
+
+    def get_timings(self):
+        """ Returns the timings of the latest queries of pages in the \
+        order they were finished. The amount of timings kept is set \
+        using the ``timings`` argument of the constructor
+
+        :returns: A ``list`` of :class:`TwitterTiming` instances
+        """
+
+        with self.__lock:
+            return list(self.__timings)
+
+    def get_last_timing(self):
+        """ Returns the timing of the current page, i.e. the page whose \
+        tweets are iterated. Callbacks use this to inspect the page they \
+        are called for, its ``callback`` duration is set after the \
+        callback has returned
+
+        :returns: A :class:`TwitterTiming` instance or ``None`` if no \
+        page was queried yet
+        """
+
+        if self.__cursor is None:
+            return None
+        return self.__cursor.get_last_timing()
+
+    def _request(self, url, is_search, response, stream=False, timing=None,
+                 stop=None):
+        """ Sends a query to either the Search API or the user timeline \
+        endpoint, repeats it according to the retry policy and validates \
+        the HTTP status. Meta data is stored in ``response`` even if \
+        the HTTP status is invalid
+
+        :param url: A string of the query string to send
+        :param is_search: Boolean. ``True`` to query the Search API, \
+        ``False`` to query the user timeline endpoint
+        :param response: A ``dict`` to store ``meta`` in
+        :param stream: Boolean. If ``True``, the body of the response \
+        is not read yet. Default value is ``False``
+        :param timing: A :class:`TwitterTiming` instance to add the \
+        durations of all attempts to. Default value is ``None``
+        :param stop: A ``threading.Event`` cancelling the query if it is \
+        set while waiting for the rate limiter or the next attempt. \
+        Default value is ``None``
+        :returns: A ``requests.Response`` instance
+        :raises: TwitterSearchException
+        """
+
+        # failures of a background verification are raised once finished
+        if self.__verification is not None or \
+                self.__verification_error is not None:
+            self.wait_for_verification(timeout=0)
+
+        endpoint = self._get_endpoint(is_search)
+
+        attempt = 1
+        while True:
+            r = self._get(endpoint + url, stream, timing, stop)
+            response['meta'] = r.headers
+            if timing is not None:
+                timing.attempts = attempt
+                timing.status = r.status_code
+
+            delay = None
+            if self.__retry_policy and r.status_code in self.exceptions:
+                delay = self.__retry_policy.get_delay(r.status_code,
+                                                      attempt, r.headers)
+            if delay is None:
+                break
+
+            if stream:
+                r.close()
+
+            if self.__metrics is not None:
+                self.__metrics.inc('retries_total',
+                                   endpoint=self._get_resource(endpoint),
+                                   status=r.status_code)
+            with self.__lock:
+                self.__statistics['retries'] += 1
+            start = time.time()
+            self.__retry_policy.sleep(delay, stop)
+            if timing is not None:
+                timing.queue_wait += time.time() - start
+            if stop is not None and stop.is_set():
+                raise TwitterSearchException(1031)
+            attempt += 1
+
+        if r.status_code in self.exceptions:
+            if stream:
+                r.close()
+            if self.__metrics is not None:
+                self.__metrics.inc('errors_total',
+                                   endpoint=self._get_resource(endpoint),
+                                   status=r.status_code)
         self.check_http_status(r.status_code)
+        return r
 
-        self.__response['content'] = r.json()
+    def _get_endpoint(self, is_search):
+        """ Determines the URL of the endpoint of an order
 
-        # update statistics if everything worked fine so far
-        seen_tweets = self.get_amount_of_tweets()
-        self.__statistics[0] += 1
-        self.__statistics[1] += seen_tweets
+        :param is_search: Boolean. ``True`` for the Search API, \
+        ``False`` for the user timeline endpoint
+        :returns: A string containing the full URL of the endpoint
+        """
+
+        return self._base_url + (self._search_url if is_search
+                                 else self._user_url)
+
+    @staticmethod
+    def _is_search_order(order):
+        """ Determines the endpoint of a given order
+
+        :param order: A TwitterOrder instance
+        :returns: ``True`` for TwitterSearchOrder instances \
+        and ``False`` for TwitterUserOrder instances
+        :raises: TwitterSearchException
+        """
+
+        if isinstance(order, TwitterUserOrder):
+            return False
+        elif isinstance(order, TwitterSearchOrder):
+            return True
+        raise TwitterSearchException(1018)
 
-        # call callback if available
-        if self.__callback:
-            self.__callback(self)
+    def _get_transform(self, order):
+        """ Determines the function applied to the tweets of an order \
+        while decoding, i.e. its projection and the ``tweet_type``
 
-        # if we've seen the correct amount of tweets there may be some more
-        # using IDs to request more results
-        # (former versions used page parameter)
-        # see https://dev.twitter.com/docs/working-with-timelines
+        :param order: A TwitterOrder instance
+        :returns: A function or ``None`` if tweets are kept as they are
+        """
+
+        return self._compose_transform(
+            getattr(order, 'projection', None) or self.__projection,
+            self.__tweet_type)
+
+    @staticmethod
+    def _decode_page(data, is_search, json_loads, transform=None,
+                     incremental=True):
+        """ Decodes a page applying a function to all of its tweets
+
+        :param data: The raw ``bytes`` of the response
+        :param is_search: Boolean. ``True`` if the response belongs to \
+        the Search API, ``False`` if it belongs to a user timeline
+        :param json_loads: Function decoding the raw bytes
+        :param transform: Function applied to every tweet or ``None``
+        :param incremental: Boolean. If ``True``, tweets are decoded and \
+        transformed one after another, thus a page of untransformed tweets \
+        is never kept in memory. Otherwise the whole page is decoded \
+        first which is faster. Default value is ``True``
+        :returns: The decoded page
+        """
+
+        key = 'statuses' if is_search else None
+        if transform is None:
+            return json_loads(data)
+        if incremental:
+            return TwitterStreamParser.loads(data, key, json_loads, transform)
+
+        content = json_loads(data)
+        tweets = content[key] if is_search else content
+        tweets[:] = map(transform, tweets)
+        return content
+
+    @staticmethod
+    def _compose_transform(projection, tweet_type):
+        """ Combines a projection and a tweet type into one function
+
+        :param projection: A :class:`TwitterProjection` instance or ``None``
+        :param tweet_type: A function or class converting tweets or ``None``
+        :returns: A function or ``None`` if both arguments are ``None``
+        """
+
+        if tweet_type is None or projection is None:
+            return projection or tweet_type
+        return lambda tweet: tweet_type(projection(tweet))
+
+    def search_many(self, orders, max_workers=4, pages=False, on_error=None):
+        """ Queries the Twitter API for many orders concurrently using \
+        a pool of worker threads sharing this authenticated instance. \
+        Results are returned as soon as they arrive, thus tweets of \
+        different orders are interleaved. Errors of one order don't \
+        affect the remaining ones. Use a ``pool_maxsize`` of at least \
+        ``max_workers`` to keep all connections alive. \
+        See `Advanced usage <advanced_usage.html>`_ for example
+
+        :param orders: An iterable of TwitterOrder instances. \
+        Can be either TwitterSearchOrder or TwitterUserOrder
+        :param max_workers: Amount of orders queried concurrently. \
+        Default value is ``4``
+        :param pages: Boolean. If ``True``, whole pages are returned as \
+        ``(meta, content)`` tuples instead of single tweets. \
+        Default value is ``False``
+        :param on_error: Function to be called with the order and the \
+        exception if an order fails. If not set, failing orders are \
+        stopped silently in case of a ``TwitterSearchException``
+        :returns: A generator of ``(order, tweet)`` or \
+        ``(order, (meta, content))`` tuples
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(max_workers, int) or max_workers <= 0:
+            raise TwitterSearchException(1004)
+        if on_error is not None and not callable(on_error):
+            raise TwitterSearchException(1018)
+
+        tasks = Queue()
+        for order in orders:
+            tasks.put(order)
+
+        return self.__search_many(tasks, min(max_workers, tasks.qsize()),
+                                  pages, on_error)
+
+    def __search_many(self, tasks, workers, pages, on_error):
+        results = Queue(maxsize=workers * 2)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def work():
+            while not stop.is_set():
+                try:
+                    order = tasks.get_nowait()
+                except Empty:
+                    break
+                try:
+                    cursor = self.cursor(order, prefetch=0, stream=False)
+                    for meta, content in cursor._pages():
+                        if pages:
+                            if not put((order, (meta, content), None)):
+                                return
+                            continue
+                        for tweet in (content['statuses']
+                                      if self._is_search_order(order)
+                                      else content):
+                            if not put((order, tweet, None)):
+                                return
+                except Exception as e:
+                    if not put((order, None, e)):
+                        return
+            put(None)
+
+        threads = [threading.Thread(target=work) for i in range(workers)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            running = workers
+            while running:
+                item = results.get()
+                if item is None:
+                    running -= 1
+                    continue
+                order, result, error = item
+                if error is None:
+                    yield order, result
+                elif on_error:
+                    on_error(order, error)
+                elif not isinstance(error, TwitterSearchException):
+                    raise error
+        finally:
+            stop.set()
+
+    def search_batches(self, order, columns=None):
+        """ Queries all pages of a given order and returns each page \
+        as :class:`TwitterBatch` storing its tweets column by column, \
+        e.g. to be filtered and aggregated using NumPy. \
+        See `Advanced usage <advanced_usage.html>`_ for example
+
+        :param order: A TwitterOrder instance. \
+        Can be either TwitterSearchOrder or TwitterUserOrder
+        :param columns: A ``list`` of column names out of \
+        ``TwitterBatch.available_columns``. Defaults to \
+        ``TwitterBatch.default_columns``
+        :returns: A generator of :class:`TwitterBatch` instances
+        :raises: TwitterSearchException
+        """
+
+        is_search = self._is_search_order(order)
+        columns = TwitterBatch.get_columns(columns)
+        return self.__search_batches(order, is_search, columns)
+
+    def __search_batches(self, order, is_search, columns):
+        transform = self._get_transform(order)
+        start_url = url = order.create_search_url()
+
+        while url is not None:
+            response = self._query(url, is_search, {}, transform)
+            batch = TwitterBatch(response['content']['statuses']
+                                 if is_search else response['content'],
+                                 columns, response['meta'])
+            # only the columns are kept, not the decoded page
+            del response
+            yield batch
+
+            # the minimal ID is taken from the id column of the batch
+            url = self._get_next_url(start_url, self._next_max_id(
+                len(batch), batch.get_minimal_id(), is_search, url))
+
+    @staticmethod
+    def _get_next_max_id(content, is_search, url):
+        """ Determines the ``max_id`` value of the page following \
+        a given response
+
+        :param content: The decoded response of a query
+        :param is_search: Boolean. ``True`` if the response belongs to \
+        the Search API, ``False`` if it belongs to a user timeline
+        :param url: The query string used to request the response
+        :returns: The ``max_id`` of the next page or ``None`` if \
+        there are no more results available
+        """
+
+        statuses = content['statuses'] if is_search else content
+        return TwitterSearch._next_max_id(
+            len(statuses),
+            min(map(_get_id, statuses)) if statuses else None,
+            is_search, url)
+
+    @staticmethod
+    def _next_max_id(amount, minimal_id, is_search, url):
+        """ Determines the ``max_id`` value of the page following \
+        a response of a given size
+
+        :param amount: Amount of tweets within the response
+        :param minimal_id: Minimal tweet ID within the response
+        :param is_search: Boolean. ``True`` if the response belongs to \
+        the Search API, ``False`` if it belongs to a user timeline
+        :param url: The query string used to request the response
+        :returns: The ``max_id`` of the next page or ``None`` if \
+        there are no more results available
+        """
 
         # a leading ? char does "confuse" parse_qs()
         if url[0] == '?':
@@ -267,20 +1361,30 @@ class TwitterSearch(object):
         given_count = int(parse_qs(url)['count'][0])
 
         # Search API does have valid count values
-        if self.__order_is_search and seen_tweets == given_count:
-            self.__next_max_id = self.get_minimal_id()
-
         # Timelines doesn't have valid count values
         # see: https://dev.twitter.com/docs/faq
         # see section: "How do I properly navigate a timeline?"
-        elif (not self.__order_is_search and
-              len(self.__response['content']) > 0):
-            self.__next_max_id = self.get_minimal_id()
-
-        else:  # we got less tweets than requested -> no more results in API
-            self.__next_max_id = None
+        if ((is_search and amount == given_count) or
+                (not is_search and amount > 0)):
+            return minimal_id - 1
+
+        # we got less tweets than requested -> no more results in API
+        return None
+
+    @staticmethod
+    def _get_next_url(start_url, next_max_id):
+        """ Creates the query string of the page following a response
+
+        :param start_url: The query string of the first page of the order
+        :param next_max_id: The ``max_id`` of the next page as returned \
+        by ``_next_max_id()``
+        :returns: The query string of the next page or ``None`` if \
+        there are no more results available
+        """
 
-        return self.__response['meta'], self.__response['content']
+        if not next_max_id:
+            return None
+        return "%s&max_id=%i" % (start_url, next_max_id)
 
     def search_tweets(self, order):
         """ Creates an query string through a given TwitterSearchOrder \
@@ -295,16 +1399,7 @@ class TwitterSearch(object):
         :raises: TwitterSearchException
         """
 
-        if isinstance(order, TwitterUserOrder):
-            self.__order_is_search = False
-        elif isinstance(order, TwitterSearchOrder):
-            self.__order_is_search = True
-        else:
-            raise TwitterSearchException(1018)
-
-        self._start_url = order.create_search_url()
-        self.send_search(self._start_url)
-        return self.__response
+        return self.__start_cursor(order, 0, False)
 
     def search_next_results(self):
         """ Triggers the search for more results using the Twitter API. \
@@ -316,13 +1411,9 @@ class TwitterSearch(object):
         :raises: TwitterSearchException
         """
 
-        if not self.__next_max_id:
+        if self.__cursor is None:
             raise TwitterSearchException(1011)
-
-        self.send_search(
-            "%s&max_id=%i" % (self._start_url, self.__next_max_id)
-        )
-        return True
+        return self.__cursor.search_next_results()
 
     def get_metadata(self):
         """ Returns all available meta data collected during last query. \
@@ -333,6 +1424,8 @@ class TwitterSearch(object):
         :raises: TwitterSearchException
         """
 
+        if self.__cursor is not None:
+            return self.__cursor.get_metadata()
         if not self.__response:
             raise TwitterSearchException(1012)
         return self.__response['meta']
@@ -341,10 +1434,14 @@ class TwitterSearch(object):
         """ Returns all available data from last query. \
         See `Advanced usage <advanced_usage.html>`_ for example
 
-        :returns: All tweets found using the last query as a ``dict``
+        :returns: All tweets found using the last query as a ``dict``. \
+        While streaming, ``None`` until the current page was read \
+        completely and the page without its tweets afterwards
         :raises: TwitterSearchException
         """
 
+        if self.__cursor is not None:
+            return self.__cursor.get_tweets()
         if not self.__response:
             raise TwitterSearchException(1013)
         return self.__response['content']
@@ -359,24 +1456,27 @@ class TwitterSearch(object):
 
         :returns: A ``tuple`` with ``queries`` and \
         ``tweets`` keys containing integers. E.g. ``(1,100)`` which stands \
-        for one query that contained one hundred tweets.
+        for one query that contained one hundred tweets. Further counters \
+        are available as attributes of the returned \
+        :class:`TwitterStatistics` instance: ``retries`` counts \
+        repeated queries, ``bytes_received`` and ``bytes_decoded`` sum \
+        up the size of all responses on the wire and after decompression
         """
 
-        return (self.__statistics[0], self.__statistics[1])
+        with self.__lock:
+            return TwitterStatistics(**self.__statistics)
 
     def get_amount_of_tweets(self):
         """ Returns current amount of tweets available within this instance
 
-        :returns: The amount of tweets currently available
+        :returns: The amount of tweets currently available. While \
+        streaming, the amount of tweets of the current page returned so far
         :raises: TwitterSearchException
         """
 
-        if not self.__response:
+        if self.__cursor is None:
             raise TwitterSearchException(1013)
-
-        return (len(self.__response['content']['statuses'])
-                if self.__order_is_search
-                else len(self.__response['content']))
+        return self.__cursor.get_amount_of_tweets()
 
     def set_supported_languages(self, order):
         """ Loads currently supported languages from Twitter API \
@@ -390,13 +1490,15 @@ class TwitterSearch(object):
         if not isinstance(order, TwitterSearchOrder):
             raise TwitterSearchException(1010)
 
-        r = requests.get(self._base_url + self._lang_url,
-                         auth=self.__oauth,
-                         proxies={"https": self.__proxy})
+        r = self._get(self._base_url + self._lang_url)
 
-        self.__response['meta'] = r.headers
+        # the response replaces the current page of the last search
+        if self.__cursor is not None:
+            self.__cursor.close()
+            self.__cursor = None
+        self.__response = {'meta': r.headers}
         self.check_http_status(r.status_code)
-        self.__response['content'] = r.json()
+        self.__response['content'] = self.__json_loads(r.content)
 
         order.iso_6391 = []
         for lang in self.__response['content']:
@@ -404,7 +1506,8 @@ class TwitterSearch(object):
 
     # Iteration
     def __iter__(self):
-        self.__next_tweet = 0
+        if self.__cursor is not None:
+            iter(self.__cursor)
         return self
 
     def next(self):
@@ -416,27 +1519,6 @@ class TwitterSearch(object):
         return self.__next__()
 
     def __next__(self):
-        if not self.__response:
+        if self.__cursor is None:
             raise TwitterSearchException(1014)
-
-        if self.__next_tweet < self.get_amount_of_tweets():
-            self.__next_tweet += 1
-            if self.__order_is_search:
-                return (self.__response['content']
-                        ['statuses'][self.__next_tweet-1])
-            else:
-                return self.__response['content'][self.__next_tweet-1]
-
-        try:
-            self.search_next_results()
-        except TwitterSearchException:
-            raise StopIteration
-
-        if self.get_amount_of_tweets() != 0:
-            self.__next_tweet = 1
-            if self.__order_is_search:
-                return (self.__response['content']
-                        ['statuses'][self.__next_tweet-1])
-            else:
-                return self.__response['content'][self.__next_tweet-1]
-        raise StopIteration
+        return next(self.__cursor)
@@ -31,6 +31,20 @@ class TwitterSearchException(Exception):
         1016: 'Invalid dict',
         1017: 'Invalid argument: need either a user ID or a screen-name',
         1018: 'Not a callable function',
+        1019: 'Not a valid TwitterRateLimiter object',
+        1020: 'Not a valid TwitterRetryPolicy object',
+        1021: 'Invalid bearer token response',
+        1022: 'Missing optional dependency',
+        1023: 'Unknown column',
+        1024: 'Sink already closed',
+        1025: 'Not a valid TwitterProducer object',
+        1026: 'No recorded response found',
+        1027: 'Cannot record and replay at once',
+        1028: 'Not a valid TwitterMetrics object',
+        1029: 'Not a valid TwitterTracer object',
+        1030: 'Not a valid verification mode',
+        1031: 'Query stopped',
+        1032: 'Proxies are not supported',
     }
 
     def __init__(self, code, msg=None):
@@ -1,15 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import re
 from .TwitterSearchException import TwitterSearchException
 from .TwitterOrder import TwitterOrder
-from .utils import py3k
+from .utils import py3k, quote_plus
 
 try:
-    from urllib.parse import parse_qs, quote_plus, unquote  # python3
+    from urllib.parse import parse_qs, unquote  # python3
 except ImportError:
     from urlparse import parse_qs
-    from urllib import quote_plus, unquote  # python2
+    from urllib import unquote  # python2
 
 
 class TwitterSearchOrder(TwitterOrder):
@@ -33,6 +34,9 @@ class TwitterSearchOrder(TwitterOrder):
     # Source filter prefix string
     _source = "source:"
 
+    # phrases in quotes or single words of the query
+    _token = re.compile(r'-?"[^"]*"|\S+')
+
     # default value for count should be the maximum value to minimize traffic
     # see https://dev.twitter.com/docs/api/1.1/get/search/tweets
     _max_count = 100
@@ -63,9 +67,9 @@ class TwitterSearchOrder(TwitterOrder):
     def __init__(self):
         """ Constructor """
 
-        self.arguments = {'count': '%s' % self._max_count}
+        TwitterOrder.__init__(self)
+        self._set_argument('count', '%s' % self._max_count)
         self.searchterms = []
-        self.url = ''
         self.remove_all_filters()
 
     def remove_all_filters(self):
@@ -74,6 +78,7 @@ class TwitterSearchOrder(TwitterOrder):
         # attitude: None = no attitude, True = positive, False = negative
         self.attitude_filter = self.source_filter = None
         self.question_filter = self.link_filter = False
+        self._set_dirty()
 
     def set_source_filter(self, source):
         """ Only search for tweets entered via given source
@@ -85,6 +90,7 @@ class TwitterSearchOrder(TwitterOrder):
 
         if isinstance(source, str if py3k else basestring) and len(source) >= 2:
             self.source_filter = source
+            self._set_dirty()
         else:
             raise TwitterSearchException(1009)
 
@@ -92,42 +98,50 @@ class TwitterSearchOrder(TwitterOrder):
         """ Remove the current source filter """
 
         self.source_filter = None
+        self._set_dirty()
 
 
     def set_link_filter(self):
         """ Only search for tweets including links """
 
         self.link_filter = True
+        self._set_dirty()
 
     def remove_link_filter(self):
         """ Remove the current link filter """
 
         self.link_filter = False
+        self._set_dirty()
 
     def set_question_filter(self):
         """ Only search for tweets asking a question """
 
         self.question_filter = True
+        self._set_dirty()
 
     def remove_question_filter(self):
         """ Remove the current question filter """
 
         self.question_filter = False
+        self._set_dirty()
 
     def set_positive_attitude_filter(self):
         """ Only search for tweets with positive attitude """
 
         self.attitude_filter = True
+        self._set_dirty()
 
     def set_negative_attitude_filter(self):
         """ Only search for tweets with negative attitude """
 
         self.attitude_filter = False
+        self._set_dirty()
 
     def remove_attitude_filter(self):
         """ Remove attitude filter """
 
         self.attitude_filter = None
+        self._set_dirty()
 
     def add_keyword(self, word, or_operator=False):
         """ Adds a given string or list to the current keyword list
@@ -147,6 +161,7 @@ class TwitterSearchOrder(TwitterOrder):
             self.searchterms += [" OR ".join(word)] if or_operator else word
         else:
             raise TwitterSearchException(1000)
+        self._set_dirty()
 
     def set_keywords(self, words, or_operator=False):
         """ Sets a given list as the new keyword list
@@ -162,6 +177,7 @@ class TwitterSearchOrder(TwitterOrder):
             raise TwitterSearchException(1001)
         words = [ (i if " " not in i else '"%s"' % i)  for i in words ]
         self.searchterms = [" OR ".join(words)] if or_operator else words
+        self._set_dirty()
 
     def set_search_url(self, url):
         """ Reads given query string and stores key-value tuples
@@ -182,7 +198,7 @@ class TwitterSearchOrder(TwitterOrder):
         del args['q']
 
         for key, value in args.items():
-            self.arguments.update({key: unquote(value[0])})
+            self._set_argument(key, unquote(value[0]))
 
         # look for advanced operators: attitudes
         for attitude in self._attitudes:
@@ -219,36 +235,76 @@ class TwitterSearchOrder(TwitterOrder):
             del self.searchterms[ self.searchterms.index(i) ]
             self.source_filter = i[ len(self._source): ]
 
-    def create_search_url(self):
-        """ Generates (urlencoded) query string from stored key-values tuples
+        self._set_dirty()
 
-        :returns: A string containing all arguments in a url-encoded format
-        """
+    def _get_filter_terms(self):
+        """ Returns the search strings of all filters currently set
 
-        if len(self.searchterms) == 0:
-            raise TwitterSearchException(1015)
+        :returns: A ``list`` of strings to append to the keywords
+        """
 
-        url = '?q='
-        url += '+'.join([quote_plus(i) for i in self.searchterms])
+        terms = []
 
         if self.attitude_filter is not None:
-            url += '+%s' % quote_plus(self._attitudes[0 if self.attitude_filter else 1])
+            terms.append(self._attitudes[0 if self.attitude_filter else 1])
 
         if self.source_filter:
-            url += '+%s' % quote_plus(self._source + self.source_filter)
+            terms.append(self._source + self.source_filter)
 
         if self.link_filter:
-            url += '+%s' % quote_plus(self._link)
+            terms.append(self._link)
 
         if self.question_filter:
-            url += '+%s' % quote_plus(self._question)
+            terms.append(self._question)
+
+        return terms
+
+    def _get_canonical_terms(self):
+        """ Returns keywords and filters in a normalized form. Keywords \
+        concatenated by ``OR`` are kept together within one term sorted \
+        alphabetically, e.g. ``['Goofy OR Nyancat', 'BMW']`` for both \
+        ``Nyancat OR Goofy BMW`` and ``BMW Goofy OR Nyancat``
+
+        :returns: A ``list`` of strings
+        """
+
+        groups = []
+        concatenate = False
+        for token in self._token.findall(' '.join(self.searchterms)):
+            if token == 'OR' and groups:
+                concatenate = True
+            elif concatenate:
+                groups[-1].append(token)
+                concatenate = False
+            else:
+                groups.append([token])
+
+        return ([' OR '.join(sorted(i)) for i in groups]
+                + self._get_filter_terms())
+
+    def create_search_url(self):
+        """ Generates (urlencoded) query string from stored key-values tuples
+
+        :returns: A string containing all arguments in a url-encoded format
+        """
+
+        if self._cached_url is not None:
+            self.url = self._cached_url
+            return self.url
+
+        if len(self.searchterms) == 0:
+            raise TwitterSearchException(1015)
+
+        terms = [quote_plus(i) for i in self.searchterms]
+        terms += [quote_plus(i) for i in self._get_filter_terms()]
 
-        for key, value in self.arguments.items():
-            url += '&%s=%s' % (quote_plus(key), (quote_plus(value)
-                                                 if key != 'geocode'
-                                                 else value))
+        url = ['?q=', '+'.join(terms)]
+        for key, value in (self.arguments or {}).items():
+            url.append('&%s=%s' % (quote_plus(key), (quote_plus(value)
+                                                     if key != 'geocode'
+                                                     else value)))
 
-        self.url = url
+        self.url = self._cached_url = ''.join(url)
         return self.url
 
     def set_language(self, lang):
@@ -260,7 +316,7 @@ class TwitterSearchOrder(TwitterOrder):
         """
 
         if lang in self.iso_6391:
-            self.arguments.update({'lang': '%s' % lang})
+            self._set_argument('lang', '%s' % lang)
         else:
             raise TwitterSearchException(1002)
 
@@ -273,7 +329,7 @@ class TwitterSearchOrder(TwitterOrder):
         """
 
         if lang in self.iso_6391:
-            self.arguments.update({'locale': '%s' % lang})
+            self._set_argument('locale', '%s' % lang)
         else:
             raise TwitterSearchException(1002)
 
@@ -293,7 +349,7 @@ class TwitterSearchOrder(TwitterOrder):
 
         result_type = result_type.lower()
         if result_type in ['mixed', 'recent', 'popular']:
-            self.arguments.update({'result_type': '%s' % result_type})
+            self._set_argument('result_type', '%s' % result_type)
         else:
             raise TwitterSearchException(1003)
 
@@ -319,12 +375,9 @@ class TwitterSearchOrder(TwitterOrder):
 
         if isinstance(latitude, float) and isinstance(longitude, float):
             if isinstance(imperial_metric, bool):
-                self.arguments.update({'geocode': '%s,%s,%s%s' % (latitude,
-                                                                  longitude,
-                                                                  radius,
-                                                                  'km'
-                                                                  if imperial_metric
-                                                                  else 'mi')})
+                self._set_argument('geocode', '%s,%s,%s%s' % (
+                    latitude, longitude, radius,
+                    'km' if imperial_metric else 'mi'))
             else:
                 raise TwitterSearchException(1005)
         else:
@@ -339,7 +392,7 @@ class TwitterSearchOrder(TwitterOrder):
         """
 
         if isinstance(func, str if py3k else basestring) and func:
-            self.arguments.update({'callback': '%s' % func})
+            self._set_argument('callback', '%s' % func)
         else:
             raise TwitterSearchException(1006)
 
@@ -352,7 +405,7 @@ class TwitterSearchOrder(TwitterOrder):
         """
 
         if isinstance(date, datetime.date) and date <= datetime.date.today():
-            self.arguments.update({'until': '%s' % date.strftime('%Y-%m-%d')})
+            self._set_argument('until', '%s' % date.strftime('%Y-%m-%d'))
         else:
             raise TwitterSearchException(1007)
 
@@ -365,6 +418,6 @@ class TwitterSearchOrder(TwitterOrder):
         """
 
         if isinstance(date, datetime.date) and date <= datetime.date.today():
-            self.arguments.update({'since': '%s' % date.strftime('%Y-%m-%d')})
+            self._set_argument('since', '%s' % date.strftime('%Y-%m-%d'))
         else:
             raise TwitterSearchException(1007)
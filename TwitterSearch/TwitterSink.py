@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import threading
+import time
+
+from .TwitterSearchException import TwitterSearchException
+from .TwitterBatch import TwitterBatch
+from .utils import py3k, json_dumps
+
+try:
+    from queue import Queue, Empty  # python3
+except ImportError:
+    from Queue import Queue, Empty  # python2
+
+# pyarrow module imported by _pyarrow(), False until first usage
+_pyarrow_module = False
+
+
+def _pyarrow():
+    """ Imports pyarrow and its Parquet support on first usage \
+    as it takes a while to import
+
+    :returns: The ``pyarrow`` module or ``None`` if it isn't installed
+    """
+
+    global _pyarrow_module
+    if _pyarrow_module is False:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            pyarrow = None
+        _pyarrow_module = pyarrow
+    return _pyarrow_module
+
+# tells the background thread to stop
+_STOP = object()
+
+
+class TwitterSink(object):
+    """
+    Base class of sinks consuming tweets, e.g. the results of
+    ``TwitterSearch.search_tweets_iterable()``. Tweets are buffered and
+    written in batches as soon as ``max_tweets`` tweets or ``max_bytes``
+    bytes are buffered or the oldest buffered tweet is older than
+    ``max_delay`` seconds. Batches are written either by the thread
+    calling ``write()`` or by a background thread. Children need to
+    implement ``_write_batch()``.
+    """
+
+    def __init__(self, max_tweets=1000, max_bytes=None, max_delay=None,
+                 background=False):
+        """ Constructor
+
+        :param max_tweets: Amount of tweets written at once. \
+        Default value is ``1000``
+        :param max_bytes: Amount of encoded bytes written at once. \
+        Default value is ``None`` which means no limit
+        :param max_delay: Maximum amount of seconds a tweet is buffered. \
+        Without ``background`` this is checked on every ``write()`` only. \
+        Default value is ``None`` which means no limit
+        :param background: Boolean. If ``True``, batches are written by a \
+        background thread while new tweets are buffered. At most one \
+        further batch waits to be written, ``write()`` blocks otherwise. \
+        Default value is ``False``
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(max_tweets, int) or max_tweets <= 0:
+            raise TwitterSearchException(1004)
+        if max_bytes is not None and (not isinstance(max_bytes, int) or
+                                      max_bytes <= 0):
+            raise TwitterSearchException(1004)
+        if max_delay is not None and (
+                not isinstance(max_delay, (int, float)) or max_delay <= 0):
+            raise TwitterSearchException(1004)
+        if not isinstance(background, bool):
+            raise TwitterSearchException(1008)
+
+        self.max_tweets = max_tweets
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+
+        self.__lock = threading.Lock()
+        self.__writing = threading.Lock()
+        self.__buffer = []
+        self.__buffered_bytes = 0
+        self.__buffered_since = None
+        self.__statistics = {'tweets': 0, 'bytes': 0, 'batches': 0}
+        self.__started = None
+        self.__finished = None
+        self.__error = None
+        self.__closed = False
+
+        self.__thread = None
+        if background:
+            self.__batches = Queue(maxsize=1)
+            self.__thread = threading.Thread(target=self.__work)
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _encode(self, tweet):
+        """ Converts a tweet into the buffered representation. \
+        Tweets are encoded as JSON by default
+
+        :param tweet: A decoded tweet
+        :returns: A tuple of the buffered item and its size in bytes
+        """
+
+        data = json_dumps(tweet)
+        return data, len(data)
+
+    def _write_batch(self, items):
+        """ Writes a batch of buffered items. Has to be implemented \
+        within child classes
+
+        :param items: A ``list`` of items as returned by ``_encode()``
+        :returns: The amount of bytes written or ``None`` to count the \
+        size of the buffered items
+        :raises: NotImplementedError
+        """
+
+        raise NotImplementedError
+
+    def _close(self):
+        """ Releases all resources after the last batch was written """
+
+        pass
+
+    def write(self, tweet):
+        """ Buffers a tweet and writes the buffer if it's full
+
+        :param tweet: A decoded tweet
+        :raises: TwitterSearchException
+        """
+
+        self.__check()
+        item, size = self._encode(tweet)
+
+        with self.__lock:
+            now = time.time()
+            if self.__started is None:
+                self.__started = now
+            if not self.__buffer:
+                self.__buffered_since = now
+            self.__buffer.append(item)
+            self.__buffered_bytes += size
+
+            if (len(self.__buffer) >= self.max_tweets or
+                    (self.max_bytes is not None and
+                     self.__buffered_bytes >= self.max_bytes) or
+                    (self.max_delay is not None and
+                     now - self.__buffered_since >= self.max_delay)):
+                batch = self.__take()
+            else:
+                batch = None
+
+        if batch is not None:
+            self.__dispatch(batch)
+
+    def consume(self, tweets):
+        """ Writes all tweets of an iterable, e.g. \
+        ``sink.consume(ts.search_tweets_iterable(tso))``. \
+        The sink is not closed afterwards
+
+        :param tweets: An iterable of decoded tweets
+        :returns: The amount of tweets written
+        :raises: TwitterSearchException
+        """
+
+        count = 0
+        for tweet in tweets:
+            self.write(tweet)
+            count += 1
+        return count
+
+    def flush(self):
+        """ Writes all buffered tweets and waits until they are written
+
+        :raises: TwitterSearchException
+        """
+
+        self.__check()
+        with self.__lock:
+            batch = self.__take() if self.__buffer else None
+        if batch is not None:
+            self.__dispatch(batch)
+        if self.__thread is not None:
+            self.__batches.join()
+            with self.__writing:
+                pass  # waits for a time-based flush in progress
+        self.__check()
+
+    def close(self):
+        """ Writes all buffered tweets, stops the background thread \
+        and releases all resources. Closing a closed sink has no effect
+
+        :raises: TwitterSearchException
+        """
+
+        if self.__closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self.__closed = True
+            if self.__thread is not None:
+                self.__batches.put(_STOP)
+                self.__thread.join()
+            self._close()
+
+    def get_statistics(self):
+        """ Returns the amount of tweets and bytes written so far along \
+        with the throughput since the first tweet was buffered
+
+        :returns: A ``dict`` containing ``tweets``, ``bytes``, ``batches``, \
+        ``seconds``, ``tweets_per_second`` and ``bytes_per_second``
+        """
+
+        with self.__lock:
+            statistics = dict(self.__statistics)
+            seconds = ((self.__finished - self.__started)
+                       if self.__finished is not None else 0.0)
+
+        statistics['seconds'] = seconds
+        statistics['tweets_per_second'] = (statistics['tweets'] / seconds
+                                           if seconds > 0 else 0.0)
+        statistics['bytes_per_second'] = (statistics['bytes'] / seconds
+                                          if seconds > 0 else 0.0)
+        return statistics
+
+    def __check(self):
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+        if self.__closed:
+            raise TwitterSearchException(1024)
+
+    def __take(self):
+        # has to be called while holding the lock
+        batch = (self.__buffer, self.__buffered_bytes)
+        self.__buffer = []
+        self.__buffered_bytes = 0
+        self.__buffered_since = None
+        return batch
+
+    def __dispatch(self, batch):
+        if self.__thread is None:
+            self.__write(batch)
+        else:
+            self.__batches.put(batch)
+
+    def __write(self, batch):
+        items, size = batch
+        written = self._write_batch(items)
+        with self.__lock:
+            self.__statistics['tweets'] += len(items)
+            self.__statistics['bytes'] += size if written is None else written
+            self.__statistics['batches'] += 1
+            self.__finished = time.time()
+
+    def __work(self):
+        while True:
+            try:
+                batch = self.__batches.get(timeout=self.__get_timeout())
+            except Empty:
+                # the writing lock is taken before the buffer, thus flush()
+                # waits until a batch taken here is written
+                with self.__writing:
+                    with self.__lock:
+                        batch = self.__take() if self.__is_due() else None
+                    if batch is not None:
+                        try:
+                            self.__write(batch)
+                        except Exception as e:
+                            self.__error = e
+                continue
+            if batch is _STOP:
+                self.__batches.task_done()
+                return
+            with self.__writing:
+                try:
+                    self.__write(batch)
+                except Exception as e:
+                    self.__error = e
+                finally:
+                    self.__batches.task_done()
+
+    def __get_timeout(self):
+        # seconds until the buffered tweets are due, computed anew after
+        # every wake-up as tweets may have been buffered meanwhile
+        if self.max_delay is None:
+            return None
+        with self.__lock:
+            since = self.__buffered_since
+        if since is None:
+            return self.max_delay
+        return max(since + self.max_delay - time.time(), 0)
+
+    def __is_due(self):
+        # has to be called while holding the lock
+        return bool(self.__buffer) and (
+            time.time() - self.__buffered_since >= self.max_delay)
+
+
+class TwitterNDJSONSink(TwitterSink):
+    """
+    Writes tweets as newline-delimited JSON, one tweet per line,
+    optionally gzip compressed. Existing files are appended.
+    """
+
+    def __init__(self, target, compress=False, **attr):
+        """ Constructor
+
+        :param target: Either a string containing the path of the file \
+        or a file object opened in binary mode
+        :param compress: Boolean. If ``True``, the output is gzip \
+        compressed. Default value is ``False``
+
+        Further arguments are handed over to :class:`TwitterSink`
+        :raises: TwitterSearchException
+        """
+
+        if not isinstance(compress, bool):
+            raise TwitterSearchException(1008)
+
+        if isinstance(target, str if py3k else basestring):
+            self.__owned = open(target, 'ab')
+            fileobj = self.__owned
+        elif hasattr(target, 'write'):
+            self.__owned = None
+            fileobj = target
+        else:
+            raise TwitterSearchException(1009)
+
+        self.__file = (gzip.GzipFile(fileobj=fileobj, mode='ab')
+                       if compress else fileobj)
+        TwitterSink.__init__(self, **attr)
+
+    def _encode(self, tweet):
+        data = json_dumps(tweet)
+        return data, len(data) + 1
+
+    def _write_batch(self, items):
+        data = b'\n'.join(items) + b'\n'
+        self.__file.write(data)
+        self.__file.flush()
+        return len(data)
+
+    def _close(self):
+        if self.__file is not self.__owned:
+            if isinstance(self.__file, gzip.GzipFile):
+                self.__file.close()
+        if self.__owned is not None:
+            self.__owned.close()
+
+
+class TwitterParquetSink(TwitterSink):
+    """
+    Writes tweets into a Parquet file, one row group per batch. The
+    columns are the ones of :class:`TwitterBatch`. Requires ``pyarrow``.
+    The ``max_bytes`` argument refers to the size of tweets encoded as
+    JSON, the statistics count the bytes written into the file except
+    its footer which is written on ``close()``.
+    """
+
+    # column name -> name of the pyarrow type
+    arrow_types = {
+        'id': 'int64',
+        'user_id': 'int64',
+        'created_at': 'timestamp',
+        'text': 'string',
+        'lang': 'string',
+        'user_screen_name': 'string',
+        'retweet_count': 'int64',
+        'favorite_count': 'int64',
+        'in_reply_to_status_id': 'int64',
+        'hashtags': 'list<string>',
+        'user_mentions': 'list<int64>',
+        'urls': 'list<string>',
+    }
+
+    def __init__(self, path, columns=None, compression='snappy', **attr):
+        """ Constructor
+
+        :param path: A string containing the path of the file
+        :param columns: A ``list`` of column names out of \
+        ``TwitterBatch.available_columns``. Defaults to \
+        ``TwitterBatch.default_columns``
+        :param compression: Compression codec of the Parquet file. \
+        Default value is ``snappy``
+
+        Further arguments are handed over to :class:`TwitterSink`
+        :raises: TwitterSearchException
+        """
+
+        if _pyarrow() is None:
+            raise TwitterSearchException(1022)
+        if not isinstance(path, str if py3k else basestring):
+            raise TwitterSearchException(1009)
+
+        self.columns = TwitterBatch.get_columns(columns)
+        self.__path = path
+        self.__compression = compression
+        self.__writer = None
+        self.__file = None
+        TwitterSink.__init__(self, **attr)
+
+    @staticmethod
+    def _get_arrow_type(name):
+        pyarrow = _pyarrow()
+        if name == 'timestamp':
+            return pyarrow.timestamp('s')
+        if name.startswith('list<'):
+            return pyarrow.list_(TwitterParquetSink._get_arrow_type(
+                name[5:-1]))
+        return getattr(pyarrow, name)()
+
+    def _encode(self, tweet):
+        # tweets are buffered as they are, max_bytes counts their JSON size
+        return tweet, (len(json_dumps(tweet))
+                       if self.max_bytes is not None else 0)
+
+    def _write_batch(self, tweets):
+        pyarrow = _pyarrow()
+        batch = TwitterBatch(tweets, self.columns, use_numpy=False)
+        table = pyarrow.Table.from_arrays(
+            [pyarrow.array(list(batch[name]),
+                           type=self._get_arrow_type(self.arrow_types[name]))
+             for name in self.columns],
+            names=list(self.columns))
+
+        if self.__writer is None:
+            # the file is opened here to measure its growth by every batch
+            self.__file = open(self.__path, 'wb')
+            position = 0
+            self.__writer = pyarrow.parquet.ParquetWriter(
+                self.__file, table.schema, compression=self.__compression)
+        else:
+            position = self.__file.tell()
+        self.__writer.write_table(table)
+        return self.__file.tell() - position
+
+    def _close(self):
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class TwitterProducer(object):
+    """
+    Interface of message brokers used by :class:`TwitterProducerSink`.
+    Implementations send batches of messages, e.g. to Kafka or a local
+    queue.
+    """
+
+    def send_batch(self, messages):
+        """ Sends a batch of messages. Has to be implemented \
+        within child classes
+
+        :param messages: A ``list`` of tweets encoded as JSON ``bytes``
+        :raises: NotImplementedError
+        """
+
+        raise NotImplementedError
+
+    def close(self):
+        """ Releases all resources after the last batch was sent """
+
+        pass
+
+
+class TwitterProducerSink(TwitterSink):
+    """
+    Sends tweets encoded as JSON in batches to a :class:`TwitterProducer`.
+    """
+
+    def __init__(self, producer, **attr):
+        """ Constructor
+
+        :param producer: A :class:`TwitterProducer` instance or any \
+        other object offering ``send_batch(messages)`` and ``close()``
+
+        Further arguments are handed over to :class:`TwitterSink`
+        :raises: TwitterSearchException
+        """
+
+        if not callable(getattr(producer, 'send_batch', None)):
+            raise TwitterSearchException(1025)
+        self.producer = producer
+        TwitterSink.__init__(self, **attr)
+
+    def _write_batch(self, items):
+        self.producer.send_batch(items)
+
+    def _close(self):
+        close = getattr(self.producer, 'close', None)
+        if callable(close):
+            close()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+
+class TwitterStatistics(tuple):
+    """
+    Statistics as returned by ``TwitterSearch.get_statistics()``. For
+    backwards compatibility this is a ``tuple`` of the two integers
+    ``(queries, tweets)``. All further counters are accessible as
+    attributes, e.g. ``ts.get_statistics().retries``.
+    """
+
+    def __new__(cls, queries, tweets, **counters):
+        self = tuple.__new__(cls, (queries, tweets))
+        self.__dict__.update(counters)
+        return self
+
+    @property
+    def queries(self):
+        """ Amount of queries sent to the Twitter API """
+
+        return self[0]
+
+    @property
+    def tweets(self):
+        """ Amount of tweets received """
+
+        return self[1]
+
+    def as_dict(self):
+        """ Returns all counters
+
+        :returns: A ``dict`` containing all counters by name
+        """
+
+        counters = dict(self.__dict__)
+        counters.update({'queries': self[0], 'tweets': self[1]})
+        return counters
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__,
+                            ' '.join('%s=%s' % item
+                                     for item in sorted(
+                                         self.as_dict().items())))
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+import codecs
+import json
+import re
+
+from .utils import json_loads
+
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+
+# characters changing the nesting depth outside of strings
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+
+# characters ending a string or escaping the following one
+_STRING = re.compile(r'["\\]')
+
+# characters which may follow an element of an array
+_DELIMITERS = u' \t\r\n,]'
+
+
+class TwitterStreamParser(object):
+    """
+    Incremental parser splitting a JSON array into its elements while the
+    response is still being received. The array is either the document
+    itself (user timelines) or a value of the top-level object selected
+    by ``key`` (e.g. ``statuses`` of the Search API). Each element is
+    decoded and returned as soon as its last byte has arrived, thus only
+    one element needs to be kept in memory at once. All other parts of
+    the document are available as ``remainder`` afterwards.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks, key=None, json_loads=json_loads,
+                 transform=None):
+        """ Constructor
+
+        :param chunks: An iterable of ``bytes`` containing the document
+        :param key: Name of the key of the top-level object containing \
+        the array. Default value is ``None`` which means that the document \
+        itself is the array
+        :param json_loads: Function decoding the ``remainder``. Elements \
+        are decoded by the scanner of the ``json`` module as it reports \
+        where an element ends
+        :param transform: Function applied to every decoded element, \
+        e.g. a :class:`TwitterProjection`. Default value is ``None``
+        """
+
+        self._chunks = iter(chunks)
+        self._key = None if key is None else '"%s"' % key
+        self._json_loads = json_loads
+        self._transform = transform
+        self._text = codecs.getincrementaldecoder('utf-8')()
+
+        self._buf = u''
+        self._pos = 0
+        self._head = []
+        self._tail = []
+        self._in_array = False
+        self._finished = False
+
+        self.bytes_read = 0
+        self.remainder = None
+
+    @classmethod
+    def loads(cls, data, key=None, json_loads=json_loads, transform=None):
+        """ Decodes a whole document applying a function to every \
+        element of the array
+
+        :param data: The raw ``bytes`` of the document
+        :param key: Name of the key of the top-level object containing \
+        the array. Default value is ``None``
+        :param json_loads: Function decoding everything but the array
+        :param transform: Function applied to every decoded element
+        :returns: The decoded document
+        """
+
+        parser = cls([data], key=key, json_loads=json_loads,
+                     transform=transform)
+        elements = list(parser)
+        if key is None:
+            return elements
+        parser.remainder[key] = elements
+        return parser.remainder
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """ Python2 comparability method. Simply returns ``self.__next__()``
+
+        :returns: the ``__next__()`` method of this class
+        """
+
+        return self.__next__()
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+
+        if not self._in_array:
+            self._find_array()
+            self._in_array = True
+            if self._skip_whitespace() == u']':
+                self._finish()
+                raise StopIteration
+        else:
+            char = self._skip_whitespace()
+            if char == u']':
+                self._finish()
+                raise StopIteration
+            if char != u',':
+                raise ValueError('Expecting , delimiter')
+            self._pos += 1
+            self._skip_whitespace()
+
+        element = self._next_element()
+        if self._transform is None:
+            return element
+        return self._transform(element)
+
+    def _read(self):
+        """ Appends the next chunk to the buffer dropping consumed characters
+
+        :returns: ``False`` if there are no more chunks
+        """
+
+        for chunk in self._chunks:
+            if chunk:
+                self.bytes_read += len(chunk)
+                self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+                self._pos = 0
+                return True
+        return False
+
+    def _skip_whitespace(self):
+        """ Moves to the next character which is no whitespace
+
+        :returns: The character
+        :raises: ValueError at the end of the document
+        """
+
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._read():
+                raise ValueError('Unexpected end of JSON document')
+
+    def _find_array(self):
+        """ Moves behind the opening bracket of the array
+
+        :raises: ValueError if the document contains no such array
+        """
+
+        start = self._pos
+        char = self._skip_whitespace()
+        if self._key is None:
+            if char != u'[':
+                raise ValueError('JSON document is not an array')
+            self._pos += 1
+            self._head.append(self._buf[start:self._pos])
+            return
+
+        if char != u'{':
+            raise ValueError('JSON document is not an object')
+
+        # walk the top-level object until the key is found at depth one
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self._buf, self._pos)
+            if match is None:
+                self._head.append(self._buf[start:])
+                self._pos = len(self._buf)
+                if not self._read():
+                    raise ValueError('Key %s not found' % self._key)
+                start = 0
+                continue
+
+            char = match.group()
+            self._pos = match.end()
+            if char == u'"':
+                string_start = match.start()
+                self._head.append(self._buf[start:string_start])
+                string = self._read_string(string_start)
+                self._head.append(string)
+                start = self._pos
+                if depth == 1 and string == self._key:
+                    if self._skip_whitespace() == u':':
+                        self._pos += 1
+                        if self._skip_whitespace() != u'[':
+                            raise ValueError('Key %s is no array' % self._key)
+                        self._pos += 1
+                        self._head.append(u':[')
+                        return
+                    start = self._pos
+            elif char in u'[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    raise ValueError('Key %s not found' % self._key)
+
+    def _read_string(self, start):
+        """ Reads a string starting at a given position of the buffer
+
+        :param start: Position of the opening quotation mark
+        :returns: The raw string including quotation marks
+        """
+
+        parts = []
+        pos = start + 1
+        while True:
+            match = _STRING.search(self._buf, pos)
+            if match is None or (match.group() == u'\\' and
+                                 match.end() >= len(self._buf)):
+                parts.append(self._buf[start:])
+                self._pos = len(self._buf)
+                if not self._read():
+                    raise ValueError('Unterminated string')
+                # skip the escaped character following a trailing backslash
+                start, pos = 0, 0 if match is None else 1
+                continue
+            if match.group() == u'\\':
+                pos = match.end() + 1
+                continue
+            self._pos = match.end()
+            parts.append(self._buf[start:self._pos])
+            return u''.join(parts)
+
+    def _next_element(self):
+        """ Decodes the element starting at the current position. \
+        An element which isn't complete yet fails to decode and is \
+        retried as soon as the next chunk has arrived. Elements spanning \
+        many chunks are retried after their buffered part has doubled
+
+        :returns: The decoded element
+        """
+
+        while True:
+            try:
+                element, end = self._decoder.raw_decode(self._buf, self._pos)
+            except ValueError:
+                needed = 2 * (len(self._buf) - self._pos)
+                if not self._read():
+                    raise
+                while len(self._buf) - self._pos < needed and self._read():
+                    pass
+                continue
+
+            # numbers might continue within the next chunk
+            if (end < len(self._buf) and self._buf[end] in _DELIMITERS or
+                    not self._read()):
+                self._pos = end
+                return element
+
+    def _finish(self):
+        """ Reads the rest of the document and decodes everything \
+        but the elements of the array into ``remainder``
+        """
+
+        self._finished = True
+        self._tail.append(self._buf[self._pos:])
+        self._pos = len(self._buf)
+        while self._read():
+            self._tail.append(self._buf)
+            self._pos = len(self._buf)
+        self._tail.append(self._text.decode(b'', True))
+        self._buf = u''
+        self._pos = 0
+        self.remainder = self._json_loads(
+            (u''.join(self._head) + u''.join(self._tail)).encode('utf-8'))
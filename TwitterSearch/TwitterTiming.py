@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+# seconds spent connecting by the current thread
+_connecting = threading.local()
+
+# pool classes by scheme, created once urllib3 is needed
+_pool_classes = {}
+
+
+def _timed_connection(cls):
+    """ Derives a connection class adding the time needed to connect \
+    (including TLS handshakes) to the current thread
+    """
+
+    class TimedConnection(cls):
+        def connect(self):
+            start = time.time()
+            try:
+                return cls.connect(self)
+            finally:
+                _connecting.seconds = (getattr(_connecting, 'seconds', 0.0) +
+                                       time.time() - start)
+
+    TimedConnection.__name__ = 'Timed' + cls.__name__
+    return TimedConnection
+
+
+def _get_pool_classes():
+    """ Returns the connection pool classes using timed connections. \
+    urllib3 is imported on first usage to keep importing fast
+    """
+
+    if not _pool_classes:
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import (HTTPConnectionPool,
+                                            HTTPSConnectionPool)
+
+        class _TimedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = _timed_connection(HTTPConnection)
+
+        class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = _timed_connection(HTTPSConnection)
+
+        _pool_classes.update(https=_TimedHTTPSConnectionPool,
+                             http=_TimedHTTPConnectionPool)
+    return _pool_classes
+
+
+def time_connections(adapter):
+    """ Makes a ``requests`` transport adapter measure the time \
+    needed to connect, see ``connect_time()``
+
+    :param adapter: A ``requests.adapters.HTTPAdapter`` instance
+    :returns: The given adapter
+    """
+
+    adapter.poolmanager.pool_classes_by_scheme = dict(_get_pool_classes())
+    return adapter
+
+
+def connect_time(reset=False):
+    """ Returns the seconds the current thread spent connecting \
+    through adapters prepared by ``time_connections()``
+
+    :param reset: Boolean. If ``True``, the counter restarts at zero
+    :returns: Seconds as ``float``
+    """
+
+    seconds = getattr(_connecting, 'seconds', 0.0)
+    if reset:
+        _connecting.seconds = 0.0
+    return seconds
+
+
+class TwitterTiming(object):
+    """
+    Timing of a single query of a page as returned by
+    ``TwitterSearch.get_timings()``. All durations are in seconds and
+    summed up over all attempts of the query:
+
+    * ``queue_wait``: waiting for the rate limiter and retry backoff
+    * ``connect``: establishing new connections including TLS
+    * ``ttfb``: waiting for the response headers once connected
+    * ``download``: reading the body
+    * ``decode``: decoding the body
+    * ``callback``: running the callback of the iteration
+
+    Durations which were not measured are ``None``, e.g. ``download`` and
+    ``decode`` of streamed pages as both are interleaved with iterating.
+    """
+
+    __slots__ = ('url', 'resource', 'started', 'attempts', 'status',
+                 'queue_wait', 'connect', 'ttfb', 'download', 'decode',
+                 'callback', 'bytes_received', 'bytes_decoded', 'tweets')
+
+    _durations = ('queue_wait', 'connect', 'ttfb', 'download', 'decode',
+                  'callback')
+
+    def __init__(self, url):
+        """ Constructor
+
+        :param url: A string of the query string of the page
+        """
+
+        self.url = url
+        self.resource = None
+        self.started = time.time()
+        self.attempts = 0
+        self.status = None
+        self.queue_wait = 0.0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.download = None
+        self.decode = None
+        self.callback = None
+        self.bytes_received = None
+        self.bytes_decoded = None
+        self.tweets = None
+
+    @property
+    def total(self):
+        """ Sum of all measured durations """
+
+        return sum(getattr(self, name) or 0.0 for name in self._durations)
+
+    def as_dict(self):
+        """ Returns all fields
+
+        :returns: A ``dict`` containing all fields by name and ``total``
+        """
+
+        fields = dict((name, getattr(self, name)) for name in self.__slots__)
+        fields['total'] = self.total
+        return fields
+
+    def __repr__(self):
+        return '<%s %s status=%s total=%.3f>' % (
+            self.__class__.__name__, self.resource, self.status, self.total)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import threading
+import time
+
+
+class _NoopSpan(object):
+    """ Span returned by :class:`TwitterTracer` which records nothing """
+
+    __slots__ = ()
+
+    trace_id = None
+    span_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class TwitterTracer(object):
+    """
+    Interface of tracers receiving the spans opened by
+    :class:`TwitterSearch` around searching, paginating, HTTP requests,
+    decoding and callbacks. This base class is the default tracer and
+    records nothing. Implementations override ``start_span()`` to hand
+    spans over to a tracing system, e.g. OpenTelemetry.
+    """
+
+    def start_span(self, name, parent=None, **attributes):
+        """ Opens a span which is closed by using it as context manager, \
+        e.g. ``with tracer.start_span('decode', tweets=100) as span:``
+
+        :param name: Name of the span, e.g. ``http``
+        :param parent: The parent span. Default value is ``None`` which \
+        uses the innermost span open within the current thread
+        :param attributes: Attributes of the span, e.g. ``endpoint``. \
+        Further attributes are added using ``span.set_attribute()``
+        :returns: A span usable as context manager
+        """
+
+        return _NOOP_SPAN
+
+
+class TwitterSpan(object):
+    """
+    A span recorded by :class:`TwitterMemoryTracer`. ``start`` and ``end``
+    are timestamps in seconds, ``end`` is ``None`` while the span is open.
+    Spans of one search and all of its pages share the same ``trace_id``.
+    """
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+                 'start', 'end', '_tracer')
+
+    def __init__(self, tracer, name, trace_id, span_id, parent_id,
+                 attributes):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.time()
+        self.end = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        self._tracer._finish(self)
+
+    def __repr__(self):
+        return '<%s %s %s>' % (self.__class__.__name__, self.name,
+                               self.attributes)
+
+    def set_attribute(self, key, value):
+        """ Adds an attribute to this span
+
+        :param key: Name of the attribute
+        :param value: Value of the attribute
+        """
+
+        self.attributes[key] = value
+
+    @property
+    def duration(self):
+        """ Seconds between opening and closing this span """
+
+        return None if self.end is None else self.end - self.start
+
+
+class TwitterMemoryTracer(TwitterTracer):
+    """
+    Tracer keeping all closed spans in memory, e.g. for tests or to build
+    latency waterfalls of queries offline using ``format_waterfall()``.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__ids = itertools.count(1)
+        self.__spans = []
+
+    def start_span(self, name, parent=None, **attributes):
+        stack = getattr(self.__local, 'stack', None)
+        if stack is None:
+            stack = self.__local.stack = []
+        if parent is None and stack:
+            parent = stack[-1]
+
+        with self.__lock:
+            span_id = next(self.__ids)
+        span = TwitterSpan(self, name,
+                           span_id if parent is None else parent.trace_id,
+                           span_id,
+                           None if parent is None else parent.span_id,
+                           attributes)
+        stack.append(span)
+        return span
+
+    def _finish(self, span):
+        span.end = time.time()
+        stack = self.__local.stack
+        if stack and stack[-1] is span:
+            stack.pop()
+        elif span in stack:
+            stack.remove(span)
+        with self.__lock:
+            self.__spans.append(span)
+
+    def get_spans(self, trace_id=None, name=None):
+        """ Returns the closed spans ordered by their start
+
+        :param trace_id: Returns the spans of this trace only. \
+        Default value is ``None`` which returns all spans
+        :param name: Returns the spans of this name only. \
+        Default value is ``None`` which returns all spans
+        :returns: A ``list`` of :class:`TwitterSpan` instances
+        """
+
+        with self.__lock:
+            spans = list(self.__spans)
+        return sorted((span for span in spans
+                       if (trace_id is None or span.trace_id == trace_id) and
+                       (name is None or span.name == name)),
+                      key=lambda span: (span.start, span.span_id))
+
+    def clear(self):
+        """ Drops all recorded spans """
+
+        with self.__lock:
+            self.__spans = []
+
+    def format_waterfall(self, trace_id, width=40):
+        """ Renders the spans of a trace as text, one line per span \
+        showing its offset from the start of the trace and its duration
+
+        :param trace_id: ID of the trace, i.e. the ``span_id`` of its \
+        root span
+        :param width: Width of the bars in characters. Default is ``40``
+        :returns: A string
+        """
+
+        spans = self.get_spans(trace_id)
+        if not spans:
+            return ''
+        begin = min(span.start for span in spans)
+        total = max(max(span.end for span in spans) - begin, 1e-9)
+
+        depths = {}
+        lines = []
+        for span in spans:
+            depth = depths[span.span_id] = depths.get(span.parent_id, -1) + 1
+            offset = int((span.start - begin) / total * width)
+            length = max(int(span.duration / total * width), 1)
+            lines.append('%-32s %9.2fms %9.2fms |%s%s%s|' % (
+                '  ' * depth + span.name, (span.start - begin) * 1000,
+                span.duration * 1000, ' ' * offset,
+                '#' * min(length, width - offset),
+                ' ' * max(width - offset - length, 0)))
+        return '\n'.join(lines)
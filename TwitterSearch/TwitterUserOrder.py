@@ -3,13 +3,13 @@
 import datetime
 from .TwitterSearchException import TwitterSearchException
 from .TwitterOrder import TwitterOrder
-from .utils import py3k
+from .utils import py3k, quote_plus
 
 try:
-    from urllib.parse import parse_qs, quote_plus, unquote  # python3
+    from urllib.parse import parse_qs, unquote  # python3
 except ImportError:
     from urlparse import parse_qs
-    from urllib import quote_plus, unquote  # python2
+    from urllib import unquote  # python2
 
 
 class TwitterUserOrder(TwitterOrder):
@@ -29,26 +29,26 @@ class TwitterUserOrder(TwitterOrder):
         :raises: TwitterSearchException
         """
 
-        self.arguments.update({'count': '%s' % self._max_count})
+        TwitterOrder.__init__(self)
+        self._set_argument('count', '%s' % self._max_count)
 
         # see: https://dev.twitter.com/docs/api/1.1/get/statuses/user_timeline
         self.set_include_rts(True)
 
         self.set_exclude_replies(False)
-        self.url = ''
 
         if py3k:
             if isinstance(user, int):
-                self.arguments.update({'user_id': '%i' % user})
+                self._set_argument('user_id', '%i' % user)
             elif isinstance(user, str):
-                self.arguments.update({'screen_name': user})
+                self._set_argument('screen_name', user)
             else:
                 raise TwitterSearchException(1017)
         else:
             if isinstance(user, (int, long)):
-                self.arguments.update({'user_id': '%i' % user})
+                self._set_argument('user_id', '%i' % user)
             elif isinstance(user, basestring):
-                self.arguments.update({'screen_name': user})
+                self._set_argument('screen_name', user)
             else:
                 raise TwitterSearchException(1017)
 
@@ -63,7 +63,7 @@ class TwitterUserOrder(TwitterOrder):
 
         if not isinstance(trim, bool):
             raise TwitterSearchException(1008)
-        self.arguments.update({'trim_user': 'true' if trim else 'false'})
+        self._set_argument('trim_user', 'true' if trim else 'false')
 
     def set_include_rts(self, rts):
         """ Sets 'include_rts' parameter. When set to False, \
@@ -75,7 +75,7 @@ class TwitterUserOrder(TwitterOrder):
 
         if not isinstance(rts, bool):
             raise TwitterSearchException(1008)
-        self.arguments.update({'include_rts': 'true' if rts else 'false'})
+        self._set_argument('include_rts', 'true' if rts else 'false')
 
     def set_exclude_replies(self, exclude):
         """ Sets 'exclude_replies' parameter used to \
@@ -87,9 +87,7 @@ class TwitterUserOrder(TwitterOrder):
 
         if not isinstance(exclude, bool):
             raise TwitterSearchException(1008)
-        self.arguments.update({'exclude_replies': 'true'
-                                                  if exclude
-                                                  else 'false'})
+        self._set_argument('exclude_replies', 'true' if exclude else 'false')
 
     def set_contributor_details(self, contdetails):
         """ Sets 'contributor_details' parameter used to enhance the \
@@ -103,9 +101,8 @@ class TwitterUserOrder(TwitterOrder):
 
         if not isinstance(contdetails, bool):
             raise TwitterSearchException(1008)
-        self.arguments.update({'contributor_details': 'true'
-                                                      if contdetails
-                                                      else 'false'})
+        self._set_argument('contributor_details',
+                           'true' if contdetails else 'false')
 
     def create_search_url(self):
         """ Generates (urlencoded) query string from stored key-values tuples
@@ -113,10 +110,11 @@ class TwitterUserOrder(TwitterOrder):
         :returns: A string containing all arguments in a url-encoded format
         """
 
-        url = '?'
-        for key, value in self.arguments.items():
-            url += '%s=%s&' % (quote_plus(key), quote_plus(value))
-        self.url = url[:-1]
+        if self._cached_url is None:
+            self._cached_url = '?' + '&'.join(
+                '%s=%s' % (quote_plus(key), quote_plus(value))
+                for key, value in (self.arguments or {}).items())
+        self.url = self._cached_url
         return self.url
 
     def set_search_url(self, url):
@@ -130,4 +128,5 @@ class TwitterUserOrder(TwitterOrder):
 
         self.arguments = {}
         for key, value in parse_qs(url).items():
-            self.arguments.update({key: unquote(value[0])})
+            self._set_argument(key, unquote(value[0]))
+        self._set_dirty()
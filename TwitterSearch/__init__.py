@@ -5,8 +5,26 @@ __license__ = 'MIT'
 __copyright__ = 'Copyright 2017 Christian Koepp'
 
 from .TwitterSearch import TwitterSearch
+from .TwitterCursor import TwitterCursor
 from .TwitterOrder import TwitterOrder
 from .TwitterSearchOrder import TwitterSearchOrder
 from .TwitterUserOrder import TwitterUserOrder
 from .TwitterSearchException import TwitterSearchException
-from .utils import py3k
+from .TwitterRateLimiter import TwitterRateLimiter, TwitterRateLimit
+from .TwitterRetryPolicy import TwitterRetryPolicy
+from .TwitterStatistics import TwitterStatistics
+from .TwitterStreamParser import TwitterStreamParser
+from .TwitterProjection import TwitterProjection
+from .Tweet import Tweet, User
+from .TwitterBatch import TwitterBatch
+from .TwitterSink import TwitterSink, TwitterNDJSONSink, TwitterParquetSink, \
+    TwitterProducer, TwitterProducerSink
+from .TwitterTiming import TwitterTiming
+from .TwitterMetrics import TwitterMetrics
+from .TwitterTracer import TwitterTracer, TwitterMemoryTracer, TwitterSpan
+from .TwitterRecorder import TwitterRecordingAdapter, TwitterReplayAdapter
+from .TwitterMockServer import TwitterMockServer
+from .utils import py3k, py36
+
+if py36:
+    from .AsyncTwitterSearch import AsyncTwitterSearch
@@ -1,2 +1,94 @@
 import sys
 py3k = sys.version_info >= (3, 0)
+py36 = sys.version_info >= (3, 6)
+
+try:
+    from urllib.parse import quote_plus as _quote_plus  # python3
+except ImportError:
+    from urllib import quote_plus as _quote_plus  # python2
+
+# fastest available JSON decoder accepting the raw bytes of a response
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        try:
+            from simplejson import loads as json_loads
+        except ImportError:
+            from json import loads as _loads
+            if py3k and not py36:
+                def json_loads(s):
+                    return _loads(s.decode('utf-8')
+                                  if isinstance(s, bytes) else s)
+            else:
+                json_loads = _loads
+
+
+def _to_serializable(obj):
+    # records like Tweet are mappings but no dicts
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError('%r is not JSON serializable' % obj)
+
+
+# fastest available JSON encoder returning bytes
+try:
+    from orjson import dumps as _orjson_dumps
+
+    def json_dumps(obj):
+        return _orjson_dumps(obj, default=_to_serializable)
+except ImportError:
+    from json import dumps as _dumps
+
+    def json_dumps(obj):
+        return _dumps(obj, separators=(',', ':'),
+                      default=_to_serializable).encode('utf-8')
+
+
+def create_http_server(address, handler):
+    """ Creates an HTTP server answering every request within its own \
+    daemon thread. ``http.server`` is imported on first usage only as \
+    it takes a while to import
+
+    :param address: A tuple of host and port to listen on
+    :param handler: A class implementing ``do_GET()`` etc. which is \
+    combined with ``BaseHTTPRequestHandler``
+    :returns: A ``HTTPServer`` instance
+    """
+
+    try:
+        from http.server import HTTPServer, BaseHTTPRequestHandler
+        from socketserver import ThreadingMixIn  # python3
+    except ImportError:
+        from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+        from SocketServer import ThreadingMixIn  # python2
+
+    class Server(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    return Server(address, type(handler.__name__,
+                                (handler, BaseHTTPRequestHandler), {}))
+
+
+# query strings of orders consist of few distinct terms and values
+_quoted = {}
+_max_quoted = 10000
+
+
+def quote_plus(value):
+    """ Memoized version of ``quote_plus()`` url-encoding a string \
+    with spaces replaced by ``+``
+
+    :param value: A string to encode
+    :returns: The encoded string
+    """
+
+    try:
+        return _quoted[value]
+    except KeyError:
+        if len(_quoted) >= _max_quoted:
+            _quoted.clear()
+        quoted = _quoted[value] = _quote_plus(value)
+        return quoted
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+""" Compares the JSON decoders usable by TwitterSearch (``json_loads``
+argument) by decoding the recorded pages within tests/mock-data.
+
+Usage: ``python benchmarks/bench_json.py [repetitions]``
+"""
+
+import glob
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from TwitterSearch.utils import json_loads
+
+MOCK_DATA = os.path.join(os.path.dirname(__file__), '..', 'tests', 'mock-data')
+
+
+def load_pages():
+    pages = []
+    for filename in sorted(glob.glob(os.path.join(MOCK_DATA, '*', '*.log'))):
+        with open(filename, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def get_decoders():
+    import json
+    decoders = [('json', json.loads)]
+    for name in ('simplejson', 'ujson', 'orjson'):
+        try:
+            decoders.append((name, __import__(name).loads))
+        except ImportError:
+            pass
+    return decoders
+
+
+def main(repetitions=20):
+    pages = load_pages()
+    size = sum(len(page) for page in pages)
+    print('%i pages, %.1f KiB in total, default decoder: %s.%s' % (
+        len(pages), size / 1024.0,
+        json_loads.__module__, json_loads.__name__))
+
+    baseline = None
+    for name, loads in get_decoders():
+        def run():
+            for page in pages:
+                loads(page)
+        seconds = min(timeit.repeat(run, number=1, repeat=repetitions))
+        baseline = baseline or seconds
+        print('%-10s %8.2f ms/run %8.1f MiB/s %6.2fx' % (
+            name, seconds * 1000, size / seconds / 2 ** 20,
+            baseline / seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
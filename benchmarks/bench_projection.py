@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+""" Compares time and peak memory needed to decode the recorded timeline
+pages within tests/mock-data with and without a projection of tweets.
+
+Usage: ``python benchmarks/bench_projection.py [field ...]``
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from TwitterSearch import TwitterProjection
+from TwitterSearch.utils import json_loads
+
+MOCK_DATA = os.path.join(os.path.dirname(__file__), '..', 'tests', 'mock-data')
+
+DEFAULT_FIELDS = ['created_at', 'text', 'user.id', 'entities.hashtags']
+
+
+def measure(decode, pages):
+    tracemalloc.start()
+    start = time.time()
+    results = [decode(page) for page in pages]
+    seconds = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del results
+    return seconds, peak
+
+
+def main(*fields):
+    projection = TwitterProjection(list(fields) or DEFAULT_FIELDS)
+    pages = []
+    for i in range(2):
+        with open(os.path.join(MOCK_DATA, 'user', '%i.log' % i), 'rb') as f:
+            pages.append(f.read())
+    size = sum(len(page) for page in pages)
+    print('%i pages, %.1f KiB in total, projection: %s' % (
+        len(pages), size / 1024.0, ', '.join(projection.fields)))
+
+    baseline = None
+    for name, decode in [('full', json_loads),
+                         ('projected', projection.loads)]:
+        seconds, peak = measure(decode, pages)
+        baseline = baseline or peak
+        print('%-10s %8.2f ms %8.1f KiB peak %6.2fx' % (
+            name, seconds * 1000, peak / 1024.0, baseline / float(peak)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+""" Measures wall time and peak memory of importing the library,
+creating clients (verifying credentials blocking, in the background or
+cached), building and parsing query URLs, iterating many recorded pages,
+decoding pages and the overhead of statistics and callbacks. Pages are
+recorded once from a :class:`TwitterMockServer` and replayed without
+network access.
+
+Results are stored as JSON baselines which later runs are compared to::
+
+    python benchmarks/bench_suite.py --save benchmarks/baselines/1.1.0.dev0.json
+    python benchmarks/bench_suite.py --compare benchmarks/baselines/1.1.0.dev0.json
+
+Baselines store the git revision they were measured at along with the
+version of the package.
+
+Comparing exits with status 1 if a benchmark got slower than
+``--threshold`` (default ``1.2``, i.e. 20%) times its baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import TwitterSearch as package
+from TwitterSearch import (TwitterSearch, TwitterSearchOrder,
+                           TwitterUserOrder, TwitterMockServer)
+from TwitterSearch.utils import json_loads
+
+CREDENTIALS = ('aaabbb', 'cccddd', '111222', '333444')
+UNLIMITED = dict((endpoint, 10 ** 9)
+                 for endpoint in TwitterMockServer.default_rate_limits)
+
+
+def create_tso(keywords=200):
+    tso = TwitterSearchOrder()
+    tso.set_keywords(['keyword%i' % i for i in range(keywords)] +
+                     ['with space', u'\xfcml\xe4ut'])
+    tso.set_language('de')
+    tso.set_locale('ja')
+    tso.set_result_type('recent')
+    tso.set_geocode(49.4, 8.7, 10)
+    tso.set_count(100)
+    tso.set_include_entities(True)
+    return tso
+
+
+def record_pages(directory, tweets, count):
+    """ Records the search pages and user timeline of a synthetic corpus """
+
+    corpus = TwitterMockServer.synthetic_corpus(tweets, users=1)
+    with TwitterMockServer(corpus) as server:
+        ts = TwitterSearch(*CREDENTIALS, base_url=server.get_base_url(),
+                           record=directory, verify=False)
+        tso = create_tso(3)
+        tso.set_count(count)
+        tuo = TwitterUserOrder('user0')
+        tuo.set_count(count)
+        for order in (tso, tuo):
+            for tweet in ts.search_tweets_iterable(order):
+                pass
+        ts.close()
+        return server.get_base_url(), tso, tuo
+
+
+def load_pages(directory):
+    pages = []
+    with open(os.path.join(directory, 'requests.log'), 'rb') as f:
+        for line in f:
+            with open(os.path.join(directory,
+                                   json.loads(line.decode('utf-8'))['body']),
+                      'rb') as page:
+                pages.append(page.read())
+    return pages
+
+
+def get_startup_benchmarks(base_url):
+    """ Returns tuples of name and function measuring the startup of \
+    a worker, i.e. importing the library and creating a client
+    """
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+    def run_python(code):
+        def run():
+            subprocess.check_call([sys.executable, '-c', code], cwd=root)
+        return run
+
+    order = create_tso(3)
+
+    def start(**attr):
+        # until the first page arrived and the credentials are verified
+        def run():
+            ts = TwitterSearch(*CREDENTIALS, base_url=base_url,
+                               metrics=None, **attr)
+            ts.search_tweets(order)
+            ts.wait_for_verification()
+            ts.close()
+        return run
+
+    return [
+        ('python_startup', run_python('pass')),
+        ('import_package', run_python('from TwitterSearch import *')),
+        ('start_verify', start()),
+        ('start_verify_cached', start(verify_ttl=3600)),
+        ('start_verify_background', start(verify='background')),
+        ('start_no_verify', start(verify=False)),
+    ]
+
+
+def get_benchmarks(directory, base_url, tso, tuo):
+    """ Returns tuples of name and function to measure """
+
+    big_tso = create_tso()
+    url = big_tso.create_search_url()
+    pages = load_pages(directory)
+
+    def iterate(order, callback=None, stream=False, statistics=False):
+        def run():
+            ts = TwitterSearch(*CREDENTIALS, base_url=base_url,
+                               replay=directory, verify=False, stream=stream)
+            for tweet in ts.search_tweets_iterable(order, callback):
+                if statistics:
+                    ts.get_statistics()
+        return run
+
+    def set_search_url():
+        TwitterSearchOrder().set_search_url(url)
+
+    def rebuild_search_url():
+        # adding a keyword to an order of many memoized keywords
+        big_tso.add_keyword('keyword0')
+        big_tso.create_search_url()
+        big_tso.searchterms.pop()
+        big_tso._set_dirty()
+
+    def decode_pages():
+        for page in pages:
+            json_loads(page)
+
+    return [
+        ('tso_create_search_url', big_tso.create_search_url),
+        ('tso_set_search_url', set_search_url),
+        ('tso_rebuild_search_url', rebuild_search_url),
+        ('tuo_create_search_url', tuo.create_search_url),
+        ('decode_pages', decode_pages),
+        ('iterate_search', iterate(tso)),
+        ('iterate_search_stream', iterate(tso, stream=True)),
+        ('iterate_timeline', iterate(tuo)),
+        ('iterate_search_callback', iterate(tso, lambda ts: None)),
+        ('iterate_search_statistics', iterate(tso, statistics=True)),
+    ]
+
+
+def measure(func, repetitions):
+    """ Returns the best wall time per call and the peak memory of a call """
+
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    seconds = min(timer.repeat(repeat=repetitions, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'seconds': seconds, 'peak_bytes': peak, 'number': number}
+
+
+def compare(results, baseline, threshold):
+    """ Prints the ratios to a baseline
+
+    :returns: ``True`` if no benchmark got slower than ``threshold``
+    """
+
+    passed = True
+    print('%-28s %12s %12s %8s' % ('benchmark', 'baseline', 'current',
+                                   'ratio'))
+    for name, result in sorted(results.items()):
+        if name not in baseline['results']:
+            print('%-28s %12s %10.1fus %8s' % (name, '-',
+                                               result['seconds'] * 1e6, '-'))
+            continue
+        before = baseline['results'][name]['seconds']
+        ratio = result['seconds'] / before
+        slower = ratio > threshold
+        passed = passed and not slower
+        print('%-28s %10.1fus %10.1fus %7.2fx%s' % (
+            name, before * 1e6, result['seconds'] * 1e6, ratio,
+            ' REGRESSION' if slower else ''))
+    return passed
+
+
+def get_revision():
+    """ Returns the git commit measured, ``None`` outside of git """
+
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmarks of TwitterSearch')
+    parser.add_argument('--save', help='file to store the results in')
+    parser.add_argument('--compare', help='baseline to compare to')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--tweets', type=int, default=2000,
+                        help='amount of tweets per recorded order')
+    parser.add_argument('--count', type=int, default=100,
+                        help='amount of tweets per recorded page')
+    parser.add_argument('--filter', default='',
+                        help='runs benchmarks containing this string only')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        base_url, tso, tuo = record_pages(directory, args.tweets, args.count)
+        results = {}
+        # clients are created far more often than allowed by Twitter,
+        # the latency resembles a nearby API server
+        with TwitterMockServer(latency=0.005,
+                               rate_limits=UNLIMITED) as server:
+            benchmarks = get_startup_benchmarks(server.get_base_url())
+            benchmarks += get_benchmarks(directory, base_url, tso, tuo)
+            for name, func in benchmarks:
+                if args.filter not in name:
+                    continue
+                results[name] = measure(func, args.repetitions)
+                print('%-28s %10.1fus %10.1f KiB peak' % (
+                    name, results[name]['seconds'] * 1e6,
+                    results[name]['peak_bytes'] / 1024.0))
+    finally:
+        shutil.rmtree(directory)
+
+    document = {
+        'version': package.__version__,
+        'revision': get_revision(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'tweets': args.tweets,
+        'count': args.count,
+        'results': results,
+    }
+    if args.save:
+        directory = os.path.dirname(args.save)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(args.save, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            if not compare(results, json.load(f), args.threshold):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+""" Compares plain dicts and :class:`Tweet` instances by decoding the
+recorded pages within tests/mock-data: time needed per page and memory
+needed to keep the decoded tweets.
+
+Usage: ``python benchmarks/bench_tweet.py [copies]``
+"""
+
+import glob
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from TwitterSearch import TwitterSearch, Tweet
+from TwitterSearch.utils import json_loads
+
+MOCK_DATA = os.path.join(os.path.dirname(__file__), '..', 'tests', 'mock-data')
+
+
+def load_pages():
+    pages = []
+    for filename in sorted(glob.glob(os.path.join(MOCK_DATA, '*', '*.log'))):
+        key = 'statuses' if os.sep + 'search' + os.sep in filename else None
+        with open(filename, 'rb') as f:
+            data = f.read()
+        if data.lstrip().startswith(b'[' if key is None else b'{"statuses"'):
+            pages.append((data, key))
+    return pages
+
+
+def decoder(transform=None, incremental=False):
+    def decode(data, key):
+        content = TwitterSearch._decode_page(data, key is not None,
+                                             json_loads, transform,
+                                             incremental)
+        return content if key is None else content[key]
+    return decode
+
+
+def main(copies=10):
+    pages = load_pages()
+    size = sum(len(data) for data, key in pages)
+    print('%i pages, %.1f KiB in total, kept %i times' % (
+        len(pages), size / 1024.0, copies))
+
+    baseline = None
+    for name, decode in [('dict', decoder()),
+                         ('Tweet', decoder(Tweet)),
+                         ('Tweet (incremental)', decoder(Tweet, True))]:
+        def run():
+            return [decode(data, key) for data, key in pages]
+        seconds = min(timeit.repeat(run, number=1, repeat=10))
+
+        tracemalloc.start()
+        kept = [run() for i in range(copies)]
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        tweets = sum(len(page) for page in kept[0])
+        del kept
+
+        baseline = baseline or memory
+        print('%-20s %8.2f ms/run %8.1f KiB %6i B/tweet %6.2fx' % (
+            name, seconds * 1000, memory / 1024.0,
+            memory / (tweets * copies), baseline / float(memory)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
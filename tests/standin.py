@@ -0,0 +1,115 @@
+from TwitterSearch import TwitterSearch, TwitterProducer
+
+try: from urllib.parse import urlsplit, parse_qs # python3
+except ImportError: from urlparse import urlsplit, parse_qs #python2
+
+try: from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler # python2
+except ImportError: from http.server import HTTPServer, BaseHTTPRequestHandler # python3
+
+try: from SocketServer import ThreadingMixIn # python2
+except ImportError: from socketserver import ThreadingMixIn # python3
+
+import threading
+import time
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    """ Local stand-in for the Twitter API serving files of tests/mock-data """
+
+    daemon_threads = True
+
+    # search pages are routed by their max_id argument
+    search_pages = {
+        None: 'tests/mock-data/search/0.log',
+        '355715848851300353': 'tests/mock-data/search/1.log',
+        '355714667852726271': 'tests/mock-data/search/2.log',
+        '355712782454358015': 'tests/mock-data/search/3.log',
+    }
+
+    # timeline pages are served one after another
+    user_pages = [ 'tests/mock-data/user/0.log', 'tests/mock-data/user/1.log', 'tests/mock-data/user/2.log' ]
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StandInHandler)
+        self.connections = 0
+        self.delay = 0
+        self.user_page = 0
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def get_base_url(self):
+        return 'http://127.0.0.1:%i/1.1/' % self.server_address[1]
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        parts = urlsplit(self.path)
+        path = parts.path[len('/1.1/'):]
+        args = parse_qs(parts.query)
+        status = 200
+
+        if 'Authorization' not in self.headers:
+            status, filename = 401, 'tests/mock-data/verify-error.log'
+        elif path == TwitterSearch._search_url:
+            filename = self.server.search_pages.get(args.get('max_id', [None])[0])
+        elif path == TwitterSearch._user_url and args.get('screen_name') == ['unknown']:
+            status, filename = 404, 'tests/mock-data/search/empty.log'
+        elif path == TwitterSearch._user_url:
+            with self.server.lock:
+                filename = self.server.user_pages[min(self.server.user_page, 2)]
+                self.server.user_page += 1
+        elif path == TwitterSearch._lang_url:
+            filename = 'tests/mock-data/lang.log'
+        elif path == TwitterSearch._verify_url:
+            filename = 'tests/mock-data/verify.log'
+        else:
+            status, filename = 404, 'tests/mock-data/search/empty.log'
+
+        with open(filename, 'rb') as f:
+            body = f.read()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '%i' % len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInBroker(TwitterProducer):
+    """ Local stand-in for a message broker keeping all batches sent """
+
+    def __init__(self, delay=0):
+        self.batches = []
+        self.delay = delay
+        self.closed = False
+        self.threads = set()
+
+    def send_batch(self, messages):
+        if self.closed:
+            raise IOError('Broker already closed')
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.batches.append(list(messages))
+
+    def close(self):
+        self.closed = True
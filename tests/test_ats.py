@@ -0,0 +1,194 @@
+from TwitterSearch import *
+from TwitterSearch.utils import py36
+from tests.standin import StandInServer
+
+import unittest
+
+
+@unittest.skipIf(not py36, "AsyncTwitterSearch requires Python 3.6 or newer")
+class AsyncTwitterSearchTest(unittest.TestCase):
+
+    def createTSO(self):
+        """ Returns a default TwitterSearchOrder instance """
+        tso = TwitterSearchOrder()
+        tso.set_keywords(['foo'])
+        tso.set_count(4)
+        return tso
+
+    def createATS(self, **attr):
+        """ Returns a default AsyncTwitterSearch instance pointing to the stand-in server """
+        ats = AsyncTwitterSearch('aaabbb','cccddd','111222','333444', **attr)
+        ats._base_url = self.server.get_base_url()
+        return ats
+
+    def collect(self, iterator):
+        """ Drains an asynchronous iterator within the event loop """
+        items = []
+        while True:
+            try:
+                items.append(self.loop.run_until_complete(iterator.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+    def setUp(self):
+        """ Constructor """
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        self.server = StandInServer()
+
+    def tearDown(self):
+        self.server.stop()
+        self.loop.close()
+
+    ################ TESTS #########################
+
+    def test_ATS_search(self):
+        """ Tests AsyncTwitterSearch.search() and .get_statistics() by using TwitterSearchOrder class """
+
+        ats = self.createATS()
+        tweets = self.collect(ats.search(self.createTSO()))
+        ats.close()
+
+        self.assertEqual(len(tweets), 4*4-1, "Wrong amount of tweets")
+        self.assertEqual(ats.get_statistics(), (4, 4*4-1))
+        self.assertEqual(self.server.connections, 1, "Connection should be kept alive between pages")
+
+    def test_ATS_usertimeline_pages(self):
+        """ Tests AsyncTwitterSearch.pages() by using TwitterUserOrder class """
+
+        calls = []
+        ats = self.createATS()
+        pages = self.collect(ats.pages(TwitterUserOrder('foo'), callback=calls.append))
+        ats.close()
+
+        self.assertEqual([ len(content) for meta, content in pages ], [200, 190, 0])
+        self.assertEqual(pages[0][0]['content-type'], 'application/json')
+        self.assertEqual(len(calls), 3, "Callback function was NOT called 3 times")
+
+    def test_ATS_projection(self):
+        """ Tests AsyncTwitterSearch with projections of tweets """
+
+        ats = self.createATS(projection=['text'])
+        tweets = self.collect(ats.search(self.createTSO()))
+        self.assertEqual(len(tweets), 4*4-1)
+        self.assertTrue(all(sorted(tweet.keys()) == ['id', 'text'] for tweet in tweets))
+
+        tuo = TwitterUserOrder('foo')
+        tuo.set_projection(['user.id'])
+        tweets = self.collect(ats.search(tuo))
+        ats.close()
+        self.assertEqual(len(tweets), 390)
+        self.assertEqual(tweets[0]['user'], { 'id': tweets[0]['user']['id'] })
+
+    def test_ATS_batches(self):
+        """ Tests AsyncTwitterSearch.batches() by using TwitterSearchOrder class """
+
+        ats = self.createATS()
+        batches = self.collect(ats.batches(self.createTSO(), columns=['id', 'lang']))
+        ats.close()
+
+        self.assertEqual([ len(batch) for batch in batches ], [4, 4, 4, 3])
+        self.assertEqual(batches[0].keys(), ('id', 'lang'))
+
+    def test_ATS_concurrent_search(self):
+        """ Tests concurrent paginations driven by one event loop """
+
+        import asyncio
+        ats = self.createATS(max_connections=5)
+        iterators = [ ats.search(self.createTSO()) for i in range(20) ]
+        counts = [ 0 ] * len(iterators)
+
+        pending = list(range(len(iterators)))
+        while pending:
+            results = self.loop.run_until_complete(asyncio.gather(
+                *[ asyncio.ensure_future(iterators[i].__anext__(), loop=self.loop) for i in pending ],
+                return_exceptions=True))
+            for i, result in list(zip(pending, results)):
+                if isinstance(result, StopAsyncIteration):
+                    pending.remove(i)
+                else:
+                    counts[i] += 1
+        ats.close()
+
+        self.assertEqual(counts, [ 4*4-1 ] * len(iterators))
+        self.assertTrue(self.server.connections <= 5, "Too many connections opened")
+
+    def test_ATS_authenticate(self):
+        """ Tests AsyncTwitterSearch.authenticate() and .set_supported_languages() """
+
+        ats = self.createATS()
+        self.loop.run_until_complete(ats.authenticate())
+
+        tso = self.createTSO()
+        self.loop.run_until_complete(ats.set_supported_languages(tso))
+        self.assertEqual(sorted(tso.iso_6391), sorted([ 'fi', 'da', 'pl', 'hu', 'fa', 'he' ]))
+        ats.close()
+
+    def test_ATS_exceptions(self):
+        """ Tests AsyncTwitterSearch with invalid inputs/states """
+
+        ats = self.createATS()
+        ats._base_url = self.server.get_base_url() + 'unknown/'
+
+        try:
+            self.collect(ats.search(self.createTSO()))
+            self.assertTrue(False, "Exception should be raised instead")
+        except TwitterSearchException as e:
+            self.assertEqual(e.code, 404, "Exception code should be 404 but is %i" % e.code)
+
+        with self.assertRaises(TwitterSearchException):
+            self.collect(ats.search("foobar"))
+        with self.assertRaises(TwitterSearchException):
+            self.loop.run_until_complete(ats.set_supported_languages("joe.doe"))
+        with self.assertRaises(TwitterSearchException):
+            AsyncTwitterSearch('aaabbb','cccddd','111222','333444', max_connections=0)
+        with self.assertRaises(TwitterSearchException):
+            AsyncTwitterSearch('aaabbb','cccddd','111222','333444', timeout=0)
+        with self.assertRaises(TwitterSearchException) as e:
+            AsyncTwitterSearch('aaabbb','cccddd','111222','333444', proxy='my.proxy.com:8080')
+        self.assertEqual(e.exception.code, 1032)
+        ats.close()
+
+    def test_ATS_timeout(self):
+        """ Tests reading responses from a server keeping connections open """
+
+        import asyncio
+        import socket
+        import threading
+        import time
+
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(5)
+        responses = [ b'HTTP/1.1 204 No Content\r\n\r\n',
+                      b'HTTP/1.1 200 OK\r\n\r\n[]' ]
+        connections = []
+
+        def serve():
+            for response in responses:
+                connection = listener.accept()[0]
+                connection.recv(65536)
+                connection.sendall(response)
+                connections.append(connection)
+
+        thread = threading.Thread(target=serve)
+        thread.daemon = True
+        thread.start()
+
+        ats = self.createATS(timeout=0.2, keep_alive=False)
+        ats._base_url = 'http://127.0.0.1:%i/' % listener.getsockname()[1]
+        try:
+            # responses without a body don't wait for one
+            start = time.time()
+            self.loop.run_until_complete(ats.authenticate())
+            self.assertTrue(time.time() - start < 0.2)
+
+            # a body without length isn't awaited forever
+            with self.assertRaises(asyncio.TimeoutError):
+                self.loop.run_until_complete(ats.authenticate())
+        finally:
+            ats.close()
+            thread.join()
+            for connection in connections:
+                connection.close()
+            listener.close()
@@ -0,0 +1,170 @@
+from TwitterSearch import *
+
+import unittest
+import threading
+import time
+import gc
+
+class TwitterCursorTest(unittest.TestCase):
+
+    def createTSO(self, count=10):
+        """ Returns a default TwitterSearchOrder instance """
+        tso = TwitterSearchOrder()
+        tso.set_keywords(['foo'])
+        tso.set_count(count)
+        return tso
+
+    def createTS(self, server, **attr):
+        """ Returns a TwitterSearch instance querying the given server """
+        return TwitterSearch('aaabbb','cccddd','111222','333444', verify=False, base_url=server.get_base_url(), **attr)
+
+    ################ TESTS #########################
+
+    def test_TC_iterate(self):
+        """ Tests iterating a TwitterCursor and its pagination state """
+
+        corpus = TwitterMockServer.synthetic_corpus(25)
+        with TwitterMockServer(corpus) as server:
+            ts = self.createTS(server)
+            calls = []
+            cursor = ts.cursor(self.createTSO(), callback=calls.append)
+            self.assertEqual(ts.get_statistics().queries, 0, "Cursor queried before iterating")
+            self.assertRaises(TwitterSearchException, cursor.get_tweets)
+
+            tweets = list(cursor)
+            self.assertEqual([ tweet['id'] for tweet in tweets ], [ tweet['id'] for tweet in corpus ])
+            self.assertEqual(calls, [cursor] * 3)
+            self.assertEqual(cursor.get_amount_of_tweets(), 5)
+            self.assertEqual(cursor.get_minimal_id(), min(tweet['id'] for tweet in corpus) - 1)
+            self.assertEqual(cursor.get_last_timing().tweets, 5)
+            self.assertTrue('x-rate-limit-remaining' in cursor.get_metadata())
+            self.assertEqual(ts.get_statistics(), (3, 25))
+            self.assertRaises(TwitterSearchException, cursor.search_next_results)
+
+            # restarting queries the first page again
+            self.assertEqual(len(cursor.start()['content']['statuses']), 10)
+            self.assertEqual(len(list(cursor)), 25)
+
+            # the iteration state of the instance isn't touched by cursors
+            ts.search_tweets_iterable(self.createTSO(5))
+            self.assertEqual(next(ts), tweets[0])
+            other = ts.cursor(TwitterUserOrder('user0'))
+            self.assertTrue(len(list(other)) > 0)
+            self.assertEqual(ts.get_amount_of_tweets(), 5)
+            self.assertEqual([ next(ts) for i in range(24) ], tweets[1:])
+            self.assertRaises(StopIteration, next, ts)
+
+            for attr in [ {'prefetch': 2}, {'stream': True}, {'prefetch': 1, 'stream': True} ]:
+                with ts.cursor(self.createTSO(), **attr) as cursor:
+                    self.assertEqual(list(cursor), tweets)
+
+    def test_TC_interleaved(self):
+        """ Tests iterating several TwitterCursor instances of one TwitterSearch alternately """
+
+        with TwitterMockServer(TwitterMockServer.synthetic_corpus(500)) as server:
+            ts = self.createTS(server)
+            orders = [ TwitterUserOrder('user%i' % i) for i in range(3) ]
+            for order in orders:
+                order.set_count(7)
+            expected = [ list(ts.cursor(order)) for order in orders ]
+
+            cursors = [ ts.cursor(order) for order in orders ]
+            results = [ [] for order in orders ]
+            running = set(range(len(cursors)))
+            while running:
+                for i in sorted(running):
+                    try:
+                        results[i].append(next(cursors[i]))
+                    except StopIteration:
+                        running.remove(i)
+
+            self.assertEqual(results, expected)
+            self.assertTrue(all(cursor.get_order() is order for cursor, order in zip(cursors, orders)))
+
+    def test_TC_threads(self):
+        """ Tests iterating many TwitterCursor instances of one TwitterSearch within parallel threads """
+
+        with TwitterMockServer(TwitterMockServer.synthetic_corpus(1000)) as server:
+            ts = self.createTS(server, pool_maxsize=8)
+            orders = [ TwitterUserOrder('user%i' % i) for i in range(10) ] + [ self.createTSO(100) ]
+            for order in orders[:-1]:
+                order.set_count(20)
+            expected = [ [ tweet['id'] for tweet in ts.cursor(order) ] for order in orders ]
+            before = ts.get_statistics()
+
+            results = {}
+            errors = []
+            def walk(i):
+                try:
+                    attr = [ {}, {'prefetch': 2}, {'stream': True} ][i % 3]
+                    with ts.cursor(orders[i], **attr) as cursor:
+                        results[i] = [ tweet['id'] for tweet in cursor ]
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [ threading.Thread(target=walk, args=(i,)) for i in range(len(orders)) ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual([ results[i] for i in range(len(orders)) ], expected)
+
+            # statistics are shared by all cursors
+            after = ts.get_statistics()
+            self.assertEqual(after.queries - before.queries, before.queries)
+            self.assertEqual(after.tweets - before.tweets, before.tweets)
+
+    def prefetchThreads(self, timeout=2.0):
+        """ Waits up to timeout seconds for all prefetching threads to finish and returns the remaining ones """
+        deadline = time.time() + timeout
+        while True:
+            threads = [ t for t in threading.enumerate() if t.name == 'TwitterCursor-prefetch' ]
+            if not threads or time.time() > deadline:
+                return threads
+            time.sleep(0.01)
+
+    def test_TC_abandoned(self):
+        """ Tests that prefetching stops once a TwitterCursor is abandoned or closed """
+
+        with TwitterMockServer(TwitterMockServer.synthetic_corpus(1000)) as server:
+            ts = self.createTS(server)
+            for i in range(5):
+                for tweet in ts.cursor(self.createTSO(), prefetch=2):
+                    break
+            gc.collect()
+            self.assertEqual(self.prefetchThreads(), [])
+
+        # closing wakes up a thread waiting for the rate limit
+        with TwitterMockServer(TwitterMockServer.synthetic_corpus(100), rate_limits={'search/tweets': 1}) as server:
+            ts = self.createTS(server, pace_requests=True)
+            cursor = ts.cursor(self.createTSO(), prefetch=1)
+            next(cursor)
+            time.sleep(0.1)
+            self.assertEqual(len(self.prefetchThreads(0)), 1)
+
+            start = time.time()
+            cursor.close()
+            self.assertTrue(time.time() - start < 0.5, "Closing waited for the rate limit")
+            self.assertEqual(self.prefetchThreads(), [])
+            self.assertEqual(ts.get_statistics().queries, 1)
+
+    def test_TC_invalid(self):
+        """ Tests invalid arguments of TwitterSearch.cursor() """
+
+        with TwitterMockServer(TwitterMockServer.synthetic_corpus(10)) as server:
+            ts = self.createTS(server)
+            for args, attr, code in [ ((self.createTSO(), 'foo'), {}, 1018),
+                                      ((self.createTSO(),), {'prefetch': -1}, 1004),
+                                      ((self.createTSO(),), {'stream': 'yes'}, 1008),
+                                      ((TwitterOrder(),), {}, 1018) ]:
+                with self.assertRaises(TwitterSearchException) as e:
+                    ts.cursor(*args, **attr)
+                self.assertEqual(e.exception.code, code)
+
+            # errors of the first page are raised while iterating
+            server.stop()
+            cursor = ts.cursor(TwitterUserOrder('user0'))
+            self.assertEqual(repr(cursor), '<TwitterCursor None>')
+            self.assertRaises(Exception, list, cursor)
@@ -0,0 +1,97 @@
+from TwitterSearch import *
+
+import unittest
+import requests
+
+class TwitterMetricsTest(unittest.TestCase):
+
+    def createTSO(self, count=10):
+        """ Returns a default TwitterSearchOrder instance """
+        tso = TwitterSearchOrder()
+        tso.set_keywords(['foo'])
+        tso.set_count(count)
+        return tso
+
+    ################ TESTS #########################
+
+    def test_TM_registry(self):
+        """ Tests counters, gauges, histograms and their rendering """
+
+        metrics = TwitterMetrics(prefix='test')
+        self.assertEqual(metrics.get('requests_total', endpoint='foo'), None)
+
+        metrics.inc('requests_total', endpoint='foo', status=200)
+        metrics.inc('requests_total', 2, endpoint='foo', status=200)
+        metrics.set('rate_limit_remaining', 5, endpoint='say "hi"\n')
+        metrics.observe('request_duration_seconds', 0.02, endpoint='foo')
+        metrics.observe('request_duration_seconds', 20, endpoint='foo')
+
+        self.assertEqual(metrics.get('requests_total', endpoint='foo', status=200), 3)
+        self.assertEqual(metrics.get('request_duration_seconds', endpoint='foo'), (2, 20.02))
+
+        lines = metrics.render().splitlines()
+        self.assertTrue('# TYPE test_requests_total counter' in lines)
+        self.assertTrue('test_requests_total{endpoint="foo",status="200"} 3' in lines)
+        self.assertTrue('test_rate_limit_remaining{endpoint="say \\"hi\\"\\n"} 5' in lines)
+        self.assertTrue('test_request_duration_seconds_bucket{endpoint="foo",le="0.01"} 0' in lines)
+        self.assertTrue('test_request_duration_seconds_bucket{endpoint="foo",le="0.025"} 1' in lines)
+        self.assertTrue('test_request_duration_seconds_bucket{endpoint="foo",le="10.0"} 1' in lines)
+        self.assertTrue('test_request_duration_seconds_bucket{endpoint="foo",le="+Inf"} 2' in lines)
+        self.assertTrue('test_request_duration_seconds_count{endpoint="foo"} 2' in lines)
+
+        metrics.reset()
+        self.assertEqual(metrics.render(), '\n')
+
+    def test_TM_search(self):
+        """ Tests the metrics recorded by TwitterSearch and serving them """
+
+        metrics = TwitterMetrics()
+        corpus = TwitterMockServer.synthetic_corpus(25)
+        with TwitterMockServer(corpus, rate_limits={'search/tweets': 4}) as server:
+            ts = TwitterSearch('aaabbb','cccddd','111222','333444', base_url=server.get_base_url(), metrics=metrics)
+            self.assertEqual(len(list(ts.search_tweets_iterable(self.createTSO()))), 25)
+            self.assertRaises(TwitterSearchException, ts.search_tweets, TwitterUserOrder('unknown'))
+            ts.search_tweets(self.createTSO())
+            self.assertRaises(TwitterSearchException, ts.search_tweets, self.createTSO())
+
+        self.assertEqual(metrics.get('requests_total', endpoint='search/tweets', status=200), 4)
+        self.assertEqual(metrics.get('requests_total', endpoint='account/verify_credentials', status=200), 1)
+        self.assertEqual(metrics.get('tweets_total', endpoint='search/tweets'), 35)
+        self.assertEqual(metrics.get('errors_total', endpoint='statuses/user_timeline', status=404), 1)
+        self.assertEqual(metrics.get('errors_total', endpoint='search/tweets', status=429), 1)
+        self.assertEqual(metrics.get('rate_limit_remaining', endpoint='search/tweets'), 0)
+        self.assertEqual(metrics.get('rate_limit_limit', endpoint='search/tweets'), 4)
+        self.assertEqual(metrics.get('request_duration_seconds', endpoint='search/tweets')[0], 5)
+        self.assertEqual(sum(metrics.get('bytes_decoded_total', endpoint=endpoint)
+                             for endpoint in ('search/tweets', 'statuses/user_timeline', 'account/verify_credentials')),
+                         ts.get_statistics().bytes_decoded)
+
+        port = metrics.serve()
+        try:
+            r = requests.get('http://127.0.0.1:%i/metrics' % port)
+            self.assertEqual(r.status_code, 200)
+            self.assertTrue(r.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+            self.assertTrue('twittersearch_tweets_total{endpoint="search/tweets"} 35' in r.text.splitlines())
+        finally:
+            metrics.stop()
+
+    def test_TM_default(self):
+        """ Tests the registry shared by all instances """
+
+        default = TwitterMetrics.get_default()
+        self.assertTrue(default is TwitterMetrics.get_default())
+
+        with TwitterMockServer(TwitterMockServer.synthetic_corpus(5)) as server:
+            before = default.get('tweets_total', endpoint='search/tweets') or 0
+            for i in range(2):
+                ts = TwitterSearch('aaabbb','cccddd','111222','333444', verify=False, base_url=server.get_base_url())
+                ts.search_tweets(self.createTSO())
+            self.assertEqual(default.get('tweets_total', endpoint='search/tweets'), before + 10)
+
+            ts = TwitterSearch('aaabbb','cccddd','111222','333444', verify=False, base_url=server.get_base_url(), metrics=None)
+            ts.search_tweets(self.createTSO())
+            self.assertEqual(default.get('tweets_total', endpoint='search/tweets'), before + 10)
+
+        with self.assertRaises(TwitterSearchException) as e:
+            TwitterSearch('aaabbb','cccddd','111222','333444', verify=False, metrics='foo')
+        self.assertEqual(e.exception.code, 1028)
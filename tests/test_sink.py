@@ -0,0 +1,233 @@
+from TwitterSearch import *
+from TwitterSearch.TwitterSink import _pyarrow
+from TwitterSearch.utils import json_dumps
+from tests.standin import StandInBroker
+
+import unittest
+import json
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import threading
+import sys
+import time
+
+pyarrow = _pyarrow()
+
+class TwitterSinkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def loadTweets(self):
+        """ Returns the tweets of the first timeline page of tests/mock-data """
+        return json.loads(open('tests/mock-data/user/0.log', 'rb').read().decode('utf-8'))
+
+    ################ TESTS #########################
+
+    def test_TSK_ndjson(self):
+        """ Tests TwitterNDJSONSink writing plain and compressed files """
+
+        tweets = self.loadTweets()
+        path = os.path.join(self.directory, 'tweets.ndjson')
+        with TwitterNDJSONSink(path, max_tweets=3) as sink:
+            self.assertEqual(sink.consume(tweets), len(tweets))
+            stats = sink.get_statistics()
+            self.assertEqual(stats['batches'], len(tweets) // 3)
+        self.assertEqual([ json.loads(line) for line in open(path, 'rb').read().decode('utf-8').splitlines() ], tweets)
+
+        stats = sink.get_statistics()
+        self.assertEqual(stats['tweets'], len(tweets))
+        self.assertEqual(stats['bytes'], os.path.getsize(path))
+        self.assertEqual(stats['batches'], -(-len(tweets) // 3))
+        self.assertTrue(stats['tweets_per_second'] >= 0)
+
+        # tweets records are converted back into dicts
+        output = io.BytesIO()
+        sink = TwitterNDJSONSink(output, compress=True)
+        for tweet in tweets:
+            sink.write(Tweet(tweet))
+        sink.close()
+        sink.close()
+        lines = gzip.GzipFile(fileobj=io.BytesIO(output.getvalue())).read().decode('utf-8').splitlines()
+        self.assertEqual([ json.loads(line) for line in lines ], tweets)
+
+        with self.assertRaises(TwitterSearchException) as e:
+            sink.write(tweets[0])
+        self.assertEqual(e.exception.code, 1024)
+
+    def test_TSK_thresholds(self):
+        """ Tests size- and time-based flushing """
+
+        tweets = self.loadTweets()
+        broker = StandInBroker()
+        sink = TwitterProducerSink(broker, max_tweets=100, max_bytes=1)
+        sink.write(tweets[0])
+        sink.write(tweets[1])
+        self.assertEqual(len(broker.batches), 2)
+        self.assertEqual(json.loads(broker.batches[0][0].decode('utf-8')), tweets[0])
+
+        broker = StandInBroker()
+        sink = TwitterProducerSink(broker, max_delay=0.05)
+        sink.write(tweets[0])
+        time.sleep(0.1)
+        self.assertEqual(broker.batches, [])
+        sink.write(tweets[1])
+        self.assertEqual(len(broker.batches), 1)
+        self.assertEqual(len(broker.batches[0]), 2)
+
+        sink.close()
+        self.assertTrue(broker.closed)
+
+        for attr in [ { 'max_tweets': 0 }, { 'max_bytes': -1 }, { 'max_delay': 'x' } ]:
+            with self.assertRaises(TwitterSearchException) as e:
+                TwitterProducerSink(StandInBroker(), **attr)
+            self.assertEqual(e.exception.code, 1004)
+
+        with self.assertRaises(TwitterSearchException) as e:
+            TwitterProducerSink(StandInBroker(), background=1)
+        self.assertEqual(e.exception.code, 1008)
+
+        with self.assertRaises(TwitterSearchException) as e:
+            TwitterProducerSink(object())
+        self.assertEqual(e.exception.code, 1025)
+
+        with self.assertRaises(TwitterSearchException) as e:
+            TwitterNDJSONSink(42)
+        self.assertEqual(e.exception.code, 1009)
+
+    def test_TSK_background(self):
+        """ Tests writing batches within a background thread """
+
+        tweets = self.loadTweets()
+        broker = StandInBroker(delay=0.01)
+        with TwitterProducerSink(broker, max_tweets=2, background=True) as sink:
+            sink.consume(tweets)
+            sink.flush()
+            self.assertEqual(sum(len(batch) for batch in broker.batches), len(tweets))
+        self.assertEqual(broker.threads & set([ threading.current_thread().name ]), set())
+        self.assertEqual(sink.get_statistics()['tweets'], len(tweets))
+
+        # buffered tweets are written after max_delay without further writes
+        broker = StandInBroker()
+        sink = TwitterProducerSink(broker, max_delay=0.05, background=True)
+        sink.write(tweets[0])
+        for i in range(100):
+            if broker.batches:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(broker.batches), 1)
+        sink.close()
+
+        # flush() waits for a batch taken by a time-based flush in progress
+        broker = StandInBroker(delay=0.2)
+        sink = TwitterProducerSink(broker, max_delay=0.02, background=True)
+        sink.write(tweets[0])
+        time.sleep(0.1)
+        sink.flush()
+        self.assertEqual(len(broker.batches), 1)
+        sink.close()
+
+        # the deadline is computed anew for tweets buffered while waiting
+        broker = StandInBroker()
+        sink = TwitterProducerSink(broker, max_delay=0.3, background=True)
+        time.sleep(0.2)
+        sink.write(tweets[0])
+        time.sleep(0.2)
+        self.assertEqual(broker.batches, [])
+        for i in range(100):
+            if broker.batches:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(broker.batches), 1)
+        sink.close()
+
+        # errors of the background thread are raised by the next call
+        broker = StandInBroker()
+        broker.closed = True
+        sink = TwitterProducerSink(broker, max_tweets=1, background=True)
+        sink.write(tweets[0])
+        self.assertRaises(IOError, sink.flush)
+        sink.close()
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_TSK_parquet(self):
+        """ Tests TwitterParquetSink writing one row group per batch """
+
+        import pyarrow.parquet
+
+        tweets = self.loadTweets()
+        path = os.path.join(self.directory, 'tweets.parquet')
+        with TwitterParquetSink(path, columns=['id', 'created_at', 'hashtags', 'user_mentions'], max_tweets=5) as sink:
+            sink.consume(tweets)
+
+        parquet = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(parquet.metadata.num_row_groups, -(-len(tweets) // 5))
+        table = parquet.read()
+        self.assertEqual(table.column_names, ['id', 'created_at', 'hashtags', 'user_mentions'])
+        self.assertEqual(table.column('id').to_pylist(), [ tweet['id'] for tweet in tweets ])
+        self.assertTrue(0 < sink.get_statistics()['bytes'] < os.path.getsize(path))
+
+    def test_TSK_parquet_max_bytes(self):
+        """ Tests TwitterParquetSink writing a batch once max_bytes of JSON are buffered using a stand-in of pyarrow """
+
+        tables = []
+
+        class StandInTable(object):
+            schema = 'schema'
+            def __init__(self, arrays, names):
+                self.arrays, self.names, self.nbytes = arrays, names, 8 * len(arrays[0])
+            @classmethod
+            def from_arrays(cls, arrays, names):
+                return cls(arrays, names)
+
+        class ParquetWriter(object):
+            def __init__(self, where, schema, compression):
+                self.where = where
+                self.where.write(b'PAR1')
+            def write_table(self, table):
+                tables.append(table)
+                self.where.write(b'x' * table.nbytes)
+            def close(self):
+                self.where.write(b'footer')
+
+        class StandInArrow(object):
+            parquet = type('parquet', (object,), { 'ParquetWriter': ParquetWriter })
+            Table = StandInTable
+            array = staticmethod(lambda values, type: values)
+            timestamp = staticmethod(lambda unit: 'timestamp')
+            list_ = staticmethod(lambda inner: 'list')
+            int64 = staticmethod(lambda: 'int64')
+            string = staticmethod(lambda: 'string')
+
+        module = sys.modules['TwitterSearch.TwitterSink']
+        original = module._pyarrow_module
+        module._pyarrow_module = StandInArrow()
+        try:
+            tweets = self.loadTweets()[:5]
+            size = len(json_dumps(tweets[0]))
+            with TwitterParquetSink(os.path.join(self.directory, 'tweets.parquet'), columns=['id'],
+                                    max_tweets=1000, max_bytes=size * 2) as sink:
+                sink.consume(tweets)
+                self.assertTrue(len(tables) >= 2, "max_bytes didn't trigger a flush")
+            self.assertEqual(sum(len(table.arrays[0]) for table in tables), len(tweets))
+            self.assertEqual([ i for table in tables for i in table.arrays[0] ], [ tweet['id'] for tweet in tweets ])
+
+            # the statistics count the growth of the file except its footer
+            path = os.path.join(self.directory, 'tweets.parquet')
+            self.assertEqual(sink.get_statistics()['bytes'], os.path.getsize(path) - len(b'footer'))
+        finally:
+            module._pyarrow_module = original
+
+    @unittest.skipIf(pyarrow is not None, 'pyarrow is installed')
+    def test_TSK_parquet_missing(self):
+        """ Tests TwitterParquetSink without pyarrow """
+
+        with self.assertRaises(TwitterSearchException) as e:
+            TwitterParquetSink(os.path.join(self.directory, 'tweets.parquet'))
+        self.assertEqual(e.exception.code, 1022)
@@ -0,0 +1,103 @@
+from TwitterSearch import *
+from TwitterSearch.TwitterBatch import _numpy, parse_created_at
+
+import unittest
+import sys
+import array
+import json
+import calendar
+import time
+
+numpy = _numpy()
+
+class TwitterBatchTest(unittest.TestCase):
+
+    def loadTweets(self):
+        """ Returns the tweets of the first timeline page of tests/mock-data """
+        return json.loads(open('tests/mock-data/user/0.log', 'rb').read().decode('utf-8'))
+
+    ################ TESTS #########################
+
+    def test_TB_int64_fallback(self):
+        """ Tests the array type code used if 'q' isn't supported (Python 2.7) """
+
+        module = sys.modules['TwitterSearch.TwitterBatch']
+        original_array, original_int64 = module.array.array, module._INT64
+
+        def no_q(typecode, *args):
+            if typecode == 'q':
+                raise ValueError('bad typecode (must be c, b, B, u, h, H, i, I, l, L, f or d)')
+            return original_array(typecode, *args)
+
+        module.array.array = no_q
+        try:
+            self.assertEqual(module._get_int64_typecode(), 'l')
+            module._INT64 = module._get_int64_typecode()
+            tweets = self.loadTweets()
+            batch = TwitterBatch(tweets, use_numpy=False)
+            self.assertEqual(batch['id'].typecode, 'l')
+            self.assertEqual(list(batch['id']), [ tweet['id'] for tweet in tweets ])
+        finally:
+            module.array.array, module._INT64 = original_array, original_int64
+
+        self.assertEqual(module._get_int64_typecode(), 'q')
+
+    def test_TB_columns(self):
+        """ Tests TwitterBatch using array.array columns """
+
+        tweets = self.loadTweets()
+        batch = TwitterBatch(tweets, use_numpy=False)
+
+        self.assertEqual(len(batch), len(tweets))
+        self.assertEqual(list(batch), list(TwitterBatch.default_columns))
+        self.assertEqual(list(batch['id']), [ tweet['id'] for tweet in tweets ])
+        self.assertEqual(list(batch['user_id']), [ tweet['user']['id'] for tweet in tweets ])
+        self.assertEqual(batch['text'], [ tweet['text'] for tweet in tweets ])
+        self.assertEqual(batch['hashtags'], [ [ h['text'] for h in tweet['entities']['hashtags'] ] for tweet in tweets ])
+        self.assertEqual(batch['id'].typecode in ('q', 'l'), True)
+        self.assertEqual(batch['created_at'][0], calendar.timegm(time.strptime(tweets[0]['created_at'], '%a %b %d %H:%M:%S +0000 %Y')))
+        self.assertEqual(batch.get_minimal_id(), min(tweet['id'] for tweet in tweets))
+        self.assertEqual(sorted(batch.to_dict().keys()), sorted(TwitterBatch.default_columns))
+
+        batch = TwitterBatch(tweets, columns=['text', 'retweet_count'], use_numpy=False)
+        self.assertEqual(batch.keys(), ('text', 'retweet_count'))
+        self.assertFalse('id' in batch)
+        self.assertEqual(batch.get_minimal_id(), min(tweet['id'] for tweet in tweets))
+
+        self.assertEqual(TwitterBatch([], use_numpy=False).get_minimal_id(), None)
+
+        # fields dropped by a projection are null values
+        projection = TwitterProjection(['text', 'created_at'])
+        projected = [ projection(tweet) for tweet in tweets ]
+        batch = TwitterBatch(projected, columns=['id', 'user_id', 'user_screen_name', 'lang'], use_numpy=False)
+        self.assertEqual(list(batch['user_id']), [0] * len(tweets))
+        self.assertEqual(batch['user_screen_name'], [None] * len(tweets))
+        self.assertEqual(batch['lang'], [None] * len(tweets))
+        self.assertEqual(list(batch['id']), [ tweet['id'] for tweet in tweets ])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_TB_numpy(self):
+        """ Tests TwitterBatch using NumPy columns """
+
+        tweets = self.loadTweets()
+        batch = TwitterBatch(tweets, use_numpy=True)
+        self.assertEqual(batch['id'].dtype, numpy.int64)
+        self.assertEqual(str(batch['created_at'].dtype), 'datetime64[s]')
+        self.assertEqual(batch.get_minimal_id(), min(tweet['id'] for tweet in tweets))
+
+    def test_TB_created_at(self):
+        """ Tests parsing of created_at values """
+
+        self.assertEqual(parse_created_at('Thu Jan 01 00:00:00 +0000 1970'), 0)
+        self.assertEqual(parse_created_at('Mon Oct 13 09:44:18 +0000 2014'), 1413193458)
+        self.assertEqual(parse_created_at('Mon Oct 13 11:44:18 +0200 2014'), 1413193458)
+        self.assertEqual(parse_created_at('Mon Oct 13 08:14:18 -0130 2014'), 1413193458)
+
+    def test_TB_exceptions(self):
+        """ Tests TwitterBatch with invalid arguments """
+
+        self.assertRaises(TwitterSearchException, TwitterBatch, [], columns='id')
+        self.assertRaises(TwitterSearchException, TwitterBatch, [], columns=['foo'])
+        self.assertRaises(TwitterSearchException, TwitterBatch, [], use_numpy=1)
+        if numpy is None:
+            self.assertRaises(TwitterSearchException, TwitterBatch, [], use_numpy=True)
@@ -0,0 +1,108 @@
+from TwitterSearch import *
+from TwitterSearch.utils import py36
+
+import unittest
+import time
+
+class TwitterMockServerTest(unittest.TestCase):
+
+    def createTSO(self, count=10):
+        """ Returns a default TwitterSearchOrder instance """
+        tso = TwitterSearchOrder()
+        tso.set_keywords(['foo'])
+        tso.set_count(count)
+        return tso
+
+    def createTS(self, **attr):
+        """ Returns a TwitterSearch instance pointing to the mock server """
+        return TwitterSearch('aaabbb','cccddd','111222','333444', base_url=self.server.get_base_url(), **attr)
+
+    def setUp(self):
+        """ Constructor """
+        self.corpus = TwitterMockServer.synthetic_corpus(95, users=3)
+        self.server = TwitterMockServer(self.corpus)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    ################ TESTS #########################
+
+    def test_TMS_search(self):
+        """ Tests paginating the search results of TwitterMockServer """
+
+        ts = self.createTS()
+        ids = [ tweet['id'] for tweet in ts.search_tweets_iterable(self.createTSO()) ]
+        self.assertEqual(ids, sorted((tweet['id'] for tweet in self.corpus), reverse=True))
+        self.assertEqual(ts.get_statistics(), (10, 95))
+        self.assertEqual(ts.get_rate_limit('search/tweets').remaining, 180 - 10)
+        self.assertTrue(ts.get_statistics().bytes_received < ts.get_statistics().bytes_decoded, "Response is NOT compressed")
+
+        tso = self.createTSO()
+        tso.set_since_id(ids[4])
+        self.assertEqual([ tweet['id'] for tweet in ts.search_tweets_iterable(tso) ], ids[:4])
+
+        meta = ts.search_tweets(self.createTSO())['meta']
+        self.assertEqual(meta['x-rate-limit-remaining'], str(180 - 12))
+
+    def test_TMS_usertimeline(self):
+        """ Tests user timelines, languages and unknown users """
+
+        ts = self.createTS()
+        user = self.corpus[0]['user']
+        tweets = list(ts.search_tweets_iterable(TwitterUserOrder(user['screen_name'])))
+        self.assertEqual([ tweet['id'] for tweet in tweets ],
+                         [ tweet['id'] for tweet in self.corpus if tweet['user']['id'] == user['id'] ])
+
+        tso = self.createTSO()
+        ts.set_supported_languages(tso)
+        self.assertTrue('de' in tso.iso_6391)
+
+        with self.assertRaises(TwitterSearchException) as e:
+            ts.search_tweets(TwitterUserOrder('unknown'))
+        self.assertEqual(e.exception.code, 404)
+
+    def test_TMS_rate_limit(self):
+        """ Tests HTTP status 429 of exhausted endpoints and latency """
+
+        self.server.stop()
+        self.server = TwitterMockServer(self.corpus, latency=0.05, rate_limits={'search/tweets': 2})
+        self.server.start()
+
+        ts = self.createTS(verify=False)
+        start = time.time()
+        ts.search_tweets(self.createTSO())
+        self.assertTrue(time.time() - start >= 0.05)
+        ts.search_tweets(self.createTSO())
+        with self.assertRaises(TwitterSearchException) as e:
+            ts.search_tweets(self.createTSO())
+        self.assertEqual(e.exception.code, 429)
+
+        # limits apply per credentials
+        ts = TwitterSearch('aaabbb','cccddd', base_url=self.server.get_base_url())
+        self.assertEqual(len(ts.search_tweets(self.createTSO())['content']['statuses']), 10)
+        self.assertEqual(self.server.requests, 4)
+
+        self.assertRaises(TwitterSearchException, TwitterMockServer, latency=-1)
+        self.assertRaises(TwitterSearchException, TwitterSearch, 'aaabbb','cccddd','111222','333444', verify=False, base_url=42)
+
+    @unittest.skipIf(not py36, "AsyncTwitterSearch requires Python 3.6 or newer")
+    def test_TMS_async(self):
+        """ Tests AsyncTwitterSearch pointing to TwitterMockServer """
+
+        import asyncio
+
+        ats = AsyncTwitterSearch('aaabbb','cccddd','111222','333444', base_url=self.server.get_base_url())
+        iterator = ats.search(self.createTSO(count=50))
+        ids = []
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                try:
+                    ids.append(loop.run_until_complete(iterator.__anext__())['id'])
+                except StopAsyncIteration:
+                    break
+        finally:
+            ats.close()
+            loop.close()
+        self.assertEqual(len(ids), 95)
@@ -0,0 +1,60 @@
+from TwitterSearch import *
+
+import unittest
+import json
+
+class TwitterProjectionTest(unittest.TestCase):
+
+    ################ TESTS #########################
+
+    def test_TP_project(self):
+        """ Tests TwitterProjection with flat, nested and list fields """
+
+        tweet = {
+            'id': 1, 'text': 'foo', 'lang': 'en',
+            'user': { 'id': 2, 'screen_name': 'bar' },
+            'entities': { 'hashtags': [ { 'text': 'a', 'indices': [0, 1] }, { 'text': 'b', 'indices': [2, 3] } ], 'urls': [] },
+            }
+
+        self.assertEqual(TwitterProjection(['text'])(tweet), { 'id': 1, 'text': 'foo' })
+        self.assertEqual(TwitterProjection(['user.id', 'entities.hashtags'])(tweet),
+                         { 'id': 1, 'user': { 'id': 2 }, 'entities': { 'hashtags': tweet['entities']['hashtags'] } })
+        self.assertEqual(TwitterProjection(['entities.hashtags.text'])(tweet),
+                         { 'id': 1, 'entities': { 'hashtags': [ { 'text': 'a' }, { 'text': 'b' } ] } })
+
+        # whole objects win over some of their fields
+        self.assertEqual(TwitterProjection(['user.id', 'user'])(tweet)['user'], tweet['user'])
+        self.assertEqual(TwitterProjection(['user', 'user.id'])(tweet)['user'], tweet['user'])
+
+        # missing fields are skipped
+        self.assertEqual(TwitterProjection(['place.name', 'user.foo'])(tweet), { 'id': 1, 'user': {} })
+
+    def test_TP_loads(self):
+        """ Tests TwitterProjection.loads() using pages of tests/mock-data """
+
+        projection = TwitterProjection(['created_at', 'text', 'user.id', 'entities.hashtags'])
+
+        data = open('tests/mock-data/search/0.log', 'rb').read()
+        expected = json.loads(data.decode('utf-8'))
+        content = projection.loads(data, 'statuses')
+        self.assertEqual(content['search_metadata'], expected['search_metadata'])
+        self.assertEqual(content['statuses'], [ projection(tweet) for tweet in expected['statuses'] ])
+
+        data = open('tests/mock-data/user/0.log', 'rb').read()
+        content = projection.loads(data)
+        self.assertEqual(content, [ projection(tweet) for tweet in json.loads(data.decode('utf-8')) ])
+        self.assertEqual(sorted(content[0].keys()), ['created_at', 'entities', 'id', 'text', 'user'])
+
+    def test_TP_exceptions(self):
+        """ Tests TwitterProjection with invalid fields """
+
+        self.assertRaises(TwitterSearchException, TwitterProjection, 'text')
+        self.assertRaises(TwitterSearchException, TwitterProjection, ['text', 1])
+        self.assertRaises(TwitterSearchException, TwitterProjection, [''])
+
+        tso = TwitterSearchOrder()
+        self.assertRaises(TwitterSearchException, tso.set_projection, 'text')
+        tso.set_projection(['text'])
+        self.assertEqual(tso.projection.fields, ('text',))
+        tso.set_projection(None)
+        self.assertEqual(tso.projection, None)
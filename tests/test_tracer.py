@@ -0,0 +1,87 @@
+from TwitterSearch import *
+
+import unittest
+
+class TwitterTracerTest(unittest.TestCase):
+
+    def createTSO(self, count=10):
+        """ Returns a default TwitterSearchOrder instance """
+        tso = TwitterSearchOrder()
+        tso.set_keywords(['foo'])
+        tso.set_count(count)
+        return tso
+
+    ################ TESTS #########################
+
+    def test_TT_noop(self):
+        """ Tests the default tracer recording nothing """
+
+        tracer = TwitterTracer()
+        span = tracer.start_span('foo', bar=1)
+        self.assertTrue(span is tracer.start_span('bar'))
+        with span as s:
+            s.set_attribute('foo', 'bar')
+        self.assertEqual(span.trace_id, None)
+
+        with self.assertRaises(TwitterSearchException) as e:
+            TwitterSearch('aaabbb','cccddd','111222','333444', verify=False, tracer='foo')
+        self.assertEqual(e.exception.code, 1029)
+
+    def test_TT_memory(self):
+        """ Tests TwitterMemoryTracer nesting spans """
+
+        tracer = TwitterMemoryTracer()
+        with tracer.start_span('root', a=1) as root:
+            with tracer.start_span('child') as child:
+                child.set_attribute('b', 2)
+        with tracer.start_span('late', parent=root):
+            pass
+        self.assertRaises(ValueError, self.failingSpan, tracer)
+
+        spans = tracer.get_spans(root.trace_id)
+        self.assertEqual([ span.name for span in spans ], ['root', 'child', 'late'])
+        self.assertEqual([ span.parent_id for span in spans ], [None, root.span_id, root.span_id])
+        self.assertEqual(spans[1].attributes, {'b': 2})
+        self.assertTrue(all(span.duration >= 0 for span in spans))
+        self.assertEqual(tracer.get_spans(name='failing')[0].attributes['error'], 'ValueError')
+        self.assertEqual(len(tracer.format_waterfall(root.trace_id).splitlines()), 3)
+
+        tracer.clear()
+        self.assertEqual(tracer.get_spans(), [])
+
+    def failingSpan(self, tracer):
+        with tracer.start_span('failing'):
+            raise ValueError()
+
+    def test_TT_search(self):
+        """ Tests the spans opened by TwitterSearch while iterating """
+
+        tracer = TwitterMemoryTracer()
+        corpus = TwitterMockServer.synthetic_corpus(25)
+        with TwitterMockServer(corpus) as server:
+            calls = []
+            for attr in [ {}, {'prefetch': 1}, {'stream': True} ]:
+                tracer.clear()
+                ts = TwitterSearch('aaabbb','cccddd','111222','333444', verify=False, base_url=server.get_base_url(), tracer=tracer, **attr)
+                tweets = list(ts.search_tweets_iterable(self.createTSO(), callback=calls.append))
+                self.assertEqual(len(tweets), 25)
+
+                root = tracer.get_spans(name='search_tweets')
+                self.assertEqual(len(root), 1)
+                spans = tracer.get_spans(root[0].trace_id)
+                self.assertEqual(len(spans), len(tracer.get_spans()), "Spans missing in trace")
+
+                http = [ span for span in spans if span.name == 'http' ]
+                self.assertEqual(len(http), 3)
+                self.assertEqual(http[0].attributes['endpoint'], 'search/tweets')
+                self.assertEqual(http[0].attributes['status'], 200)
+                self.assertEqual(len([ span for span in spans if span.name == 'callback' ]), 3)
+                pages = [ span for span in spans if span.name == 'search_next_results' ]
+                self.assertEqual(len(pages), 2)
+                self.assertTrue(all(span.parent_id == root[0].span_id for span in pages))
+
+                if not attr:
+                    names = [ span.name for span in spans ]
+                    self.assertEqual(names[:5], ['search_tweets', 'send_search', 'http', 'decode', 'callback'])
+                    self.assertEqual([ span.attributes['tweets'] for span in spans if span.name == 'decode' ], [10, 10, 5])
+                    self.assertEqual(pages[0].attributes['max_id'], sorted(t['id'] for t in tweets)[-10] - 1)
@@ -7,6 +7,7 @@ import unittest
 import random
 import copy
 import string
+import threading
 from datetime import date, timedelta
 
 class TwitterSearchOrderTest(unittest.TestCase):
@@ -410,6 +411,123 @@ class TwitterSearchOrderTest(unittest.TestCase):
         tso.remove_attitude_filter()
         self.assertTrue(tso.attitude_filter is None)
 
+    def test_TSO_cached_url(self):
+        """ Tests that TwitterSearchOrder.create_search_url() is built again after changes only """
+
+        tso = self.getCopy()
+        url = tso.create_search_url()
+        self.assertTrue(tso.create_search_url() is url)
+
+        changes = [ lambda: tso.add_keyword('bar'), lambda: tso.set_keywords(['foo', 'bar baz']),
+                    lambda: tso.set_language('de'), lambda: tso.set_locale('ja'),
+                    lambda: tso.set_result_type('recent'), lambda: tso.set_geocode(49.4, 8.7, 10),
+                    lambda: tso.set_count(42), lambda: tso.set_max_id(1337), lambda: tso.set_since_id(42),
+                    lambda: tso.set_include_entities(False), lambda: tso.set_callback('foo'),
+                    lambda: tso.set_until(date.today()), lambda: tso.set_since(date.today()),
+                    tso.set_link_filter, tso.remove_link_filter, tso.set_question_filter, tso.remove_question_filter,
+                    tso.set_positive_attitude_filter, tso.set_negative_attitude_filter, tso.remove_attitude_filter,
+                    lambda: tso.set_source_filter('twitterfeed'), tso.remove_source_filter, tso.remove_all_filters ]
+
+        for change in changes:
+            before = tso.create_search_url()
+            change()
+            url = tso.create_search_url()
+            self.assertTrue(tso.create_search_url() is url)
+            self.assertEqual(tso.url, url)
+
+            # the cached string equals a newly built one
+            tso._set_dirty()
+            self.assertEqual(tso.create_search_url(), url)
+
+        self.assertNotEqual(tso.create_search_url(), self.getCopy().create_search_url())
+
+        tso.set_search_url('?q=foo&count=10')
+        self.assertEqual(tso.create_search_url(), '?q=foo&count=10')
+
+    def test_TSO_canonical_form(self):
+        """ Tests TwitterSearchOrder.get_canonical_form() and equality of orders """
+
+        tso1 = self.getCopy()
+        tso1.set_keywords(['Goofy', 'Nyancat'], or_operator=True)
+        tso1.add_keyword('BMW')
+        tso1.set_language('en')
+        tso1.set_link_filter()
+        tso1.set_count(42)
+
+        tso2 = TwitterSearchOrder()
+        tso2.set_count(42)
+        tso2.set_link_filter()
+        tso2.add_keyword('BMW')
+        tso2.add_keyword(['Nyancat', 'Goofy'], or_operator=True)
+        tso2.set_language('en')
+
+        tso3 = TwitterSearchOrder()
+        tso3.set_search_url(tso1.create_search_url())
+
+        canonical = 'TwitterSearchOrder?q=BMW+Goofy+OR+Nyancat+filter%3Alinks&count=42&lang=en'
+        for tso in (tso1, tso2, tso3):
+            self.assertEqual(tso.get_canonical_form(), canonical)
+            self.assertEqual(tso, tso1)
+            self.assertFalse(tso != tso1)
+            self.assertEqual(hash(tso), hash(tso1))
+        self.assertEqual(len(set([tso1, tso2, tso3])), 1)
+
+        # phrases stay untouched
+        tso3.set_keywords(['James Bond', 'Goofy'])
+        self.assertEqual(tso3.get_canonical_form(), 'TwitterSearchOrder?q=%22James+Bond%22+Goofy+filter%3Alinks&count=42&lang=en')
+
+        # modifications are taken into account
+        tso2.set_question_filter()
+        self.assertNotEqual(tso1, tso2)
+        tso1.set_question_filter()
+        self.assertEqual(tso1, tso2)
+        tso2.set_since_id(1337)
+        self.assertNotEqual(tso1, tso2)
+
+        # concatenated keywords differ from separate ones
+        tso1.set_keywords(['foo', 'bar'])
+        tso2.set_keywords(['foo', 'bar'], or_operator=True)
+        self.assertNotEqual(tso1.get_canonical_form(), tso2.get_canonical_form())
+
+        self.assertNotEqual(tso1, 'foo')
+        self.assertNotEqual(tso1, TwitterUserOrder('foo'))
+
+    def test_TSO_threads(self):
+        """ Tests building and querying TwitterSearchOrder objects in parallel threads """
+
+        shared = self.getCopy()
+        shared.set_keywords(['foo', 'bar baz'])
+        shared.set_language('de')
+        expected = shared.create_search_url()
+        shared._set_dirty()
+
+        errors = []
+        start = threading.Event()
+
+        def build(thread):
+            start.wait()
+            try:
+                for i in range(300):
+                    tso = TwitterSearchOrder()
+                    tso.add_keyword('%s_%s' % (thread, i))
+                    tso.set_count(i % 100 + 1)
+                    url = tso.create_search_url()
+                    if url != '?q=%s_%s&count=%s' % (thread, i, i % 100 + 1):
+                        errors.append(url)
+                    if shared.create_search_url() != expected:
+                        errors.append(shared.url)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [ threading.Thread(target=build, args=(i,)) for i in range(8) ]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
     def test_TSO_setURL(self):
         """ Tests TwitterSearchOrder.set_search_url() """
 
@@ -0,0 +1,59 @@
+from TwitterSearch import *
+
+import unittest
+import json
+
+class TwitterStreamParserTest(unittest.TestCase):
+
+    def split(self, data, size):
+        """ Splits given bytes into chunks of a given size """
+        return [ data[i:i+size] for i in range(0, len(data), size) ]
+
+    ################ TESTS #########################
+
+    def test_TSP_timeline(self):
+        """ Tests TwitterStreamParser with arrays as documents split into chunks of various sizes """
+
+        data = open('tests/mock-data/user/0.log', 'rb').read()
+        expected = json.loads(data.decode('utf-8'))
+
+        for size in [ 7, 100, 16384, len(data) ]:
+            parser = TwitterStreamParser(self.split(data, size))
+            self.assertEqual(list(parser), expected, "Elements differ using chunks of %i bytes" % size)
+            self.assertEqual(parser.bytes_read, len(data))
+            self.assertEqual(parser.remainder, [])
+
+    def test_TSP_search(self):
+        """ Tests TwitterStreamParser with arrays nested within objects """
+
+        data = open('tests/mock-data/search/0.log', 'rb').read()
+        expected = json.loads(data.decode('utf-8'))
+
+        for size in [ 1, 64, 16384 ]:
+            parser = TwitterStreamParser(self.split(data, size), key='statuses')
+            self.assertEqual(list(parser), expected['statuses'])
+            self.assertEqual(parser.remainder['search_metadata'], expected['search_metadata'])
+            self.assertEqual(parser.remainder['statuses'], [])
+
+    def test_TSP_values(self):
+        """ Tests TwitterStreamParser with scalars, escapes and multi-byte characters split at every position """
+
+        docs = [
+            (b'[1, 23 ,"a\\"b]", [1,[2]], {"x":"]"}, -1.5e3, true, null]', None),
+            (b' [ ] ', None),
+            (b'{"a":{"statuses":1},"statuses" : [ 1 , 2 ],"z":"\\u00e9"}', 'statuses'),
+            (u'[{"é":"€"}]'.encode('utf-8'), None),
+            ]
+
+        for data, key in docs:
+            expected = json.loads(data.decode('utf-8'))
+            for size in range(1, len(data) + 1):
+                parser = TwitterStreamParser(self.split(data, size), key=key)
+                self.assertEqual(list(parser), expected[key] if key else expected)
+
+    def test_TSP_exceptions(self):
+        """ Tests TwitterStreamParser with invalid documents """
+
+        for data, key in [ (b'[1,', None), (b'[{"a":', None), (b'[1 2]', None), (b'"foo"', None),
+                           (b'{"foo":1}', 'statuses'), (b'{"statuses":1}', 'statuses'), (b'[]', 'statuses') ]:
+            self.assertRaises(ValueError, list, TwitterStreamParser([ data ], key=key))
@@ -7,6 +7,8 @@ import unittest
 import random
 import copy
 import string
+import sys
+import threading
 from datetime import date, timedelta
 
 class TwitterUserOrderTest(unittest.TestCase):
@@ -137,6 +139,102 @@ class TwitterUserOrderTest(unittest.TestCase):
 
         self.assertEqualQuery(tuo1.create_search_url(), tuo2.create_search_url(), "Query strings NOT equal")
 
+    def test_TUO_cached_url(self):
+        """ Tests that TwitterUserOrder.create_search_url() is built again after changes only """
+
+        tuo = self.getCopy()
+        url = tuo.create_search_url()
+        self.assertTrue(tuo.create_search_url() is url)
+
+        tuo.set_trim_user(True)
+        self.assertTrue('trim_user=true' in tuo.create_search_url())
+        tuo.set_count(42)
+        self.assertTrue('count=42' in tuo.create_search_url())
+        tuo.set_search_url('?screen_name=bar')
+        self.assertEqual(tuo.create_search_url(), '?screen_name=bar')
+        self.assertEqual(tuo.url, '?screen_name=bar')
+
+    def test_TUO_canonical_form(self):
+        """ Tests TwitterUserOrder.get_canonical_form() and equality of orders """
+
+        tuo1 = self.getCopy()
+        tuo1.set_search_url('?screen_name=foo&count=42&include_rts=true')
+        tuo2 = self.getCopy()
+        tuo2.set_search_url('?include_rts=true&count=42&screen_name=foo')
+
+        self.assertEqual(tuo1.get_canonical_form(), 'TwitterUserOrder?count=42&include_rts=true&screen_name=foo')
+        self.assertEqual(tuo1, tuo2)
+        self.assertEqual(hash(tuo1), hash(tuo2))
+        self.assertEqual({tuo1: 'foo'}[tuo2], 'foo')
+
+        tuo2.set_trim_user(True)
+        self.assertNotEqual(tuo1, tuo2)
+        self.assertTrue(tuo1 != tuo2)
+
+    def test_TUO_threads(self):
+        """ Tests building many TwitterUserOrder objects in parallel threads """
+
+        errors = []
+        start = threading.Event()
+
+        def build(thread):
+            start.wait()
+            try:
+                for i in range(500):
+                    user = '%s_%s' % (thread, i)
+                    tuo = TwitterUserOrder(user if i % 2 else thread * 1000 + i)
+                    tuo.set_count(i % 100 + 1)
+                    tuo.set_trim_user(i % 3 == 0)
+                    url = parse_qs(tuo.create_search_url()[1:])
+
+                    expected = { 'count': ['%s' % (i % 100 + 1)], 'include_rts': ['true'],
+                                 'exclude_replies': ['false'], 'trim_user': ['true' if i % 3 == 0 else 'false'] }
+                    if i % 2:
+                        expected['screen_name'] = [user]
+                    else:
+                        expected['user_id'] = ['%s' % (thread * 1000 + i)]
+                    if url != expected:
+                        errors.append((expected, url))
+            except Exception as e:
+                errors.append(e)
+
+        interval = getattr(sys, 'getswitchinterval', lambda: None)()
+        if interval is not None:
+            sys.setswitchinterval(1e-6)
+        try:
+            threads = [ threading.Thread(target=build, args=(i,)) for i in range(8) ]
+            for thread in threads:
+                thread.start()
+            start.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            if interval is not None:
+                sys.setswitchinterval(interval)
+
+        self.assertEqual(errors, [])
+        self.assertTrue(TwitterOrder.arguments is None)
+
+    def test_TUO_subclass(self):
+        """ Tests child classes of TwitterUserOrder not calling TwitterOrder.__init__() """
+
+        class ScreenNameOrder(TwitterUserOrder):
+            def __init__(self, user):
+                self._set_argument('screen_name', user)
+
+        order1 = ScreenNameOrder('foo')
+        order2 = ScreenNameOrder('bar')
+        self.assertEqual(order1.create_search_url(), '?screen_name=foo')
+        self.assertEqual(order1.url, '?screen_name=foo')
+        self.assertEqual(order2.get_canonical_form(), 'ScreenNameOrder?screen_name=bar')
+        self.assertTrue(TwitterUserOrder.arguments is None)
+
+        # orders without any arguments set work as well
+        order = ScreenNameOrder.__new__(ScreenNameOrder)
+        self.assertEqual(order.url, '')
+        self.assertEqual(order.create_search_url(), '?')
+        self.assertEqual(order.get_canonical_form(), 'ScreenNameOrder?')
+
     def test_TUO_contructuor(self):
         """ Tests __init__ method of TwitterUserOrder """
 
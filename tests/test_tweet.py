@@ -0,0 +1,72 @@
+from TwitterSearch import *
+
+import unittest
+import json
+import pickle
+
+class TweetTest(unittest.TestCase):
+
+    def loadTweets(self):
+        """ Returns all tweets of tests/mock-data as dicts """
+        tweets = json.loads(open('tests/mock-data/user/0.log', 'rb').read().decode('utf-8'))
+        for i in range(4):
+            tweets += json.loads(open('tests/mock-data/search/%i.log' % i, 'rb').read().decode('utf-8'))['statuses']
+        return tweets
+
+    ################ TESTS #########################
+
+    def test_Tweet_mapping(self):
+        """ Tests dict-like access of Tweet and User instances """
+
+        for data in self.loadTweets():
+            tweet = Tweet(data)
+            self.assertEqual(tweet, data)
+            self.assertEqual(tweet.to_dict(), data)
+            self.assertEqual(len(tweet), len(data))
+            self.assertEqual(sorted(tweet.keys()), sorted(data.keys()))
+            self.assertEqual(tweet['id'], data['id'])
+            self.assertEqual(tweet.text, data['text'])
+            self.assertTrue(isinstance(tweet.user, User))
+            self.assertEqual(tweet['user']['screen_name'], data['user']['screen_name'])
+            if 'retweeted_status' in data:
+                self.assertTrue(isinstance(tweet.retweeted_status, Tweet))
+            self.assertFalse(hasattr(tweet, '__dict__'))
+
+    def test_Tweet_fields(self):
+        """ Tests Tweet instances with missing and unknown fields """
+
+        tweet = Tweet({ 'id': 1, 'text': 'foo', 'lang': 'en', 'foo': { 'bar': 1 } })
+
+        self.assertEqual(tweet.foo, { 'bar': 1 })
+        self.assertEqual(tweet['foo'], { 'bar': 1 })
+        self.assertTrue('foo' in tweet and 'text' in tweet)
+        self.assertFalse('user' in tweet or 'bar' in tweet)
+        self.assertEqual(tweet.get('user'), None)
+        self.assertRaises(KeyError, lambda: tweet['user'])
+        self.assertRaises(AttributeError, lambda: tweet.user)
+        self.assertRaises(AttributeError, lambda: tweet.bar)
+        self.assertEqual(sorted(tweet), ['foo', 'id', 'lang', 'text'])
+        self.assertEqual(repr(tweet), '<Tweet 1>')
+
+        self.assertEqual(pickle.loads(pickle.dumps(tweet)), tweet)
+        self.assertTrue(Tweet({ 'lang': ''.join(['e', 'n']) }).lang is tweet.lang, "Languages are NOT interned")
+
+    def test_Tweet_shared(self):
+        """ Tests that equal nested objects share one record """
+
+        tweets = [ Tweet(data) for data in self.loadTweets()[:20] ]
+        self.assertTrue(all(tweet.user is tweets[0].user for tweet in tweets), "Users of a timeline are NOT shared")
+
+        data = tweets[0].to_dict()
+        data['user']['followers_count'] += 1
+        tweet = Tweet(data)
+        self.assertFalse(tweet.user is tweets[0].user, "Changed users are shared")
+        self.assertEqual(tweet.user.followers_count, tweets[0].user.followers_count + 1)
+        self.assertEqual(tweets[0].to_dict()['user']['followers_count'], data['user']['followers_count'] - 1)
+
+        # key orders don't matter
+        reordered = Tweet(dict(reversed(list(data.items()))))
+        self.assertEqual(reordered, tweet)
+        self.assertEqual(reordered.text, tweet.text)
+        self.assertTrue(isinstance(reordered.user, User))
+